@@ -5,39 +5,34 @@
 Python Flask 웹 애플리케이션
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Blueprint, Request, render_template, request, jsonify, send_file
 from flask_cors import CORS
-import sqlite3
+import functools
 import json
 import os
 import secrets
 import logging
+import tempfile
 from datetime import datetime
-import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-from openpyxl.utils.dataframe import dataframe_to_rows
-import io
-
-app = Flask(__name__)
-
-# 보안 설정
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', secrets.token_hex(32))
-
-# CORS 설정
-CORS(app, origins=['http://localhost:*', 'http://127.0.0.1:*'])
-
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler()
-    ]
-)
+
+import assets
+import log_config
+import schemas
+import tenants
+from cache import create_version_triggers, reference_cache
+from db import connect, current_db_path, get_db
+from reports import create_rollup_triggers, list_sites, site_report
+
+# 엑셀 내보내기(openpyxl)와 일괄 가져오기 모듈은 첫 사용 시점에 불러옵니다.
+# 워커 재시작마다 무거운 모듈을 읽지 않도록 모듈 최상단에서는 import 하지 않습니다.
+
+bp = Blueprint('main', __name__)
 logger = logging.getLogger(__name__)
 
+# 요청 크기 제한: JSON 본문과 일괄 가져오기 업로드 파일
+MAX_JSON_BYTES = int(os.environ.get('MAX_JSON_BYTES', 2 * 1024 * 1024))
+MAX_UPLOAD_BYTES = int(os.environ.get('MAX_UPLOAD_MB', 50)) * 1024 * 1024
+
 # API 응답 표준화 함수
 def success_response(data=None, message="성공", status_code=200):
     """표준화된 성공 응답"""
@@ -59,22 +54,63 @@ def error_response(message="오류가 발생했습니다", status_code=400, erro
     return jsonify(response), status_code
 
 # 전역 에러 핸들러
-@app.errorhandler(404)
+@bp.app_errorhandler(404)
 def not_found(error):
     return error_response("페이지를 찾을 수 없습니다", 404, "NOT_FOUND")
 
-@app.errorhandler(500)
+@bp.app_errorhandler(413)
+def payload_too_large(error):
+    return error_response("요청 데이터가 너무 큽니다", 413, "PAYLOAD_TOO_LARGE")
+
+@bp.app_errorhandler(500)
 def internal_error(error):
     return error_response("서버 내부 오류가 발생했습니다", 500, "INTERNAL_ERROR")
 
-@app.errorhandler(Exception)
+@bp.app_errorhandler(Exception)
 def handle_exception(e):
     logger.exception("Unhandled exception occurred")
     return error_response("예기치 않은 오류가 발생했습니다", 500, "UNEXPECTED_ERROR")
 
+# 요청 본문 크기 제한
+class LimitedRequest(Request):
+    """
+    JSON 요청은 MAX_JSON_BYTES + 1 바이트, 그 밖의 요청(업로드)은 MAX_CONTENT_LENGTH 까지만 읽음
+    Content-Length 가 없는 chunked 요청은 한도에서 잘려서 읽히므로 (Werkzeug)
+    한 바이트 더 읽어 validate_json 에서 한도를 넘었는지 판단합니다.
+    """
+    
+    @property
+    def max_content_length(self):
+        if self.is_json:
+            return MAX_JSON_BYTES + 1
+        return super().max_content_length
+
+# 요청 본문 검증
+def validate_json(schema, methods=('POST',)):
+    """요청 본문 크기와 형식을 DB/엑셀 작업 전에 검사 (methods 에 해당하는 요청만)"""
+    validator = schemas.SCHEMAS[schema]
+    
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method in methods:
+                if request.is_json and len(request.get_data(cache=True)) > MAX_JSON_BYTES:
+                    return error_response("요청 데이터가 너무 큽니다", 413, "PAYLOAD_TOO_LARGE")
+                data = request.get_json(silent=True)
+                if not isinstance(data, dict):
+                    return error_response("JSON 형식의 요청 데이터가 필요합니다", 400, "INVALID_JSON")
+                try:
+                    validator(data)
+                except schemas.ValidationError as e:
+                    return error_response(f"요청 데이터가 올바르지 않습니다 ({e})", 400, "INVALID_PAYLOAD")
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
 # 데이터베이스 초기화
-def init_db():
-    conn = sqlite3.connect('estimate.db')
+def init_db(db_path=None):
+    # 다중 지점 모드에서는 지점 데이터베이스마다 실행 (tenants.init_app)
+    conn = connect(db_path)
     cursor = conn.cursor()
     
     # 회사 정보 테이블
@@ -170,186 +206,93 @@ def init_db():
         )
     ''')
     
-    conn.commit()
-    conn.close()
-
-# 한글 숫자 변환 함수
-def number_to_korean(num):
-    korean_numbers = ['', '일', '이', '삼', '사', '오', '육', '칠', '팔', '구']
-    
-    if num == 0:
-        return '영원 正'
-    
-    result = ''
-    
-    # 조, 억, 만 단위로 분리
-    trillion = num // 1000000000000
-    hundred_million = (num % 1000000000000) // 100000000
-    ten_thousand = (num % 100000000) // 10000
-    remainder = num % 10000
-    
-    def convert_thousands(number):
-        if number == 0:
-            return ''
-        
-        str_result = ''
-        thousands = number // 1000
-        hundreds = (number % 1000) // 100
-        tens = (number % 100) // 10
-        units = number % 10
-        
-        if thousands > 0:
-            str_result += korean_numbers[thousands] + '천'
-        if hundreds > 0:
-            str_result += korean_numbers[hundreds] + '백'
-        if tens > 0:
-            str_result += korean_numbers[tens] + '십'
-        if units > 0:
-            str_result += korean_numbers[units]
-        
-        return str_result
+    # 현장/날짜/카테고리별 영수증 지출 합계 (daily_records 트리거로 갱신)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS daily_rollups (
+            site_name TEXT NOT NULL,
+            date TEXT NOT NULL,
+            category TEXT NOT NULL,
+            amount REAL NOT NULL DEFAULT 0,
+            item_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (site_name, date, category)
+        ) WITHOUT ROWID
+    ''')
+    create_rollup_triggers(cursor)
     
-    # 조 단위 처리
-    if trillion > 0:
-        result += convert_thousands(trillion) + '조'
+    # 일괄 가져오기 작업 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS import_jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            filename TEXT,
+            status TEXT NOT NULL,
+            processed_rows INTEGER DEFAULT 0,
+            imported INTEGER DEFAULT 0,
+            error_count INTEGER DEFAULT 0,
+            errors TEXT,
+            message TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            finished_at DATETIME,
+            pid INTEGER
+        )
+    ''')
+    cursor.execute('PRAGMA table_info(import_jobs)')
+    if 'pid' not in [column[1] for column in cursor.fetchall()]:
+        cursor.execute('ALTER TABLE import_jobs ADD COLUMN pid INTEGER')
     
-    # 억 단위 처리
-    if hundred_million > 0:
-        result += convert_thousands(hundred_million) + '억'
+    # 서버 재시작 등으로 중단된 가져오기 작업은 실패로 표시 (조회하는 화면이 계속 기다리지 않도록)
+    cursor.execute("SELECT COUNT(*) FROM import_jobs WHERE status IN ('pending', 'running')")
+    if cursor.fetchone()[0]:
+        from importer import fail_stale_jobs
+        fail_stale_jobs(cursor, include_unstarted=True)
     
-    # 만 단위 처리
-    if ten_thousand > 0:
-        result += convert_thousands(ten_thousand) + '만'
+    # 견적서 수정 이력 테이블 (바뀐 필드/항목만 저장)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS estimate_revisions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            estimate_id INTEGER NOT NULL,
+            revision INTEGER NOT NULL,
+            header_changes TEXT,
+            item_changes TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (estimate_id, revision),
+            FOREIGN KEY (estimate_id) REFERENCES estimates (id) ON DELETE CASCADE
+        )
+    ''')
     
-    # 나머지 천의 자리 이하 처리
-    if remainder > 0:
-        result += convert_thousands(remainder)
+    # 참조 데이터 캐시 버전 테이블 (회사/고객/계좌 변경 시 트리거로 증가)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS cache_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    create_version_triggers(cursor)
     
-    return result + '원 正'
+    conn.commit()
+    conn.close()
 
 # 메인 페이지
-@app.route('/')
+@bp.route('/')
 def index():
     return render_template('index.html')
 
+def export_numbers(data, item_fields, total_fields):
+    """엑셀 합계 계산 전에 "1,000" 같은 숫자 문자열과 null 을 숫자로 바꾼 요청 데이터 사본"""
+    items = [dict(item, **{key: schemas.parse_number(item.get(key)) or 0 for key in item_fields})
+             for item in data.get('items') or []]
+    return dict(data, items=items, **{key: schemas.parse_number(data.get(key)) or 0 for key in total_fields})
+
 # 견적서 엑셀 생성
-@app.route('/api/export_estimate_excel', methods=['POST'])
+@bp.route('/api/export_estimate_excel', methods=['POST'])
+@validate_json('estimate_export')
 def export_estimate_excel():
     try:
-        data = request.json
-        
-        # 워크북 생성
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "견적서"
-        
-        # 스타일 정의
-        header_font = Font(bold=True, size=16)
-        sub_header_font = Font(bold=True, size=12)
-        normal_font = Font(size=10)
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        header_fill = PatternFill(start_color='E6E6FA', end_color='E6E6FA', fill_type='solid')
-        
-        # 제목
-        ws.merge_cells('A1:H1')
-        ws['A1'] = '견 적 서'
-        ws['A1'].font = header_font
-        ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
-        
-        # 견적 정보
-        ws['A3'] = '견적번호:'
-        ws['B3'] = data.get('estimate_number', '')
-        ws['E3'] = '견적일자:'
-        ws['F3'] = data.get('estimate_date', '')
-        
-        ws['A4'] = '유효기간:'
-        ws['B4'] = data.get('valid_until', '')
-        
-        # 공급업체 정보
-        ws['A6'] = '공급업체'
-        ws['A6'].font = sub_header_font
-        ws.merge_cells('A6:D6')
-        
-        company = data.get('company', {})
-        ws['A7'] = f"상호: {company.get('name', '')}"
-        ws['A8'] = f"사업자등록번호: {company.get('business_number', '')}"
-        ws['A9'] = f"주소: {company.get('address', '')}"
-        ws['A10'] = f"대표자: {company.get('ceo', '')}"
-        ws['A11'] = f"전화번호: {company.get('phone', '')}"
-        
-        # 수요업체 정보
-        ws['E6'] = '수요업체'
-        ws['E6'].font = sub_header_font
-        ws.merge_cells('E6:H6')
-        
+        data = export_numbers(request.json, ESTIMATE_NUMBER_FIELDS, ('subtotal', 'tax', 'total'))
         client = data.get('client', {})
-        ws['E7'] = f"상호: {client.get('name', '')}"
-        ws['E8'] = f"사업자등록번호: {client.get('business_number', '')}"
-        ws['E9'] = f"주소: {client.get('address', '')}"
-        ws['E10'] = f"대표자: {client.get('ceo', '')}"
-        ws['E11'] = f"전화번호: {client.get('phone', '')}"
-        
-        # 한글 금액 표시
-        total_amount = data.get('total', 0)
-        korean_amount = number_to_korean(int(total_amount))
-        ws.merge_cells('A13:H13')
-        ws['A13'] = f'금액: {korean_amount}'
-        ws['A13'].font = Font(bold=True, size=12)
-        ws['A13'].alignment = Alignment(horizontal='center')
-        
-        # 항목 테이블 헤더
-        headers = ['공종', '품목', '규격', '단위', '수량', '단가', '공급가액', '비고']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=15, column=col, value=header)
-            cell.font = sub_header_font
-            cell.border = border
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal='center')
-        
-        # 항목 데이터
-        items = data.get('items', [])
-        start_row = 16
-        for idx, item in enumerate(items):
-            row = start_row + idx
-            ws.cell(row=row, column=1, value=item.get('category', '')).border = border
-            ws.cell(row=row, column=2, value=item.get('name', '')).border = border
-            ws.cell(row=row, column=3, value=item.get('spec', '')).border = border
-            ws.cell(row=row, column=4, value=item.get('unit', 'EA')).border = border
-            ws.cell(row=row, column=5, value=item.get('quantity', 0)).border = border
-            ws.cell(row=row, column=6, value=item.get('price', 0)).border = border
-            ws.cell(row=row, column=7, value=item.get('total', 0)).border = border
-            ws.cell(row=row, column=8, value=item.get('note', '')).border = border
         
-        # 합계 테이블
-        summary_row = start_row + len(items) + 2
-        ws.merge_cells(f'A{summary_row}:F{summary_row}')
-        ws[f'A{summary_row}'] = '합계'
-        
-        # 공급가액, 세액, 총액 표시
-        subtotal = data.get('subtotal', 0)
-        tax = data.get('tax', 0)
-        
-        ws[f'A{summary_row + 1}'] = '공급가액'
-        ws[f'B{summary_row + 1}'] = subtotal
-        ws[f'C{summary_row + 1}'] = '세액'
-        ws[f'D{summary_row + 1}'] = tax
-        ws[f'E{summary_row + 1}'] = '합계금액'
-        ws[f'F{summary_row + 1}'] = total_amount
-        
-        # 컬럼 너비 조정
-        column_widths = [12, 25, 15, 8, 8, 15, 15, 20]
-        for i, width in enumerate(column_widths, 1):
-            ws.column_dimensions[chr(64 + i)].width = width
-        
-        # 파일 저장
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
+        from exports import build_estimate_workbook
+        output = build_estimate_workbook(data)
         
         filename = f"{data.get('estimate_date', datetime.now().strftime('%Y-%m-%d'))}_{client.get('name', '견적서')}.xlsx"
         
@@ -365,77 +308,14 @@ def export_estimate_excel():
         return error_response(f"엑셀 파일 생성 중 오류가 발생했습니다: {str(e)}", 500, "EXCEL_EXPORT_ERROR")
 
 # 영수증 기록 엑셀 생성
-@app.route('/api/export_daily_excel', methods=['POST'])
+@bp.route('/api/export_daily_excel', methods=['POST'])
+@validate_json('daily_export')
 def export_daily_excel():
     try:
-        data = request.json
-        
-        # 워크북 생성
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "영수증기록"
-        
-        # 스타일 정의
-        header_font = Font(bold=True, size=14)
-        sub_header_font = Font(bold=True, size=11)
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        header_fill = PatternFill(start_color='F0F0F0', end_color='F0F0F0', fill_type='solid')
-        
-        # 제목
-        ws.merge_cells('A1:E1')
-        ws['A1'] = '일일 영수증 기록 내역서'
-        ws['A1'].font = header_font
-        ws['A1'].alignment = Alignment(horizontal='center')
-        
-        # 기본 정보
-        ws['A3'] = '현장명:'
-        ws['B3'] = data.get('site_name', '')
-        ws['D3'] = '기록일자:'
-        ws['E3'] = data.get('date', '')
+        data = export_numbers(request.json, DAILY_NUMBER_FIELDS, ())
         
-        # 테이블 헤더
-        headers = ['카테고리', '사용내역', '단가(원)', '금액(원)', '비고']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=5, column=col, value=header)
-            cell.font = sub_header_font
-            cell.border = border
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal='center')
-        
-        # 데이터 행
-        items = data.get('items', [])
-        total_amount = 0
-        
-        for idx, item in enumerate(items):
-            row = 6 + idx
-            ws.cell(row=row, column=1, value=item.get('category', '')).border = border
-            ws.cell(row=row, column=2, value=item.get('content', '')).border = border
-            ws.cell(row=row, column=3, value=item.get('rate', 0)).border = border
-            ws.cell(row=row, column=4, value=item.get('amount', 0)).border = border
-            ws.cell(row=row, column=5, value=item.get('note', '')).border = border
-            total_amount += item.get('amount', 0)
-        
-        # 합계 행
-        total_row = 6 + len(items) + 1
-        ws.cell(row=total_row, column=3, value='합계').font = Font(bold=True)
-        ws.cell(row=total_row, column=4, value=total_amount).font = Font(bold=True)
-        
-        # 컬럼 너비 조정
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 35
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 15
-        ws.column_dimensions['E'].width = 25
-        
-        # 파일 저장
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
+        from exports import build_daily_workbook
+        output = build_daily_workbook(data)
         
         filename = f"{data.get('date', datetime.now().strftime('%Y-%m-%d'))}_{data.get('site_name', '영수증기록')}.xlsx"
         
@@ -450,22 +330,26 @@ def export_daily_excel():
         return jsonify({'error': str(e)}), 500
 
 # 은행 계좌 API
-@app.route('/api/bank_accounts', methods=['GET', 'POST'])
+def load_bank_accounts():
+    conn = get_db()
+    cursor = conn.cursor()
+    cursor.execute('SELECT * FROM bank_accounts ORDER BY created_at DESC')
+    accounts = cursor.fetchall()
+    conn.close()
+    
+    columns = ['id', 'bank_name', 'account_number', 'account_holder', 'created_at']
+    result = [dict(zip(columns, account)) for account in accounts]
+    return jsonify(result)
+
+@bp.route('/api/bank_accounts', methods=['GET', 'POST'])
+@validate_json('bank_account')
 def handle_bank_accounts():
     if request.method == 'GET':
-        conn = sqlite3.connect('estimate.db')
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM bank_accounts ORDER BY created_at DESC')
-        accounts = cursor.fetchall()
-        conn.close()
-        
-        columns = ['id', 'bank_name', 'account_number', 'account_holder', 'created_at']
-        result = [dict(zip(columns, account)) for account in accounts]
-        return jsonify(result)
+        return reference_cache.response('bank_accounts', load_bank_accounts)
     
     elif request.method == 'POST':
         data = request.json
-        conn = sqlite3.connect('estimate.db')
+        conn = get_db()
         cursor = conn.cursor()
         cursor.execute('''
             INSERT INTO bank_accounts (bank_name, account_number, account_holder)
@@ -480,9 +364,9 @@ def handle_bank_accounts():
         conn.close()
         return jsonify({'id': account_id, 'message': '계좌 정보가 저장되었습니다.'})
 
-@app.route('/api/bank_accounts/<int:account_id>', methods=['DELETE'])
+@bp.route('/api/bank_accounts/<int:account_id>', methods=['DELETE'])
 def delete_bank_account(account_id):
-    conn = sqlite3.connect('estimate.db')
+    conn = get_db()
     cursor = conn.cursor()
     cursor.execute('DELETE FROM bank_accounts WHERE id = ?', (account_id,))
     conn.commit()
@@ -490,15 +374,29 @@ def delete_bank_account(account_id):
     return jsonify({'message': '계좌 정보가 삭제되었습니다.'})
 
 # 데이터베이스 API 엔드포인트들
-@app.route('/api/companies', methods=['GET', 'POST'])
+def load_companies():
+    try:
+        conn = get_db()
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM companies ORDER BY created_at DESC')
+        companies = cursor.fetchall()
+        conn.close()
+        
+        columns = ['id', 'name', 'business_number', 'address', 'ceo', 'type', 'item', 'phone', 'fax', 'manager', 'created_at']
+        result = [dict(zip(columns, company)) for company in companies]
+        logger.info(f"회사 정보 조회 성공: {len(result)}건")
+        return success_response(result, "회사 정보 조회 성공")
+    except Exception as e:
+        logger.exception("회사 정보 조회 실패")
+        return error_response("회사 정보 조회 중 오류가 발생했습니다", 500, "DB_ERROR")
+
+@bp.route('/api/companies', methods=['GET', 'POST'])
+@validate_json('company')
 def companies():
     if request.method == 'POST':
         try:
             data = request.json
-            if not data or not data.get('name'):
-                return error_response("회사명이 필요합니다", 400, "MISSING_COMPANY_NAME")
-            
-            conn = sqlite3.connect('estimate.db')
+            conn = get_db()
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO companies (name, business_number, address, ceo, type, item, phone, fax, manager)
@@ -518,25 +416,12 @@ def companies():
             return error_response("회사 정보 저장 중 오류가 발생했습니다", 500, "DB_ERROR")
     
     else:
-        try:
-            conn = sqlite3.connect('estimate.db')
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM companies ORDER BY created_at DESC')
-            companies = cursor.fetchall()
-            conn.close()
-            
-            columns = ['id', 'name', 'business_number', 'address', 'ceo', 'type', 'item', 'phone', 'fax', 'manager', 'created_at']
-            result = [dict(zip(columns, company)) for company in companies]
-            logger.info(f"회사 정보 조회 성공: {len(result)}건")
-            return success_response(result, "회사 정보 조회 성공")
-        except Exception as e:
-            logger.exception("회사 정보 조회 실패")
-            return error_response("회사 정보 조회 중 오류가 발생했습니다", 500, "DB_ERROR")
+        return reference_cache.response('companies', load_companies)
 
-@app.route('/api/companies/<int:company_id>', methods=['DELETE'])
+@bp.route('/api/companies/<int:company_id>', methods=['DELETE'])
 def delete_company(company_id):
     try:
-        conn = sqlite3.connect('estimate.db')
+        conn = get_db()
         cursor = conn.cursor()
         
         # 먼저 해당 회사가 존재하는지 확인
@@ -566,23 +451,27 @@ def delete_company(company_id):
         return error_response("회사 정보 삭제 중 오류가 발생했습니다", 500, "DB_ERROR")
 
 # 고객 정보 API
-@app.route('/api/clients', methods=['GET', 'POST'])
+def load_clients():
+    conn = get_db()
+    cursor = conn.cursor()
+    cursor.execute('SELECT * FROM clients ORDER BY created_at DESC')
+    clients = cursor.fetchall()
+    conn.close()
+    
+    # 컬럼명과 함께 결과 반환
+    columns = ['id', 'type', 'name', 'business_number', 'address', 'ceo', 'phone', 'manager', 'created_at']
+    result = [dict(zip(columns, client)) for client in clients]
+    return jsonify(result)
+
+@bp.route('/api/clients', methods=['GET', 'POST'])
+@validate_json('client')
 def handle_clients():
     if request.method == 'GET':
-        conn = sqlite3.connect('estimate.db')
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM clients ORDER BY created_at DESC')
-        clients = cursor.fetchall()
-        conn.close()
-        
-        # 컬럼명과 함께 결과 반환
-        columns = ['id', 'type', 'name', 'business_number', 'address', 'ceo', 'phone', 'manager', 'created_at']
-        result = [dict(zip(columns, client)) for client in clients]
-        return jsonify(result)
+        return reference_cache.response('clients', load_clients)
     
     elif request.method == 'POST':
         data = request.json
-        conn = sqlite3.connect('estimate.db')
+        conn = get_db()
         cursor = conn.cursor()
         cursor.execute('''
             INSERT INTO clients (type, name, business_number, address, ceo, phone, manager)
@@ -601,9 +490,9 @@ def handle_clients():
         conn.close()
         return jsonify({'id': client_id, 'message': '고객 정보가 저장되었습니다.'})
 
-@app.route('/api/clients/<int:client_id>', methods=['DELETE'])
+@bp.route('/api/clients/<int:client_id>', methods=['DELETE'])
 def delete_client(client_id):
-    conn = sqlite3.connect('estimate.db')
+    conn = get_db()
     cursor = conn.cursor()
     cursor.execute('DELETE FROM clients WHERE id = ?', (client_id,))
     conn.commit()
@@ -611,10 +500,13 @@ def delete_client(client_id):
     return jsonify({'message': '고객 정보가 삭제되었습니다.'})
 
 # 견적서 데이터 API
-@app.route('/api/estimates', methods=['GET', 'POST'])
+ESTIMATE_NUMBER_FIELDS = ('quantity', 'price', 'total')
+
+@bp.route('/api/estimates', methods=['GET', 'POST'])
+@validate_json('estimate')
 def handle_estimates():
     if request.method == 'GET':
-        conn = sqlite3.connect('estimate.db')
+        conn = get_db()
         cursor = conn.cursor()
         cursor.execute('''
             SELECT e.id, e.estimate_number, e.estimate_date, 
@@ -635,7 +527,10 @@ def handle_estimates():
     
     elif request.method == 'POST':
         data = request.json
-        conn = sqlite3.connect('estimate.db')
+        # "1,000" 같은 숫자 문자열은 숫자로 저장 (현장 정산 보고서가 estimate_items 의 금액을 SUM 으로 합산)
+        items = [dict(item, **{key: schemas.parse_number(item[key]) for key in ESTIMATE_NUMBER_FIELDS if key in item})
+                 for item in data.get('items') or []]
+        conn = get_db()
         cursor = conn.cursor()
         # 회사 정보 저장 (있다면)
         company_id = None
@@ -659,6 +554,8 @@ def handle_estimates():
         # 고객 정보 저장 (있다면)
         client_id = None
         if 'client' in data and data['client']:
+            from revisions import client_phone
+            
             cursor.execute('''
                 INSERT INTO clients (type, name, business_number, address, ceo, phone, manager)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
@@ -668,7 +565,7 @@ def handle_estimates():
                 data['client'].get('business_number', ''),
                 data['client'].get('address', ''),
                 data['client'].get('ceo', ''),
-                data['client'].get('contact', ''),
+                client_phone(data['client']),
                 data['client'].get('manager', '')
             ))
             client_id = cursor.lastrowid
@@ -682,15 +579,14 @@ def handle_estimates():
             data.get('valid_until', ''),
             company_id,
             client_id,
-            data.get('subtotal', 0),
-            data.get('tax', 0),
-            data.get('total', 0),
-            json.dumps(data.get('items', []), ensure_ascii=False)
+            schemas.parse_number(data.get('subtotal', 0)),
+            schemas.parse_number(data.get('tax', 0)),
+            schemas.parse_number(data.get('total', 0)),
+            json.dumps(items, ensure_ascii=False)
         ))
         estimate_id = cursor.lastrowid
         
         # 견적 항목들 저장
-        items = data.get('items', [])
         for item in items:
             cursor.execute('''
                 INSERT INTO estimate_items (estimate_id, category, name, spec, quantity, price, total, note)
@@ -709,10 +605,19 @@ def handle_estimates():
         conn.close()
         return jsonify({'id': estimate_id, 'message': '견적서가 저장되었습니다.'})
 
-@app.route('/api/estimates/<int:estimate_id>', methods=['GET', 'DELETE'])
+@bp.route('/api/estimates/<int:estimate_id>', methods=['GET', 'PUT', 'PATCH', 'DELETE'])
+@validate_json('estimate_revision', methods=('PUT', 'PATCH'))
 def handle_estimate(estimate_id):
     if request.method == 'GET':
-        conn = sqlite3.connect('estimate.db')
+        from revisions import latest_revision, rebuild
+        
+        # revision 을 지정했다면 1 이상의 정수여야 함 (0/음수/문자를 최신본으로 취급하지 않음)
+        revision = None
+        if 'revision' in request.args:
+            revision = request.args.get('revision', type=int)
+            if revision is None or revision < 1:
+                return error_response("버전 번호는 1 이상의 정수여야 합니다", 400, "INVALID_REVISION_NUMBER")
+        conn = get_db()
         cursor = conn.cursor()
         cursor.execute('''
             SELECT e.*, c.name as company_name, cl.name as client_name 
@@ -728,15 +633,34 @@ def handle_estimate(estimate_id):
             SELECT * FROM estimate_items WHERE estimate_id = ? ORDER BY id
         ''', (estimate_id,))
         estimate_items = cursor.fetchall()
+        latest = latest_revision(cursor, estimate_id)
+        
+        # 이전 버전 요청 시 최신본에서 변경분을 되돌려 복원
+        header = None
+        if estimate and revision is not None and revision != latest:
+            if revision > latest:
+                conn.close()
+                return error_response("해당 버전을 찾을 수 없습니다", 404, "REVISION_NOT_FOUND")
+            header, items = rebuild(cursor, estimate_id, revision)
+            for key in ('company', 'client'):
+                cursor.execute(f"SELECT name FROM {'companies' if key == 'company' else 'clients'} WHERE id = ?",
+                               (header[f'{key}_id'],))
+                row = cursor.fetchone()
+                header[f'{key}_name'] = row[0] if row else None
         conn.close()
         
         if estimate:
             columns = ['id', 'estimate_number', 'estimate_date', 'valid_until', 'company_id', 'client_id', 'bank_id',
                       'subtotal', 'tax', 'total', 'items_json', 'created_at', 'company_name', 'client_name']
             result = dict(zip(columns, estimate))
+            result['revision'] = revision if header else latest
+            result['latest_revision'] = latest
             
+            if header:
+                result.update(header)
+                result['items'] = items
             # 견적 항목들 포맷팅
-            if estimate_items:
+            elif estimate_items:
                 item_columns = ['id', 'estimate_id', 'category', 'name', 'spec', 'quantity', 'price', 'total', 'note', 'created_at']
                 formatted_items = []
                 for item in estimate_items:
@@ -754,19 +678,59 @@ def handle_estimate(estimate_id):
         else:
             return jsonify({'error': '견적서를 찾을 수 없습니다.'}), 404
     
+    elif request.method in ('PUT', 'PATCH'):
+        # 견적서 수정: 바뀐 필드와 항목만 새 버전으로 저장
+        from revisions import RevisionError, save_revision
+        
+        data = request.json
+        conn = get_db()
+        try:
+            revision, changed = save_revision(conn, estimate_id, data, partial=request.method == 'PATCH')
+        except RevisionError as e:
+            return error_response(str(e), 400, "INVALID_REVISION")
+        finally:
+            conn.close()
+        
+        if revision is None:
+            return jsonify({'error': '견적서를 찾을 수 없습니다.'}), 404
+        message = '견적서가 수정되었습니다.' if changed else '변경된 내용이 없습니다.'
+        return jsonify({'id': estimate_id, 'revision': revision, 'changed': changed, 'message': message})
+    
     elif request.method == 'DELETE':
-        conn = sqlite3.connect('estimate.db')
+        conn = get_db()
         cursor = conn.cursor()
         cursor.execute('DELETE FROM estimates WHERE id = ?', (estimate_id,))
+        cursor.execute('DELETE FROM estimate_revisions WHERE estimate_id = ?', (estimate_id,))
         conn.commit()
         conn.close()
         return jsonify({'message': '견적서가 삭제되었습니다.'})
 
+@bp.route('/api/estimates/<int:estimate_id>/revisions', methods=['GET'])
+def get_estimate_revisions(estimate_id):
+    from revisions import list_revisions
+    
+    conn = get_db()
+    cursor = conn.cursor()
+    cursor.execute('SELECT created_at FROM estimates WHERE id = ?', (estimate_id,))
+    estimate = cursor.fetchone()
+    if not estimate:
+        conn.close()
+        return jsonify({'error': '견적서를 찾을 수 없습니다.'}), 404
+    revisions = list_revisions(cursor, estimate_id)
+    conn.close()
+    
+    # 1번은 최초 저장본
+    return jsonify([{'revision': 1, 'changed_fields': [], 'added_items': 0, 'updated_items': 0,
+                     'deleted_items': 0, 'created_at': estimate[0]}] + revisions)
+
 # 영수증 기록 API
-@app.route('/api/daily_records', methods=['GET', 'POST'])
+DAILY_NUMBER_FIELDS = ('rate', 'amount')
+
+@bp.route('/api/daily_records', methods=['GET', 'POST'])
+@validate_json('daily_record')
 def handle_daily_records():
     if request.method == 'GET':
-        conn = sqlite3.connect('estimate.db')
+        conn = get_db()
         cursor = conn.cursor()
         cursor.execute('''
             SELECT id, date as daily_date, site_name, total, created_at
@@ -781,7 +745,10 @@ def handle_daily_records():
     
     elif request.method == 'POST':
         data = request.json
-        conn = sqlite3.connect('estimate.db')
+        # "1,000" 같은 숫자 문자열은 숫자로 저장 (현장 정산 보고서가 items JSON 의 금액을 그대로 합산)
+        items = [dict(item, **{key: schemas.parse_number(item[key]) for key in DAILY_NUMBER_FIELDS if key in item})
+                 for item in data.get('items') or []]
+        conn = get_db()
         cursor = conn.cursor()
         cursor.execute('''
             INSERT INTO daily_records (date, site_name, total, items)
@@ -789,18 +756,18 @@ def handle_daily_records():
         ''', (
             data.get('daily_date', ''),
             data.get('site_name', ''),
-            data.get('total_amount', 0),
-            json.dumps(data.get('items', []), ensure_ascii=False)
+            schemas.parse_number(data.get('total_amount', 0)),
+            json.dumps(items, ensure_ascii=False)
         ))
         record_id = cursor.lastrowid
         conn.commit()
         conn.close()
         return jsonify({'id': record_id, 'message': '영수증 기록이 저장되었습니다.'})
 
-@app.route('/api/daily_records/<int:record_id>', methods=['GET', 'DELETE'])
+@bp.route('/api/daily_records/<int:record_id>', methods=['GET', 'DELETE'])
 def handle_daily_record(record_id):
     if request.method == 'GET':
-        conn = sqlite3.connect('estimate.db')
+        conn = get_db()
         cursor = conn.cursor()
         cursor.execute('SELECT * FROM daily_records WHERE id = ?', (record_id,))
         record = cursor.fetchone()
@@ -820,16 +787,206 @@ def handle_daily_record(record_id):
             return jsonify({'error': '영수증 기록을 찾을 수 없습니다.'}), 404
     
     elif request.method == 'DELETE':
-        conn = sqlite3.connect('estimate.db')
+        conn = get_db()
         cursor = conn.cursor()
         cursor.execute('DELETE FROM daily_records WHERE id = ?', (record_id,))
         conn.commit()
         conn.close()
         return jsonify({'message': '영수증 기록이 삭제되었습니다.'})
 
+# 현장 정산 보고서 API
+def load_site_report():
+    """쿼리 파라미터(site_name, start, end, estimate_id)로 보고서 생성, 잘못된 요청이면 (None, 오류 응답)"""
+    site_name = request.args.get('site_name', '').strip()
+    start = request.args.get('start', '').strip()
+    end = request.args.get('end', '').strip()
+    estimate_id = request.args.get('estimate_id', type=int)
+    
+    if not site_name:
+        return None, error_response("현장명이 필요합니다", 400, "MISSING_SITE_NAME")
+    for value in (start, end):
+        if value and not schemas.DATE_PATTERN.match(value):
+            return None, error_response("날짜는 YYYY-MM-DD 형식이어야 합니다", 400, "INVALID_DATE")
+    if start and end and start > end:
+        return None, error_response("시작일이 종료일보다 늦습니다", 400, "INVALID_DATE_RANGE")
+    
+    conn = get_db()
+    cursor = conn.cursor()
+    report = site_report(cursor, site_name, start, end, estimate_id)
+    conn.close()
+    
+    if report is None:
+        return None, error_response("견적서를 찾을 수 없습니다", 404, "ESTIMATE_NOT_FOUND")
+    return report, None
+
+@bp.route('/api/reports/sites', methods=['GET'])
+def get_report_sites():
+    conn = get_db()
+    cursor = conn.cursor()
+    sites = list_sites(cursor)
+    conn.close()
+    return success_response(sites)
+
+@bp.route('/api/reports/site', methods=['GET'])
+def get_site_report():
+    report, error = load_site_report()
+    if error:
+        return error
+    return success_response(report)
+
+@bp.route('/api/reports/site/excel', methods=['GET'])
+def export_site_report_excel():
+    report, error = load_site_report()
+    if error:
+        return error
+    
+    try:
+        from exports import build_site_report_workbook
+        output = build_site_report_workbook(report)
+        
+        filename = f"{report['site_name']}_정산보고서_{datetime.now().strftime('%Y-%m-%d')}.xlsx"
+        
+        return send_file(
+            output,
+            as_attachment=True,
+            download_name=filename,
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
+    
+    except Exception as e:
+        logger.exception("현장 정산 보고서 엑셀 내보내기 실패")
+        return error_response(f"엑셀 파일 생성 중 오류가 발생했습니다: {str(e)}", 500, "EXCEL_EXPORT_ERROR")
+
+# 일괄 가져오기 API
+@bp.route('/api/import/<kind>', methods=['POST'])
+def start_import(kind):
+    from importer import IMPORT_KINDS, SUPPORTED_EXTENSIONS, start_import_job
+    
+    if kind not in IMPORT_KINDS:
+        return error_response("지원하지 않는 가져오기 유형입니다", 400, "INVALID_IMPORT_KIND")
+    
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        return error_response("가져올 파일이 필요합니다", 400, "MISSING_IMPORT_FILE")
+    
+    ext = os.path.splitext(upload.filename)[1].lower()
+    if ext not in SUPPORTED_EXTENSIONS:
+        return error_response("xlsx 또는 csv 파일만 가져올 수 있습니다", 400, "INVALID_IMPORT_FILE")
+    
+    try:
+        # 업로드 파일은 임시 파일로 저장 후 백그라운드 작업에서 스트리밍으로 처리
+        fd, path = tempfile.mkstemp(suffix=ext)
+        os.close(fd)
+        upload.save(path)
+        job_id = start_import_job(current_db_path(), kind, path, upload.filename)
+        logger.info(f"일괄 가져오기 시작: {job_id} ({kind}, {upload.filename})")
+        return success_response({'job_id': job_id}, '가져오기 작업이 시작되었습니다', 202)
+    except Exception as e:
+        logger.exception("일괄 가져오기 시작 실패")
+        return error_response("가져오기 작업을 시작하지 못했습니다", 500, "IMPORT_ERROR")
+
+@bp.route('/api/import/jobs/<job_id>', methods=['GET'])
+def get_import_job(job_id):
+    from importer import get_import_job as load_import_job
+    
+    job = load_import_job(current_db_path(), job_id)
+    if not job:
+        return error_response("가져오기 작업을 찾을 수 없습니다", 404, "IMPORT_JOB_NOT_FOUND")
+    return success_response(job, "가져오기 작업 조회 성공")
+
+# 지점 전체 조회 (관리자, 읽기 전용)
+ADMIN_QUERIES = {
+    'summary': '''
+        SELECT
+            (SELECT COUNT(*) FROM estimates) AS estimates,
+            (SELECT COALESCE(SUM(total), 0) FROM estimates) AS estimate_total,
+            (SELECT COUNT(*) FROM daily_records) AS daily_records,
+            (SELECT COALESCE(SUM(total), 0) FROM daily_records) AS daily_total,
+            (SELECT COUNT(*) FROM clients) AS clients
+    ''',
+    'estimates': '''
+        SELECT e.id, e.estimate_number, e.estimate_date, e.total, c.name AS company_name, cl.name AS client_name
+        FROM estimates e
+        LEFT JOIN companies c ON e.company_id = c.id
+        LEFT JOIN clients cl ON e.client_id = cl.id
+        WHERE (? = '' OR e.estimate_date >= ?) AND (? = '' OR e.estimate_date <= ?)
+        ORDER BY e.estimate_date DESC, e.id DESC
+        LIMIT ?
+    ''',
+    'daily_records': '''
+        SELECT id, date, site_name, total
+        FROM daily_records
+        WHERE (? = '' OR date >= ?) AND (? = '' OR date <= ?)
+        ORDER BY date DESC, id DESC
+        LIMIT ?
+    ''',
+}
+
+@bp.route('/api/admin/tenants', methods=['GET'])
+def get_admin_tenants():
+    if not tenants.check_admin_token(request.headers.get(tenants.ADMIN_HEADER)):
+        return error_response("관리자 권한이 필요합니다", 403, "ADMIN_REQUIRED")
+    
+    result = [{'tenant': name, 'size': os.path.getsize(path) if os.path.exists(path) else 0}
+              for name, path in tenants.list_tenants().items()]
+    return success_response(result, "지점 목록 조회 성공")
+
+@bp.route('/api/admin/<resource>', methods=['GET'])
+def query_all_tenants(resource):
+    if not tenants.check_admin_token(request.headers.get(tenants.ADMIN_HEADER)):
+        return error_response("관리자 권한이 필요합니다", 403, "ADMIN_REQUIRED")
+    if resource not in ADMIN_QUERIES:
+        return error_response("지원하지 않는 조회입니다", 404, "INVALID_ADMIN_QUERY")
+    
+    names = [name for name in request.args.get('tenant', '').split(',') if name]
+    params = ()
+    if resource != 'summary':
+        start = request.args.get('start', '')
+        end = request.args.get('end', '')
+        limit = min(request.args.get('limit', 100, type=int), 1000)
+        params = (start, start, end, end, limit)
+    
+    try:
+        rows = tenants.query_tenants(ADMIN_QUERIES[resource], params, names)
+    except Exception as e:
+        logger.exception("지점 전체 조회 실패")
+        return error_response(f"지점 조회 중 오류가 발생했습니다: {str(e)}", 500, "ADMIN_QUERY_ERROR")
+    return success_response(rows, "지점 전체 조회 성공")
+
+# 애플리케이션 팩토리
+def create_app():
+    log_config.configure_logging()
+    
+    app = Flask(__name__)
+    app.request_class = LimitedRequest
+    
+    # 보안 설정
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', secrets.token_hex(32))
+    # 이보다 큰 요청은 413으로 거절 (JSON 요청은 LimitedRequest 에서 MAX_JSON_BYTES 로 제한)
+    app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES
+    
+    # CORS 설정
+    CORS(app, origins=['http://localhost:*', 'http://127.0.0.1:*'])
+    
+    # 요청 ID/처리 시간 로그
+    log_config.init_app(app)
+    
+    # 해시가 붙은 미리 압축된 정적 파일 (/assets)
+    assets.init_app(app)
+    
+    # 다중 지점 모드: 요청마다 지점 데이터베이스 지정
+    tenants.init_app(app, init_db)
+    
+    app.register_blueprint(bp)
+    
+    # 데이터베이스 초기화 (다중 지점 모드에서는 지점별로 첫 요청 시 초기화)
+    if not tenants.enabled():
+        init_db()
+    
+    return app
+
 if __name__ == '__main__':
-    # 데이터베이스 초기화
-    init_db()
+    app = create_app()
     
     # 웹 서버 실행
     print("=== 인테리어 견적서 & 영수증 기록 생성기 ===")
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+정적 파일 빌드/제공
+script.js, style.css 와 static/vendor 의 외부 라이브러리를 압축(minify)하고 내용 해시를 붙여
+static/dist 에 .gz/.br 파일과 함께 저장합니다. 앱은 manifest.json 을 읽어 해시가 붙은 경로를
+템플릿에 넣고, 브라우저가 지원하는 미리 압축된 파일을 1년 캐시(immutable)로 제공합니다.
+
+명령줄:
+  python assets.py vendor   # CDN 라이브러리를 static/vendor 로 내려받기 (인터넷 연결 필요, 한 번만)
+  python assets.py build    # static/dist 빌드 (배포할 때마다)
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import sys
+
+from flask import abort, request, send_file, url_for
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # 설치되어 있지 않으면 .gz 만 생성
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+VENDOR_DIR = os.path.join(STATIC_DIR, 'vendor')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_FILE = 'manifest.json'
+
+SOURCE_FILES = ('script.js', 'style.css')
+COMPRESSIBLE = ('.js', '.css', '.svg', '.json', '.ttf', '.eot', '.map')
+# 이미 압축된 형식(woff2 등)은 .gz/.br 를 만들지 않음
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+FONT_AWESOME = 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0'
+GOOGLE_FONTS = ('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800;900'
+                '&family=Noto+Sans+KR:wght@300;400;500;700;900&display=swap')
+# Google Fonts 는 User-Agent 에 따라 다른 CSS 를 주므로 woff2 를 받는 최신 브라우저로 요청
+FONT_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+# static 기준 경로: 내려받을 CDN 주소 (내려받기 전에는 템플릿이 CDN 주소를 그대로 사용)
+VENDOR_FILES = {
+    'vendor/jspdf/jspdf.umd.min.js': 'https://cdnjs.cloudflare.com/ajax/libs/jspdf/2.5.1/jspdf.umd.min.js',
+    'vendor/html2canvas/html2canvas.min.js': 'https://cdnjs.cloudflare.com/ajax/libs/html2canvas/1.4.1/html2canvas.min.js',
+    'vendor/fontawesome/css/all.min.css': f'{FONT_AWESOME}/css/all.min.css',
+    'vendor/fonts/fonts.css': GOOGLE_FONTS,
+}
+for _font in ('fa-brands-400', 'fa-regular-400', 'fa-solid-900', 'fa-v4compatibility'):
+    for _ext in ('woff2', 'ttf'):
+        VENDOR_FILES[f'vendor/fontawesome/webfonts/{_font}.{_ext}'] = f'{FONT_AWESOME}/webfonts/{_font}.{_ext}'
+
+mimetypes.add_type('font/woff2', '.woff2')
+mimetypes.add_type('font/ttf', '.ttf')
+
+CSS_URL = re.compile(r'''url\(\s*(['"]?)([^'")]+)\1\s*\)''')
+# 이 문자 뒤의 / 는 나눗셈이 아니라 정규식 리터럴의 시작
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void',
+                  'throw', 'instanceof', 'yield', 'await'}
+
+_manifest = {}
+
+
+# ---------------------------------------------------------------------------
+# 압축(minify)
+# ---------------------------------------------------------------------------
+
+def _skip_string(source, i, quote):
+    """source[i]의 따옴표로 시작하는 문자열의 끝 다음 위치"""
+    i += 1
+    while i < len(source):
+        if source[i] == '\\':
+            i += 2
+        elif source[i] == quote:
+            return i + 1
+        else:
+            i += 1
+    return i
+
+
+def _skip_regex(source, i):
+    in_class = False
+    i += 1
+    while i < len(source):
+        char = source[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            i += 1
+            while i < len(source) and (source[i].isalnum() or source[i] == '_'):
+                i += 1
+            return i
+        elif char == '\n':
+            return i
+        i += 1
+    return i
+
+
+def minify_js(source):
+    """
+    주석, 들여쓰기, 빈 줄과 연속된 공백 제거
+    줄바꿈은 남겨 자동 세미콜론 삽입 결과가 바뀌지 않도록 하고, 문자열/템플릿/정규식 안은 그대로 둡니다.
+    """
+    out = []
+    pending_space = False
+    last = ''        # 마지막으로 출력한 코드 문자 (공백 제외)
+    word = ''        # 마지막으로 출력한 식별자
+    braces = []      # 템플릿 ${ } 안에서 열린 중괄호 수
+    i = 0
+    n = len(source)
+
+    def emit(text):
+        nonlocal pending_space
+        if pending_space and out and out[-1][-1:] != '\n':
+            out.append(' ')
+        pending_space = False
+        out.append(text)
+
+    def newline():
+        nonlocal pending_space
+        pending_space = False
+        if out and out[-1][-1:] != '\n':
+            out.append('\n')
+
+    def template(i):
+        # ` 또는 } 다음부터 템플릿 문자열을 읽다가 ${ 를 만나면 코드로 돌아감
+        start = i
+        while i < n:
+            if source[i] == '\\':
+                i += 2
+            elif source[i] == '`':
+                out.append(source[start:i + 1])
+                return i + 1
+            elif source.startswith('${', i):
+                out.append(source[start:i + 2])
+                braces.append(0)
+                return i + 2
+            else:
+                i += 1
+        out.append(source[start:])
+        return n
+
+    while i < n:
+        char = source[i]
+        if char == '\n':
+            newline()
+            i += 1
+        elif char in ' \t\r':
+            pending_space = True
+            i += 1
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            i = n if end == -1 else end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            if '\n' in source[i:end]:
+                newline()
+            else:
+                pending_space = True
+            i = end
+        elif char in '\'"':
+            end = _skip_string(source, i, char)
+            emit(source[i:end])
+            last, word, i = char, '', end
+        elif char == '`':
+            emit('`')
+            i = template(i + 1)
+            last, word = '`', ''
+        elif char == '/' and (last in REGEX_PRECEDERS or last == '' or word in REGEX_KEYWORDS):
+            end = _skip_regex(source, i)
+            emit(source[i:end])
+            last, word, i = '/', '', end
+        elif char == '}' and braces and braces[-1] == 0:
+            # 템플릿의 ${ } 가 끝나면 템플릿 문자열로 돌아감
+            braces.pop()
+            emit('}')
+            i = template(i + 1)
+            last, word = '`', ''
+        elif char.isalnum() or char in '_$':
+            start = i
+            while i < n and (source[i].isalnum() or source[i] in '_$'):
+                i += 1
+            emit(source[start:i])
+            last, word = source[i - 1], source[start:i]
+        else:
+            if braces and char == '{':
+                braces[-1] += 1
+            elif braces and char == '}':
+                braces[-1] -= 1
+            emit(char)
+            last, word = char, ''
+            i += 1
+    return ''.join(out).strip() + '\n'
+
+
+def minify_css(source):
+    """주석과 불필요한 공백 제거 (문자열 안은 그대로, 선택자의 공백 의미가 바뀌지 않도록 { } ; , 주변만)"""
+    out = []
+    i = 0
+    n = len(source)
+    while i < n:
+        char = source[i]
+        if source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            out.append(' ')
+        elif char in '\'"':
+            end = _skip_string(source, i, char)
+            out.append(source[i:end])
+            i = end
+        elif char.isspace():
+            while i < n and source[i].isspace():
+                i += 1
+            out.append(' ')
+        else:
+            out.append(char)
+            i += 1
+    text = ''.join(out)
+    # 문자열을 다시 나누지 않도록 따옴표 밖에서만 공백 정리
+    parts = re.split(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''', text)
+    for index in range(0, len(parts), 2):
+        part = re.sub(r' *([{};,]) *', r'\1', parts[index])
+        parts[index] = part.replace(';}', '}')
+    return ''.join(parts).strip() + '\n'
+
+
+# ---------------------------------------------------------------------------
+# 빌드
+# ---------------------------------------------------------------------------
+
+def _fingerprint(name, data):
+    base, ext = os.path.splitext(name)
+    return f'{base}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+
+
+def _write(dist_dir, name, data):
+    """해시가 붙은 파일과 압축 파일을 저장하고 (dist 기준 경로, 크기 정보) 반환"""
+    path = _fingerprint(name, data)
+    target = os.path.join(dist_dir, path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'wb') as f:
+        f.write(data)
+
+    sizes = {'size': len(data)}
+    if name.endswith(COMPRESSIBLE):
+        variants = [('gz', gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('br', brotli.compress(data, quality=11)))
+        for ext, compressed in variants:
+            # 더 작아질 때만 저장 (작은 파일은 오히려 커질 수 있음)
+            if len(compressed) < len(data):
+                with open(f'{target}.{ext}', 'wb') as f:
+                    f.write(compressed)
+                sizes[ext] = len(compressed)
+    return path.replace(os.sep, '/'), sizes
+
+
+def _rewrite_css_urls(name, css, manifest):
+    """CSS의 상대 경로 url()을 해시가 붙은 파일 이름으로 변경"""
+    directory = os.path.dirname(name)
+
+    def replace(match):
+        url = match.group(2)
+        if url.startswith(('data:', 'http:', 'https:', '//', '/')):
+            return match.group(0)
+        path, _, fragment = url.split('?')[0].partition('#')
+        target = os.path.normpath(os.path.join(directory, path)).replace(os.sep, '/')
+        if target not in manifest:
+            return match.group(0)
+        # dist 는 static 과 같은 디렉터리 구조이므로 CSS 위치 기준 상대 경로 유지
+        relative = os.path.relpath(manifest[target], directory or '.').replace(os.sep, '/')
+        return f"url({relative}{'#' + fragment if fragment else ''})"
+
+    return CSS_URL.sub(replace, css)
+
+
+def _source_names(static_dir):
+    names = [name for name in SOURCE_FILES if os.path.exists(os.path.join(static_dir, name))]
+    vendor_dir = os.path.join(static_dir, 'vendor')
+    for root, _, files in os.walk(vendor_dir):
+        for filename in sorted(files):
+            names.append(os.path.relpath(os.path.join(root, filename), static_dir).replace(os.sep, '/'))
+    # CSS 가 참조하는 폰트/이미지의 해시를 먼저 정해야 하므로 CSS 는 마지막에 처리
+    return sorted(names, key=lambda name: name.endswith('.css'))
+
+
+def build(static_dir=STATIC_DIR, dist_dir=None):
+    """static/dist 를 새로 만들고 {원래 경로: 크기 정보} 반환"""
+    dist_dir = dist_dir or os.path.join(static_dir, 'dist')
+    if os.path.exists(dist_dir):
+        shutil.rmtree(dist_dir)
+    os.makedirs(dist_dir)
+
+    manifest = {}
+    report = {}
+    for name in _source_names(static_dir):
+        with open(os.path.join(static_dir, name), 'rb') as f:
+            data = f.read()
+        original = len(data)
+        vendored = name.startswith('vendor/')
+        if name.endswith('.js') and not vendored:
+            data = minify_js(data.decode('utf-8')).encode('utf-8')
+        elif name.endswith('.css'):
+            css = data.decode('utf-8')
+            if not vendored:
+                css = minify_css(css)
+            data = _rewrite_css_urls(name, css, manifest).encode('utf-8')
+        manifest[name], sizes = _write(dist_dir, name, data)
+        report[name] = dict(sizes, original=original, path=manifest[name])
+
+    with open(os.path.join(dist_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return report
+
+
+# ---------------------------------------------------------------------------
+# 외부 라이브러리 내려받기
+# ---------------------------------------------------------------------------
+
+def _download(url, user_agent=None):
+    # vendor 명령에서만 쓰므로 워커 시작 시간에 포함되지 않도록 여기서 import
+    import urllib.request
+
+    req = urllib.request.Request(url, headers={'User-Agent': user_agent or 'estimate-webapp'})
+    with urllib.request.urlopen(req, timeout=60) as response:
+        return response.read()
+
+
+def _vendor_google_fonts(target):
+    """Google Fonts CSS와 woff2 파일을 내려받고 CSS의 주소를 로컬 파일로 변경"""
+    css = _download(GOOGLE_FONTS, FONT_USER_AGENT).decode('utf-8')
+    directory = os.path.dirname(target)
+    files = {}
+
+    def replace(match):
+        url = match.group(2)
+        filename = files.get(url)
+        if filename is None:
+            filename = files[url] = f"{hashlib.sha256(url.encode()).hexdigest()[:16]}{os.path.splitext(url)[1]}"
+            with open(os.path.join(directory, filename), 'wb') as f:
+                f.write(_download(url, FONT_USER_AGENT))
+        return f'url({filename})'
+
+    css = CSS_URL.sub(replace, css)
+    with open(target, 'w', encoding='utf-8') as f:
+        f.write(css)
+    return len(files)
+
+
+def vendor(static_dir=STATIC_DIR):
+    """VENDOR_FILES 를 static/vendor 로 내려받음"""
+    for name, url in VENDOR_FILES.items():
+        target = os.path.join(static_dir, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if url == GOOGLE_FONTS:
+            print(f"{name} (폰트 파일 {_vendor_google_fonts(target)}개)")
+            continue
+        data = _download(url)
+        with open(target, 'wb') as f:
+            f.write(data)
+        print(f"{name} ({len(data) / 1024:.0f} KB)")
+
+
+# ---------------------------------------------------------------------------
+# 제공
+# ---------------------------------------------------------------------------
+
+def load_manifest(dist_dir=DIST_DIR):
+    try:
+        with open(os.path.join(dist_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def asset_url(name):
+    """
+    템플릿용 정적 파일 주소
+    빌드된 파일 > static 의 원본 파일 > (내려받지 않은 외부 라이브러리) CDN 주소 순으로 사용
+    """
+    path = _manifest.get(name)
+    if path:
+        return url_for('serve_asset', filename=path)
+    if name in VENDOR_FILES and not os.path.exists(os.path.join(STATIC_DIR, name)):
+        return VENDOR_FILES[name]
+    return url_for('static', filename=name)
+
+
+def serve_asset(filename):
+    path = safe_join(DIST_DIR, filename)
+    if path is None or filename == MANIFEST_FILE or not os.path.isfile(path):
+        abort(404)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    encoding = None
+    for candidate, ext in (('br', '.br'), ('gzip', '.gz')):
+        if request.accept_encodings[candidate] and os.path.isfile(f'{path}{ext}'):
+            encoding, path = candidate, f'{path}{ext}'
+            break
+
+    response = send_file(path, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    # 내용이 바뀌면 파일 이름(해시)이 바뀌므로 재검증 없이 캐시
+    response.headers['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    return response
+
+
+def init_app(app):
+    """/assets/<해시 경로> 라우트와 템플릿의 asset_url() 등록"""
+    global _manifest
+    _manifest = load_manifest()
+    if not _manifest:
+        app.logger.info("static/dist 빌드 결과가 없어 원본 정적 파일을 사용합니다 (python assets.py build)")
+    app.add_url_rule('/assets/<path:filename>', 'serve_asset', serve_asset)
+    app.jinja_env.globals['asset_url'] = asset_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description='정적 파일 빌드')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('vendor', help='CDN 라이브러리를 static/vendor 로 내려받기')
+    subparsers.add_parser('build', help='압축/해시/미리 압축한 파일을 static/dist 에 생성')
+    args = parser.parse_args()
+
+    if args.command == 'vendor':
+        try:
+            vendor()
+        except OSError as e:
+            print(f"오류: 내려받기 실패 ({e})", file=sys.stderr)
+            return 1
+        return 0
+
+    report = build()
+    for name, sizes in report.items():
+        compressed = '  '.join(f"{ext} {sizes[ext] / 1024:.1f} KB" for ext in ('gz', 'br') if ext in sizes)
+        print(f"{name:<48} {sizes['original'] / 1024:>8.1f} KB -> {sizes['size'] / 1024:>8.1f} KB  {compressed}")
+    if brotli is None:
+        print("\nbrotli 모듈이 없어 .br 파일은 만들지 않았습니다 (pip install Brotli)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+API 부하/회귀 벤치마크
+합성 데이터베이스를 만든 뒤 모든 /api 라우트를 Flask 테스트 클라이언트 또는
+로컬 gunicorn으로 호출하여 처리량과 p50/p95/p99 지연 시간을 측정합니다.
+결과는 JSON으로 저장되며 benchmarks/compare.py 로 커밋 간 비교할 수 있습니다.
+
+사용법:
+  python benchmarks/api.py --target client
+  python benchmarks/api.py --target gunicorn --workers 4 --concurrency 8
+"""
+
+import argparse
+import http.client
+import io
+import json
+import os
+import platform
+import random
+import re
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlencode
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import generate_db  # noqa: E402
+
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+# /api/admin 시나리오용 관리자 토큰 (앱을 불러오기 전에 환경 변수로 설정)
+ADMIN_TOKEN = 'benchmark-admin-token'
+
+
+# 요청 전송기
+class ClientRunner:
+    """Flask 테스트 클라이언트 (프로세스 내부, 순차 실행)"""
+
+    name = 'client'
+
+    def __init__(self, db_path, workdir):
+        os.environ['ESTIMATE_DB'] = db_path
+        os.environ['LOG_FILE'] = os.path.join(workdir, 'app.log')
+        os.chdir(workdir)
+        sys.path.insert(0, REPO_DIR)
+        import db
+        db.DB_PATH = db_path
+        import app
+        self.client = app.create_app().test_client()
+
+    def send(self, method, path, body=None, upload=None, headers=None):
+        kwargs = {'headers': headers or {}}
+        if upload is not None:
+            filename, content = upload
+            kwargs['data'] = {'file': (io.BytesIO(content), filename)}
+            kwargs['content_type'] = 'multipart/form-data'
+        elif body is not None:
+            kwargs['json'] = body
+        response = self.client.open(path, method=method, **kwargs)
+        return response.status_code, response.get_data()
+
+    def close(self):
+        pass
+
+
+class GunicornRunner:
+    """로컬 gunicorn 프로세스에 HTTP로 요청"""
+
+    name = 'gunicorn'
+
+    def __init__(self, db_path, workdir, workers):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            self.port = sock.getsockname()[1]
+        env = dict(os.environ, PYTHONPATH=REPO_DIR, ESTIMATE_DB=db_path,
+                   LOG_FILE=os.path.join(workdir, 'app.log'))
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{self.port}',
+             '--workers', str(workers), '--preload', '--error-logfile', os.path.join(workdir, 'gunicorn.log'),
+             'app:create_app()'],
+            cwd=workdir, env=env
+        )
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            try:
+                socket.create_connection(('127.0.0.1', self.port), timeout=1).close()
+                return
+            except OSError:
+                if self.process.poll() is not None:
+                    break
+                time.sleep(0.2)
+        self.close()
+        raise RuntimeError('gunicorn 시작 실패 (gunicorn.log 확인)')
+
+    def send(self, method, path, body=None, upload=None, headers=None):
+        headers = dict(headers or {})
+        payload = None
+        if upload is not None:
+            filename, content = upload
+            boundary = uuid.uuid4().hex
+            payload = (
+                f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+                f'Content-Type: application/octet-stream\r\n\r\n'
+            ).encode() + content + f'\r\n--{boundary}--\r\n'.encode()
+            headers['Content-Type'] = f'multipart/form-data; boundary={boundary}'
+        elif body is not None:
+            payload = json.dumps(body, ensure_ascii=False).encode()
+            headers['Content-Type'] = 'application/json'
+        conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=60)
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            return response.status, response.read()
+        finally:
+            conn.close()
+
+    def close(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+# 요청 데이터
+def _estimate_payload(rng):
+    items = []
+    for _ in range(rng.randint(10, 500)):
+        quantity = rng.randint(1, 50)
+        price = rng.randint(1, 500) * 1000
+        items.append({
+            'category': rng.choice(generate_db.ESTIMATE_CATEGORIES),
+            'name': rng.choice(generate_db.ITEM_NAMES),
+            'spec': rng.choice(generate_db.SPECS),
+            'unit': 'EA',
+            'quantity': quantity,
+            'price': price,
+            'total': quantity * price,
+            'note': ''
+        })
+    subtotal = sum(item['total'] for item in items)
+    return {
+        'estimate_number': f"BENCH-{rng.randint(0, 999999):06d}",
+        'estimate_date': '2025-01-15',
+        'valid_until': '2025-02-15',
+        'subtotal': subtotal,
+        'tax': subtotal * 0.1,
+        'total': subtotal * 1.1,
+        'items': items,
+        'company': {'name': '벤치마크인테리어', 'business_number': '123-45-67890'},
+        'client': {'type': 'business', 'name': '벤치마크고객'}
+    }
+
+
+def _daily_payload(rng):
+    items = [{'category': '용역비', 'content': '인건비', 'rate': 150000, 'amount': 150000, 'note': ''}
+             for _ in range(rng.randint(1, 20))]
+    return {
+        'daily_date': '2025-01-15',
+        'site_name': '벤치마크 현장',
+        'total_amount': sum(item['amount'] for item in items),
+        'items': items
+    }
+
+
+def _import_csv(rows=50):
+    lines = ['날짜,현장명,카테고리,사용내역,단가(원)']
+    lines += [f"2025-01-{1 + i // 10:02d},가져오기 현장,용역비,인건비,100000" for i in range(rows)]
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def _response_id(content):
+    try:
+        payload = json.loads(content)
+    except ValueError:
+        return None
+    if isinstance(payload.get('data'), dict):
+        return payload['data'].get('id') or payload['data'].get('job_id')
+    return payload.get('id')
+
+
+def _scenario(name, path, body=None, upload=None, ratio=1, store=None, requires=None, route=None, headers=None):
+    """
+    name: "메서드 경로" 형식의 시나리오 이름
+    ratio: 기본 요청 수 대비 반복 비율 (무거운 요청은 줄여서 실행)
+    store: 응답의 생성 ID를 ctx['created'][store]에 저장
+    requires: ctx['created'][requires]에 ID가 있어야 실행 (삭제/조회 대상)
+    route: 호출하는 Flask 라우트 규칙 (이름의 경로가 규칙과 다를 때, 예: /api/import/<kind>)
+    """
+    method, name_path = name.split(' ', 1)
+    return {
+        'name': name,
+        'method': method,
+        'route': route or name_path.split('?', 1)[0],
+        'path': path,
+        'body': body,
+        'upload': upload,
+        'headers': headers,
+        'ratio': ratio,
+        'store': store,
+        'requires': requires,
+    }
+
+
+def _route_key(method, rule):
+    # <int:estimate_id>, <job_id> 등 변수 이름과 변환기는 구분하지 않음
+    return method, re.sub(r'<[^>]+>', '<id>', rule)
+
+
+def uncovered_routes(scenarios):
+    """시나리오가 없는 /api 라우트 ("메서드 규칙" 목록)"""
+    sys.path.insert(0, REPO_DIR)
+    from flask import Flask
+    import app
+
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(app.bp)
+    covered = {_route_key(scenario['method'], scenario['route']) for scenario in scenarios}
+    missing = []
+    for rule in flask_app.url_map.iter_rules():
+        if not rule.rule.startswith('/api/'):
+            continue
+        for method in sorted(rule.methods - {'HEAD', 'OPTIONS'}):
+            if _route_key(method, rule.rule) not in covered:
+                missing.append(f"{method} {rule.rule}")
+    return missing
+
+
+def _report_query(ctx):
+    rng = ctx['rng']
+    return urlencode({'site_name': rng.choice(ctx['site_names']), 'start': '2025-01-01', 'end': '2025-12-31',
+                      'estimate_id': rng.choice(ctx['estimate_ids'])})
+
+
+def build_scenarios(ctx):
+    rng = ctx['rng']
+    created = ctx['created']
+    admin = {'X-Admin-Token': ADMIN_TOKEN}
+    return [
+        _scenario('GET /api/companies', lambda: '/api/companies'),
+        _scenario('GET /api/clients', lambda: '/api/clients'),
+        _scenario('GET /api/bank_accounts', lambda: '/api/bank_accounts'),
+        _scenario('GET /api/estimates', lambda: '/api/estimates'),
+        _scenario('GET /api/estimates/<id>', lambda: f"/api/estimates/{rng.choice(ctx['estimate_ids'])}"),
+        _scenario('GET /api/daily_records', lambda: '/api/daily_records'),
+        _scenario('GET /api/daily_records/<id>', lambda: f"/api/daily_records/{rng.choice(ctx['daily_ids'])}"),
+        _scenario('POST /api/companies', lambda: '/api/companies',
+                  body=lambda: {'name': f"벤치마크회사 {rng.randint(0, 99999)}", 'phone': '02-555-0000'},
+                  store='companies'),
+        _scenario('POST /api/clients', lambda: '/api/clients',
+                  body=lambda: {'type': 'business', 'name': f"벤치마크고객 {rng.randint(0, 99999)}"},
+                  store='clients'),
+        _scenario('POST /api/bank_accounts', lambda: '/api/bank_accounts',
+                  body=lambda: {'bank_name': '국민은행', 'account_number': '123-45-678901', 'account_holder': '벤치마크'},
+                  store='bank_accounts'),
+        _scenario('POST /api/estimates', lambda: '/api/estimates',
+                  body=lambda: _estimate_payload(rng), ratio=0.25, store='estimates'),
+        _scenario('PUT /api/estimates/<id>', lambda: f"/api/estimates/{rng.choice(ctx['revised_ids'])}",
+                  body=lambda: _estimate_payload(rng), ratio=0.25),
+        _scenario('PATCH /api/estimates/<id>', lambda: f"/api/estimates/{rng.choice(ctx['revised_ids'])}",
+                  body=lambda: {'valid_until': f"2025-02-{rng.randint(1, 28):02d}"}),
+        # 위 PUT/PATCH 로 수정 이력이 쌓인 견적서의 이전 버전 복원
+        _scenario('GET /api/estimates/<id>?revision=1',
+                  lambda: f"/api/estimates/{rng.choice(ctx['revised_ids'])}?revision=1"),
+        _scenario('GET /api/estimates/<id>/revisions',
+                  lambda: f"/api/estimates/{rng.choice(ctx['revised_ids'])}/revisions"),
+        _scenario('POST /api/daily_records', lambda: '/api/daily_records',
+                  body=lambda: _daily_payload(rng), store='daily_records'),
+        _scenario('POST /api/export_estimate_excel', lambda: '/api/export_estimate_excel',
+                  body=lambda: _estimate_payload(rng), ratio=0.25),
+        _scenario('POST /api/export_daily_excel', lambda: '/api/export_daily_excel',
+                  body=lambda: dict(_daily_payload(rng), date='2025-01-15'), ratio=0.5),
+        _scenario('DELETE /api/companies/<id>', lambda: f"/api/companies/{created['companies'].pop()}",
+                  requires='companies'),
+        _scenario('DELETE /api/clients/<id>', lambda: f"/api/clients/{created['clients'].pop()}",
+                  requires='clients'),
+        _scenario('DELETE /api/bank_accounts/<id>', lambda: f"/api/bank_accounts/{created['bank_accounts'].pop()}",
+                  requires='bank_accounts'),
+        _scenario('DELETE /api/estimates/<id>', lambda: f"/api/estimates/{created['estimates'].pop()}",
+                  ratio=0.25, requires='estimates'),
+        _scenario('DELETE /api/daily_records/<id>', lambda: f"/api/daily_records/{created['daily_records'].pop()}",
+                  requires='daily_records'),
+        _scenario('POST /api/import/daily_records', lambda: '/api/import/daily_records',
+                  upload=lambda: ('bench.csv', _import_csv()), ratio=0.1, store='import_jobs',
+                  route='/api/import/<kind>'),
+        _scenario('GET /api/import/jobs/<id>', lambda: f"/api/import/jobs/{rng.choice(created['import_jobs'])}",
+                  requires='import_jobs'),
+        _scenario('GET /api/reports/sites', lambda: '/api/reports/sites'),
+        _scenario('GET /api/reports/site', lambda: f"/api/reports/site?{_report_query(ctx)}"),
+        _scenario('GET /api/reports/site/excel', lambda: f"/api/reports/site/excel?{_report_query(ctx)}", ratio=0.25),
+        _scenario('GET /api/admin/tenants', lambda: '/api/admin/tenants', headers=admin),
+        _scenario('GET /api/admin/summary', lambda: '/api/admin/summary', headers=admin, route='/api/admin/<resource>'),
+        _scenario('GET /api/admin/estimates', lambda: '/api/admin/estimates?limit=100', headers=admin,
+                  route='/api/admin/<resource>'),
+    ]
+
+
+def _percentile(sorted_values, percent):
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(percent / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(runner, scenario, ctx, requests, concurrency, warmup):
+    count = max(1, int(requests * scenario['ratio']))
+    pool = ctx['created'].get(scenario['requires']) if scenario['requires'] else None
+    if pool is not None:
+        if scenario['method'] == 'DELETE':
+            # 앞선 POST 시나리오에서 만든 데이터만 삭제
+            count = min(count, len(pool))
+            warmup = 0
+        if not pool:
+            return None
+
+    def one_request():
+        path = scenario['path']()
+        body = scenario['body']() if scenario['body'] else None
+        upload = scenario['upload']() if scenario['upload'] else None
+        started = time.perf_counter()
+        status, content = runner.send(scenario['method'], path, body, upload, scenario['headers'])
+        elapsed = (time.perf_counter() - started) * 1000
+        if scenario['store'] and status < 400:
+            created_id = _response_id(content)
+            if created_id is not None:
+                ctx['created'][scenario['store']].append(created_id)
+        return elapsed, status
+
+    for _ in range(warmup):
+        one_request()
+
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(concurrency) as pool:
+            samples = list(pool.map(lambda _: one_request(), range(count)))
+    else:
+        samples = [one_request() for _ in range(count)]
+    wall = time.perf_counter() - started
+
+    latencies = sorted(elapsed for elapsed, _ in samples)
+    return {
+        'requests': count,
+        'errors': sum(1 for _, status in samples if status >= 400),
+        'throughput_rps': round(count / wall, 1) if wall else None,
+        'mean_ms': round(sum(latencies) / len(latencies), 2),
+        'p50_ms': round(_percentile(latencies, 50), 2),
+        'p95_ms': round(_percentile(latencies, 95), 2),
+        'p99_ms': round(_percentile(latencies, 99), 2),
+        'max_ms': round(latencies[-1], 2),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='API 부하/회귀 벤치마크')
+    parser.add_argument('--target', choices=['client', 'gunicorn'], default='client')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn 워커 수')
+    parser.add_argument('--concurrency', type=int, default=8, help='gunicorn 동시 요청 수')
+    parser.add_argument('--requests', type=int, default=200, help='시나리오별 기본 요청 수')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--only', help='이름에 이 문자열이 포함된 시나리오만 실행')
+    parser.add_argument('--output', help='결과 JSON 경로 (기본값: benchmarks/results/api-<target>-<commit>.json)')
+    generate_db.add_dataset_arguments(parser)
+    args = parser.parse_args()
+
+    # 모든 /api 라우트에 시나리오가 있어야 회귀를 놓치지 않음
+    os.environ['ESTIMATE_ADMIN_TOKEN'] = ADMIN_TOKEN
+    missing = uncovered_routes(build_scenarios({'rng': None, 'created': {}}))
+    if missing:
+        print("시나리오가 없는 라우트가 있습니다 (build_scenarios 에 추가하세요):", file=sys.stderr)
+        for route in missing:
+            print(f"  {route}", file=sys.stderr)
+        return 1
+
+    commit = _git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"api-{args.target}-{commit or 'local'}.json")
+    workdir = tempfile.mkdtemp(prefix='estimate-bench-')
+    db_path = os.path.join(workdir, 'estimate.db')
+
+    print(f"합성 데이터베이스 생성 중: {db_path}")
+    dataset = generate_db.generate(db_path, **generate_db.dataset_options(args))
+
+    conn = sqlite3.connect(db_path)
+    estimate_ids = [row[0] for row in conn.execute('SELECT id FROM estimates')]
+    ctx = {
+        'rng': random.Random(args.seed),
+        'estimate_ids': estimate_ids,
+        # PUT/PATCH 는 일부 견적서에 집중하여 수정 이력이 쌓이도록 함
+        'revised_ids': estimate_ids[:20],
+        'daily_ids': [row[0] for row in conn.execute('SELECT id FROM daily_records')],
+        'site_names': [row[0] for row in conn.execute('SELECT DISTINCT site_name FROM daily_records')],
+        'created': {key: [] for key in ('companies', 'clients', 'bank_accounts', 'estimates',
+                                        'daily_records', 'import_jobs')},
+    }
+    conn.close()
+
+    if args.target == 'client':
+        runner = ClientRunner(db_path, workdir)
+        concurrency = 1
+    else:
+        runner = GunicornRunner(db_path, workdir, args.workers)
+        concurrency = args.concurrency
+
+    results = {}
+    try:
+        for scenario in build_scenarios(ctx):
+            name = scenario['name']
+            if args.only and args.only not in name:
+                continue
+            result = run_scenario(runner, scenario, ctx, args.requests, concurrency, args.warmup)
+            if result is None:
+                continue
+            results[name] = result
+            print(f"{name:<36} {result['throughput_rps']:>8} req/s  p50 {result['p50_ms']:>8} ms"
+                  f"  p95 {result['p95_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  오류 {result['errors']}")
+    finally:
+        runner.close()
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': commit,
+            'python': platform.python_version(),
+            'target': args.target,
+            'workers': args.workers if args.target == 'gunicorn' else 1,
+            'concurrency': concurrency,
+            'requests': args.requests,
+            'dataset': dataset,
+        },
+        'results': results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+벤치마크 결과 비교
+benchmarks/api.py 가 저장한 두 결과 JSON을 비교하여 회귀를 표시합니다.
+회귀가 하나라도 있으면 종료 코드 1을 반환하므로 CI/배포 전 점검에 사용할 수 있습니다.
+
+사용법: python benchmarks/compare.py results/api-client-abc123.json results/api-client-def456.json
+"""
+
+import argparse
+import json
+import sys
+
+# 값이 클수록 나쁜 지표
+LATENCY_METRICS = ('p50_ms', 'p95_ms', 'p99_ms')
+
+
+def _load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _change(base, current):
+    if not base:
+        return None
+    return (current - base) / base * 100
+
+
+def compare(base, current, threshold, min_ms):
+    """시나리오별 비교 결과 목록과 회귀 목록을 반환"""
+    rows = []
+    regressions = []
+    for name, new in current['results'].items():
+        old = base['results'].get(name)
+        if old is None:
+            rows.append((name, None, new, ['새 시나리오']))
+            continue
+
+        notes = []
+        for metric in LATENCY_METRICS:
+            change = _change(old[metric], new[metric])
+            # 측정 잡음을 피하기 위해 절대 차이가 min_ms 이상일 때만 회귀로 판단
+            if change is not None and change > threshold and new[metric] - old[metric] >= min_ms:
+                notes.append(f"{metric} +{change:.1f}%")
+        change = _change(old['throughput_rps'], new['throughput_rps'])
+        if change is not None and change < -threshold:
+            notes.append(f"처리량 {change:.1f}%")
+        if new['errors'] > old['errors']:
+            notes.append(f"오류 {old['errors']} -> {new['errors']}")
+
+        rows.append((name, old, new, notes))
+        if notes:
+            regressions.append((name, notes))
+
+    for name in base['results']:
+        if name not in current['results']:
+            rows.append((name, base['results'][name], None, ['시나리오 없음']))
+    return rows, regressions
+
+
+def _format_change(old, new, metric):
+    if old is None or new is None:
+        return '-'
+    change = _change(old[metric], new[metric])
+    return f"{new[metric]} ({change:+.1f}%)" if change is not None else str(new[metric])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='벤치마크 결과 회귀 비교')
+    parser.add_argument('base', help='기준 결과 JSON')
+    parser.add_argument('current', help='비교할 결과 JSON')
+    parser.add_argument('--threshold', type=float, default=10.0, help='회귀로 판단할 변화율 (%%, 기본값 10)')
+    parser.add_argument('--min-ms', type=float, default=1.0, help='회귀로 판단할 최소 지연 시간 차이 (ms)')
+    args = parser.parse_args()
+
+    base = _load(args.base)
+    current = _load(args.current)
+
+    for key in ('target', 'workers', 'concurrency', 'dataset'):
+        if base['meta'].get(key) != current['meta'].get(key):
+            print(f"주의: 측정 조건이 다릅니다 ({key}: {base['meta'].get(key)} -> {current['meta'].get(key)})")
+
+    print(f"기준 {base['meta'].get('commit')} -> 비교 {current['meta'].get('commit')} (기준 변화율 {args.threshold}%)")
+    rows, regressions = compare(base, current, args.threshold, args.min_ms)
+    for name, old, new, notes in rows:
+        mark = '!!' if notes and old is not None and new is not None else '  '
+        print(f"{mark} {name:<36} p50 {_format_change(old, new, 'p50_ms'):>18}"
+              f"  p95 {_format_change(old, new, 'p95_ms'):>18}"
+              f"  처리량 {_format_change(old, new, 'throughput_rps'):>18}  {', '.join(notes)}")
+
+    if regressions:
+        print(f"\n회귀 {len(regressions)}건 발견")
+        return 1
+    print("\n회귀 없음")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+견적서 버전 조회 벤치마크
+항목 수(N)와 수정 횟수(R)를 바꿔 가며 최신본 조회와 최초 버전 복원 시간을 측정합니다.
+최신본은 estimates / estimate_items 에 그대로 있으므로 R과 관계없이 O(N)이어야 하고,
+최초 버전 복원은 R개의 변경분을 되돌리므로 R에 비례합니다.
+
+사용법: python benchmarks/estimate_revisions.py [--items 10 100 500] [--revisions 0 10 50 200] [--repeat 50]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sqlite3
+import sys
+import tempfile
+import time
+
+from generate_db import ESTIMATE_CATEGORIES, ITEM_NAMES, SPECS, REPO_DIR, _init_schema
+
+
+def _item(rng):
+    quantity = rng.randint(1, 50)
+    price = rng.randint(1, 500) * 1000
+    return {
+        'category': rng.choice(ESTIMATE_CATEGORIES),
+        'name': rng.choice(ITEM_NAMES),
+        'spec': rng.choice(SPECS),
+        'quantity': quantity,
+        'price': price,
+        'total': quantity * price,
+        'note': ''
+    }
+
+
+def create_estimate(conn, rng, item_count, revision_count):
+    """항목 item_count개짜리 견적서를 만들고 revision_count번 수정한 뒤 ID 반환"""
+    from revisions import load_items, save_revision
+
+    cursor = conn.cursor()
+    items = [_item(rng) for _ in range(item_count)]
+    subtotal = sum(item['total'] for item in items)
+    cursor.execute('''
+        INSERT INTO estimates (estimate_number, estimate_date, subtotal, tax, total, items)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (f"bench-{item_count}-{revision_count}", '2026-01-01', subtotal, subtotal * 0.1, subtotal * 1.1,
+          json.dumps(items, ensure_ascii=False)))
+    estimate_id = cursor.lastrowid
+    cursor.executemany('''
+        INSERT INTO estimate_items (estimate_id, category, name, spec, quantity, price, total, note)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [(estimate_id, item['category'], item['name'], item['spec'],
+           item['quantity'], item['price'], item['total'], item['note']) for item in items])
+    conn.commit()
+
+    # 실제 고객 수정처럼 매번 몇 개 항목의 수량/단가 변경 + 항목 추가/삭제
+    for _ in range(revision_count):
+        current = load_items(cursor, estimate_id)
+        updates = []
+        for old in rng.sample(current, min(3, len(current))):
+            quantity = rng.randint(1, 50)
+            updates.append({'id': old['id'], 'quantity': quantity, 'total': quantity * old['price']})
+        deletes = [rng.choice(current)['id']] if len(current) > 1 and rng.random() < 0.5 else []
+        deletes = [item_id for item_id in deletes if item_id not in {item['id'] for item in updates}]
+        save_revision(conn, estimate_id, {'item_changes': {
+            'add': [_item(rng)] if rng.random() < 0.5 else [],
+            'update': updates,
+            'delete': deletes,
+        }}, partial=True)
+    return estimate_id
+
+
+def _time_ms(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def _storage_bytes(cursor, estimate_id):
+    cursor.execute('''
+        SELECT COALESCE(SUM(LENGTH(header_changes) + LENGTH(item_changes)), 0)
+        FROM estimate_revisions WHERE estimate_id = ?
+    ''', (estimate_id,))
+    return cursor.fetchone()[0]
+
+
+def run(path, item_counts, revision_counts, repeat, seed):
+    from revisions import latest_revision, rebuild
+
+    _init_schema(path)
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+
+    rows = []
+    for item_count in item_counts:
+        for revision_count in revision_counts:
+            estimate_id = create_estimate(conn, rng, item_count, revision_count)
+            latest = latest_revision(cursor, estimate_id)
+            rows.append({
+                'items': item_count,
+                'revisions': revision_count,
+                'latest_ms': _time_ms(lambda: rebuild(cursor, estimate_id, latest), repeat),
+                'first_ms': _time_ms(lambda: rebuild(cursor, estimate_id, 1), repeat),
+                'delta_bytes': _storage_bytes(cursor, estimate_id),
+            })
+    conn.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='견적서 버전 조회 벤치마크')
+    parser.add_argument('--items', type=int, nargs='+', default=[10, 100, 500], help='견적 항목 수')
+    parser.add_argument('--revisions', type=int, nargs='+', default=[0, 10, 50, 200], help='수정 횟수')
+    parser.add_argument('--repeat', type=int, default=50, help='측정 반복 횟수 (중앙값 사용)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_DIR)
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = run(os.path.join(tmp, 'revisions.db'), args.items, args.revisions, args.repeat, args.seed)
+
+    print(f"{'항목 수':>8} {'수정 횟수':>8} {'최신본(ms)':>12} {'최초 버전(ms)':>14} {'변경분 크기(B)':>14}")
+    for row in rows:
+        print(f"{row['items']:>8} {row['revisions']:>8} {row['latest_ms']:>12.3f} "
+              f"{row['first_ms']:>14.3f} {row['delta_bytes']:>14}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+벤치마크용 합성 데이터베이스 생성
+실제 사용 형태와 비슷한 회사/고객/계좌/견적서(항목 10~500개)/영수증 기록을 만듭니다.
+
+사용법: python benchmarks/generate_db.py bench.db --estimates 2000 --daily-records 5000
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ESTIMATE_CATEGORIES = ['철거공사', '목공사', '타일공사', '도배공사', '바닥공사', '전기공사', '설비공사', '도장공사', '기타']
+DAILY_CATEGORIES = ['용역비', '기타']
+ITEM_NAMES = ['석고보드', '합판', '각재', '포세린 타일', '실크 벽지', '강마루', 'LED 매입등', '수전', '친환경 페인트', '폐기물 처리']
+SPECS = ['9.5T', '12T', '30x30', '600x600', '1200x190', '15W', '']
+UNITS = ['EA', 'M2', '장', '식', '롤']
+BANKS = ['국민은행', '신한은행', '우리은행', '하나은행', '농협은행']
+SURNAMES = ['김', '이', '박', '최', '정', '강', '조', '윤']
+
+
+def _init_schema(path):
+    """app.init_db()로 실제 스키마를 생성"""
+    sys.path.insert(0, REPO_DIR)
+    import app
+    app.init_db(path)
+
+
+def _phone(rng):
+    return f"010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"
+
+
+def _business_number(rng):
+    return f"{rng.randint(100, 999)}-{rng.randint(10, 99)}-{rng.randint(10000, 99999)}"
+
+
+def generate(path, companies=20, clients=300, bank_accounts=10, estimates=1000,
+             min_items=10, max_items=500, daily_records=3000, seed=42):
+    """합성 데이터베이스를 만들고 생성 건수 dict를 반환"""
+    if os.path.exists(path):
+        os.remove(path)
+    _init_schema(path)
+
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+
+    cursor.executemany('''
+        INSERT INTO companies (name, business_number, address, ceo, type, item, phone, fax, manager)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [
+        (f"{rng.choice(['한빛', '푸른', '대한', '새봄', '미래'])}인테리어 {i + 1}호점", _business_number(rng),
+         f"서울시 강남구 테헤란로 {rng.randint(1, 500)}", rng.choice(SURNAMES) + '대표',
+         '건설업', '실내건축', _phone(rng), '02-555-0000', rng.choice(SURNAMES) + '실장')
+        for i in range(companies)
+    ])
+    cursor.executemany('''
+        INSERT INTO clients (type, name, business_number, address, ceo, phone, manager)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', [
+        ('business' if i % 3 else 'individual', f"{rng.choice(SURNAMES)}고객 {i + 1}", _business_number(rng),
+         f"경기도 성남시 분당구 {rng.randint(1, 300)}", rng.choice(SURNAMES) + '대표', _phone(rng), '')
+        for i in range(clients)
+    ])
+    cursor.executemany('''
+        INSERT INTO bank_accounts (bank_name, account_number, account_holder)
+        VALUES (?, ?, ?)
+    ''', [
+        (rng.choice(BANKS), f"{rng.randint(100, 999)}-{rng.randint(10, 99)}-{rng.randint(100000, 999999)}",
+         f"{rng.choice(SURNAMES)}인테리어")
+        for _ in range(bank_accounts)
+    ])
+
+    start = date.today() - timedelta(days=365)
+    item_count = 0
+    for i in range(estimates):
+        estimate_date = start + timedelta(days=rng.randint(0, 365))
+        items = []
+        for _ in range(rng.randint(min_items, max_items)):
+            quantity = rng.randint(1, 50)
+            price = rng.randint(1, 500) * 1000
+            items.append({
+                'category': rng.choice(ESTIMATE_CATEGORIES),
+                'name': rng.choice(ITEM_NAMES),
+                'spec': rng.choice(SPECS),
+                'unit': rng.choice(UNITS),
+                'quantity': quantity,
+                'price': price,
+                'total': quantity * price,
+                'note': ''
+            })
+        subtotal = sum(item['total'] for item in items)
+        cursor.execute('''
+            INSERT INTO estimates (estimate_number, estimate_date, valid_until, company_id, client_id, subtotal, tax, total, items)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            f"{estimate_date.strftime('%y%m%d')}-{i % 1000:03d}",
+            estimate_date.isoformat(),
+            (estimate_date + timedelta(days=30)).isoformat(),
+            rng.randint(1, companies) if companies else None,
+            rng.randint(1, clients) if clients else None,
+            subtotal,
+            subtotal * 0.1,
+            subtotal * 1.1,
+            json.dumps(items, ensure_ascii=False)
+        ))
+        estimate_id = cursor.lastrowid
+        cursor.executemany('''
+            INSERT INTO estimate_items (estimate_id, category, name, spec, quantity, price, total, note)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (estimate_id, item['category'], item['name'], item['spec'],
+             item['quantity'], item['price'], item['total'], item['note'])
+            for item in items
+        ])
+        item_count += len(items)
+
+    sites = [f"{rng.choice(['잠실', '판교', '송도', '해운대', '수원'])} 현장 {n + 1}" for n in range(max(1, daily_records // 100))]
+    records = []
+    for _ in range(daily_records):
+        items = []
+        for _ in range(rng.randint(1, 20)):
+            rate = rng.randint(1, 300) * 1000
+            items.append({
+                'category': rng.choice(DAILY_CATEGORIES),
+                'content': rng.choice(['인건비', '자재 운반', '식대', '장비 임대', '소모품']),
+                'rate': rate,
+                'amount': rate,
+                'note': ''
+            })
+        records.append((
+            (start + timedelta(days=rng.randint(0, 365))).isoformat(),
+            rng.choice(sites),
+            sum(item['amount'] for item in items),
+            json.dumps(items, ensure_ascii=False)
+        ))
+    cursor.executemany('''
+        INSERT INTO daily_records (date, site_name, total, items)
+        VALUES (?, ?, ?, ?)
+    ''', records)
+
+    conn.commit()
+    conn.close()
+    return {
+        'companies': companies,
+        'clients': clients,
+        'bank_accounts': bank_accounts,
+        'estimates': estimates,
+        'estimate_items': item_count,
+        'daily_records': daily_records,
+    }
+
+
+def add_dataset_arguments(parser):
+    parser.add_argument('--companies', type=int, default=20)
+    parser.add_argument('--clients', type=int, default=300)
+    parser.add_argument('--bank-accounts', type=int, default=10)
+    parser.add_argument('--estimates', type=int, default=1000)
+    parser.add_argument('--min-items', type=int, default=10)
+    parser.add_argument('--max-items', type=int, default=500)
+    parser.add_argument('--daily-records', type=int, default=3000)
+    parser.add_argument('--seed', type=int, default=42)
+
+
+def dataset_options(args):
+    return {
+        'companies': args.companies,
+        'clients': args.clients,
+        'bank_accounts': args.bank_accounts,
+        'estimates': args.estimates,
+        'min_items': args.min_items,
+        'max_items': args.max_items,
+        'daily_records': args.daily_records,
+        'seed': args.seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='벤치마크용 합성 estimate.db 생성')
+    parser.add_argument('path', help='생성할 데이터베이스 파일')
+    add_dataset_arguments(parser)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = generate(args.path, **dataset_options(args))
+    print(f"{args.path} 생성 완료 ({time.perf_counter() - started:.1f}초)")
+    for table, count in counts.items():
+        print(f"  {table}: {count}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+현장 정산 보고서 벤치마크
+한 현장에 1년치 영수증 기록을 넣고 daily_rollups 를 사용하는 보고서 조회 시간을
+영수증 JSON 을 매번 전부 펼쳐 합산하는 방식과 비교합니다.
+기록 저장 시 트리거가 추가하는 시간도 함께 측정합니다.
+
+사용법: python benchmarks/site_report.py [--records 1000 10000 50000] [--repeat 20]
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from generate_db import DAILY_CATEGORIES, ESTIMATE_CATEGORIES, REPO_DIR, generate
+
+SITE_NAME = '잠실 현장 벤치마크'
+
+# 롤업 없이 영수증 JSON 을 전부 펼쳐 합산하는 기존 방식
+FULL_SCAN = '''
+    SELECT COALESCE(NULLIF(TRIM(json_extract(item.value, '$.category')), ''), '기타'),
+           SUM(COALESCE(CAST(json_extract(item.value, '$.amount') AS REAL),
+                        CAST(json_extract(item.value, '$.rate') AS REAL), 0))
+    FROM daily_records AS record, json_each(record.items) AS item
+    WHERE record.site_name = ? AND record.date BETWEEN ? AND ?
+    GROUP BY 1
+'''
+
+
+def _records(rng, count, start):
+    rows = []
+    for _ in range(count):
+        items = []
+        for _ in range(rng.randint(1, 20)):
+            rate = rng.randint(1, 300) * 1000
+            items.append({
+                'category': rng.choice(DAILY_CATEGORIES + ESTIMATE_CATEGORIES),
+                'content': '자재 구입',
+                'rate': rate,
+                'amount': rate,
+                'note': ''
+            })
+        rows.append(((start + timedelta(days=rng.randint(0, 364))).isoformat(), SITE_NAME,
+                     sum(item['amount'] for item in items), json.dumps(items, ensure_ascii=False)))
+    return rows
+
+
+def _time_ms(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run(path, record_counts, repeat, seed):
+    from reports import site_report
+
+    # 다른 현장 기록과 견적서가 있는 기본 데이터
+    generate(path, estimates=50, min_items=10, max_items=100, daily_records=3000, seed=seed)
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    start = date.today() - timedelta(days=365)
+    end = start + timedelta(days=364)
+
+    rows = []
+    inserted = 0
+    for record_count in sorted(record_counts):
+        batch = _records(rng, record_count - inserted, start)
+        started = time.perf_counter()
+        cursor.executemany('INSERT INTO daily_records (date, site_name, total, items) VALUES (?, ?, ?, ?)', batch)
+        conn.commit()
+        insert_us = (time.perf_counter() - started) * 1e6 / max(1, len(batch))
+        inserted = record_count
+
+        params = (SITE_NAME, start.isoformat(), end.isoformat())
+        rows.append({
+            'records': record_count,
+            'insert_us': insert_us,
+            'report_ms': _time_ms(lambda: site_report(cursor, *params, estimate_id=1), repeat),
+            'scan_ms': _time_ms(lambda: cursor.execute(FULL_SCAN, params).fetchall(), repeat),
+        })
+    conn.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='현장 정산 보고서 벤치마크')
+    parser.add_argument('--records', type=int, nargs='+', default=[1000, 10000, 50000], help='현장의 1년 기록 수')
+    parser.add_argument('--repeat', type=int, default=20, help='측정 반복 횟수 (중앙값 사용)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_DIR)
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = run(os.path.join(tmp, 'site_report.db'), args.records, args.repeat, args.seed)
+
+    print(f"{'기록 수':>8} {'저장/건(us)':>12} {'보고서(ms)':>12} {'전체 합산(ms)':>14}")
+    for row in rows:
+        print(f"{row['records']:>8} {row['insert_us']:>12.1f} {row['report_ms']:>12.3f} {row['scan_ms']:>14.3f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+워커 시작 비용 벤치마크
+- python -X importtime 으로 app 모듈 import/create_app() 시간과 무거운 모듈 목록 측정
+- gunicorn preload_app 과 같은 방식으로 앱 생성 후 fork 한 워커의 RSS/고유 메모리 측정
+결과는 benchmarks/results/startup.jsonl 에 한 줄씩 누적되어 커밋별 추이를 비교할 수 있습니다.
+
+사용법: python benchmarks/startup.py [--runs 5] [--output 파일]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join(REPO_DIR, 'benchmarks', 'results', 'startup.jsonl')
+
+STARTUP_CODE = (
+    "import time; t = time.perf_counter(); "
+    "import app; app.create_app(); "
+    "print((time.perf_counter() - t) * 1000)"
+)
+
+
+def _read_memory_kb():
+    """현재 프로세스의 RSS와 고유(private) 메모리 (kB, Linux 전용)"""
+    result = {'rss_kb': None, 'private_kb': None}
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    result['rss_kb'] = int(line.split()[1])
+        with open('/proc/self/smaps_rollup') as f:
+            private = 0
+            for line in f:
+                if line.startswith(('Private_Clean:', 'Private_Dirty:')):
+                    private += int(line.split()[1])
+            result['private_kb'] = private
+    except OSError:
+        pass
+    return result
+
+
+def probe_memory():
+    """--probe: 앱을 미리 로드한 뒤 fork 하여 워커 메모리 측정 (결과는 stdout JSON)"""
+    sys.path.insert(0, REPO_DIR)
+    import app as app_module
+
+    flask_app = app_module.create_app()
+    report = {'master': _read_memory_kb()}
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        worker = {'after_fork': _read_memory_kb()}
+        client = flask_app.test_client()
+        client.get('/')
+        worker['after_first_request'] = _read_memory_kb()
+        client.post('/api/export_estimate_excel', json={
+            'estimate_number': 'BENCH-001',
+            'total': 1100,
+            'items': [{'name': '벤치마크', 'quantity': 1, 'price': 1000, 'total': 1000}]
+        })
+        worker['after_first_export'] = _read_memory_kb()
+        os.write(write_fd, json.dumps(worker).encode())
+        os.close(write_fd)
+        os._exit(0)
+
+    os.close(write_fd)
+    chunks = []
+    while True:
+        chunk = os.read(read_fd, 65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    report['worker'] = json.loads(b''.join(chunks).decode())
+    print(json.dumps(report))
+
+
+def parse_importtime(stderr, root='app', limit=15):
+    """
+    -X importtime 출력 분석: (전체 import 시간, root 가 직접 import 한 모듈, self 시간 상위 모듈)
+    최상위 항목은 root 하나가 대부분을 차지하므로 한 단계 아래(flask, openpyxl 등)를 누적 시간순으로 보여줍니다.
+    """
+    total_us = 0
+    children = []
+    direct = []
+    by_self = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        total_us += int(self_us)
+        # 이름 앞 공백 1칸 다음 2칸마다 한 단계 (하위 모듈이 상위 모듈보다 먼저 출력됨)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entry = {'module': name.strip(), 'cumulative_ms': int(cumulative_us) / 1000, 'self_ms': int(self_us) / 1000}
+        by_self.append(entry)
+        if depth == 1:
+            children.append(entry)
+        elif depth == 0:
+            if entry['module'] == root:
+                direct.extend(children)
+            children = []
+    direct.sort(key=lambda entry: entry['cumulative_ms'], reverse=True)
+    by_self.sort(key=lambda entry: entry['self_ms'], reverse=True)
+    return total_us / 1000, direct[:limit], by_self[:limit]
+
+
+def _run(args, cwd):
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    return subprocess.run([sys.executable] + args, cwd=cwd, env=env,
+                          capture_output=True, text=True, check=True)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(runs):
+    # 작업 디렉토리를 분리해 estimate.db / app.log 가 저장소에 생기지 않도록 함
+    with tempfile.TemporaryDirectory() as workdir:
+        # 첫 실행은 .pyc 생성 비용이 섞이므로 버림
+        _run(['-c', STARTUP_CODE], workdir)
+
+        process_ms, create_app_ms = [], []
+        for _ in range(runs):
+            started = time.perf_counter()
+            result = _run(['-c', STARTUP_CODE], workdir)
+            process_ms.append((time.perf_counter() - started) * 1000)
+            create_app_ms.append(float(result.stdout.strip().splitlines()[-1]))
+
+        importtime = _run(['-X', 'importtime', '-c', 'import app; app.create_app()'], workdir)
+        import_total_ms, top_imports, top_self_imports = parse_importtime(importtime.stderr)
+
+        memory = json.loads(_run([os.path.abspath(__file__), '--probe'], workdir).stdout)
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'runs': runs,
+        'process_ms': round(statistics.median(process_ms), 1),
+        'create_app_ms': round(statistics.median(create_app_ms), 1),
+        'import_total_ms': round(import_total_ms, 1),
+        'top_imports': top_imports,
+        'top_self_imports': top_self_imports,
+        'memory': memory,
+    }
+
+
+def _load_previous(path):
+    if not os.path.exists(path):
+        return None
+    previous = None
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                previous = json.loads(line)
+    return previous
+
+
+def _delta(current, previous):
+    if previous is None or current is None:
+        return ''
+    return f" ({current - previous:+.1f})"
+
+
+def print_report(result, previous):
+    prev = previous or {}
+    worker = result['memory']['worker']
+    prev_worker = prev.get('memory', {}).get('worker', {})
+
+    print(f"커밋 {result['commit']} / Python {result['python']} / {result['runs']}회 중앙값")
+    print(f"  프로세스 전체 시작:   {result['process_ms']:.1f} ms{_delta(result['process_ms'], prev.get('process_ms'))}")
+    print(f"  import + create_app:  {result['create_app_ms']:.1f} ms{_delta(result['create_app_ms'], prev.get('create_app_ms'))}")
+    print(f"  importtime 합계:      {result['import_total_ms']:.1f} ms{_delta(result['import_total_ms'], prev.get('import_total_ms'))}")
+    print("  app 이 직접 import 하는 모듈 (누적):")
+    for entry in result['top_imports'][:10]:
+        print(f"    {entry['cumulative_ms']:8.1f} ms  {entry['module']}")
+    print("  self 시간 상위 모듈:")
+    for entry in result['top_self_imports'][:10]:
+        print(f"    {entry['self_ms']:8.1f} ms  {entry['module']}")
+
+    print(f"  마스터 RSS:           {result['memory']['master']['rss_kb']} kB")
+    for stage in ('after_fork', 'after_first_request', 'after_first_export'):
+        current = worker.get(stage, {})
+        before = prev_worker.get(stage, {})
+        print(f"  워커 {stage:<20} RSS {current.get('rss_kb')} kB{_delta(current.get('rss_kb'), before.get('rss_kb'))}"
+              f" / private {current.get('private_kb')} kB{_delta(current.get('private_kb'), before.get('private_kb'))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='워커 시작 시간/메모리 벤치마크')
+    parser.add_argument('--runs', type=int, default=5, help='시작 시간 측정 반복 횟수')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='결과를 누적할 JSON Lines 파일')
+    parser.add_argument('--probe', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        probe_memory()
+        return 0
+
+    result = measure(args.runs)
+    previous = _load_previous(args.output)
+    print_report(result, previous)
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(result, ensure_ascii=False) + '\n')
+    print(f"결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
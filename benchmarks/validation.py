@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+요청 검증 비용 벤치마크
+schemas.SCHEMAS 의 검사 함수가 요청마다 추가하는 시간을 JSON 파싱 시간과 함께 측정합니다.
+Flask 없이 실행되므로 배포 전 어느 환경에서나 확인할 수 있습니다.
+
+사용법: python benchmarks/validation.py [--items 10 50 200 1000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import generate_db  # noqa: E402
+import schemas  # noqa: E402
+
+
+def estimate_payload(rng, item_count):
+    """화면의 collectEstimateData()와 같은 형태의 견적서 요청"""
+    items = []
+    for _ in range(item_count):
+        quantity = rng.randint(1, 50)
+        price = rng.randint(1, 500) * 1000
+        items.append({
+            'category': rng.choice(generate_db.ESTIMATE_CATEGORIES),
+            'name': rng.choice(generate_db.ITEM_NAMES),
+            'spec': rng.choice(generate_db.SPECS),
+            'unit': rng.choice(generate_db.UNITS),
+            'quantity': quantity,
+            'price': price,
+            'total': quantity * price,
+            'note': ''
+        })
+    subtotal = sum(item['total'] for item in items)
+    return {
+        'estimate_number': '261019-001',
+        'estimate_date': '2026-10-19',
+        'valid_until': '2026-11-19',
+        'company': {'name': '한빛인테리어', 'business_number': '123-45-67890', 'address': '서울시 강남구',
+                    'ceo': '김대표', 'phone': '02-555-0000', 'type': '건설업', 'item': '실내건축'},
+        'client': {'name': '이고객', 'business_number': '', 'address': '경기도 성남시', 'ceo': '',
+                   'phone': '010-1234-5678', 'type': 'business'},
+        'items': items,
+        'subtotal': subtotal,
+        'tax': subtotal * 0.1,
+        'total': subtotal * 1.1,
+        'includeTax': True
+    }
+
+
+def daily_payload(rng, item_count):
+    items = []
+    for _ in range(item_count):
+        rate = rng.randint(1, 300) * 1000
+        items.append({'category': rng.choice(generate_db.DAILY_CATEGORIES), 'content': '인건비',
+                      'rate': rate, 'amount': rate, 'note': ''})
+    return {'daily_date': '2026-10-19', 'site_name': '잠실 현장 1', 'items': items}
+
+
+def _per_call_us(func):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    # 가장 빠른 측정값 사용 (다른 프로세스의 간섭 제외)
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='요청 검증 비용 벤치마크')
+    parser.add_argument('--items', type=int, nargs='+', default=[10, 50, 200, 1000], help='견적 항목 수')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cases = [
+        ('company', {'name': '한빛인테리어', 'business_number': '123-45-67890', 'phone': '02-555-0000'}),
+        ('client', {'type': 'business', 'name': '이고객', 'contact': '010-1234-5678'}),
+        ('bank_account', {'bank_name': '국민은행', 'account_number': '123-45-678901', 'account_holder': '한빛인테리어'}),
+        ('daily_record', daily_payload(rng, 20)),
+    ]
+    cases += [('estimate', estimate_payload(rng, count)) for count in args.items]
+
+    print(f"{'스키마':<14} {'항목 수':>8} {'본문 크기':>10} {'JSON 파싱(us)':>14} {'검증(us)':>10}")
+    for name, payload in cases:
+        body = json.dumps(payload, ensure_ascii=False)
+        validator = schemas.SCHEMAS[name]
+        validator(payload)
+        parse_us = _per_call_us(lambda: json.loads(body))
+        validate_us = _per_call_us(lambda: validator(payload))
+        print(f"{name:<14} {len(payload.get('items', [])):>8} {len(body.encode('utf-8')):>10} "
+              f"{parse_us:>14.1f} {validate_us:>10.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+참조 데이터 캐시
+회사/고객/은행 계좌 목록은 자주 조회되지만 거의 바뀌지 않으므로 워커별로
+직렬화된 JSON 바이트를 보관합니다. 각 테이블의 변경은 SQLite 트리거가
+cache_versions 테이블의 버전을 올려 모든 워커에 알립니다.
+"""
+
+import os
+import sqlite3
+import threading
+import zlib
+
+from flask import Response, request
+
+import db
+
+CACHED_TABLES = ('companies', 'clients', 'bank_accounts')
+
+
+def create_version_triggers(cursor):
+    """테이블이 바뀔 때마다 cache_versions 버전을 올리는 트리거 생성"""
+    for table in CACHED_TABLES:
+        cursor.execute('INSERT OR IGNORE INTO cache_versions (name, version) VALUES (?, 0)', (table,))
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_cache_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE cache_versions SET version = version + 1 WHERE name = '{table}';
+                END
+            ''')
+
+
+class ReferenceCache:
+    """버전이 같으면 DB 조회와 JSON 직렬화 없이 저장된 응답 바이트를 반환"""
+
+    def __init__(self):
+        self._entries = {}
+        self._connections = {}
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _version_connection(self, db_path):
+        # fork 된 워커는 부모의 연결을 쓰지 않고 새로 연결
+        if self._pid != os.getpid():
+            self._connections = {}
+            self._entries = {}
+            self._pid = os.getpid()
+        conn = self._connections.get(db_path)
+        if conn is None:
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._connections[db_path] = conn
+        return conn
+
+    def current_version(self, db_path, name):
+        with self._lock:
+            row = self._version_connection(db_path).execute(
+                'SELECT version FROM cache_versions WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else None
+
+    def response(self, name, loader):
+        """
+        캐시된 JSON 응답 반환, 버전이 바뀌었으면 loader()로 다시 만들어 저장
+        loader는 기존 라우트처럼 (응답, 상태 코드) 또는 응답 객체를 반환합니다.
+        """
+        db_path = db.current_db_path()
+        version = self.current_version(db_path, name)
+        etag = f'{name}-{zlib.crc32(db_path.encode()):08x}-{version}'
+
+        entry = self._entries.get((db_path, name))
+        if entry is None or entry[0] != version or version is None:
+            result = loader()
+            response, status = result if isinstance(result, tuple) else (result, 200)
+            # 오류 응답은 캐시하지 않음
+            if status != 200 or version is None:
+                return response, status
+            # 버전을 먼저 읽고 조회했으므로 저장되는 데이터는 항상 해당 버전 이후 상태
+            entry = (version, response.get_data())
+            self._entries[(db_path, name)] = entry
+
+        if request.if_none_match.contains(etag):
+            cached = Response(status=304)
+        else:
+            cached = Response(entry[1], mimetype='application/json')
+        cached.set_etag(etag)
+        # 브라우저는 매번 ETag로 재검증 (변경 없으면 304)
+        cached.headers['Cache-Control'] = 'no-cache'
+        return cached
+
+
+reference_cache = ReferenceCache()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+데이터베이스 연결
+요청 처리 중 SQLite에서 보낸 시간을 g.db_ms 에 누적해 요청 로그에 기록합니다.
+연결은 데이터베이스 파일별 풀에서 가져오며, 다중 지점(테넌트) 모드에서는
+tenants 모듈이 요청마다 g.db_path 에 지점 데이터베이스를 지정합니다.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from flask import g, has_request_context
+
+DB_PATH = os.environ.get('ESTIMATE_DB', 'estimate.db')
+# 데이터베이스 파일별로 보관할 유휴 연결 수
+DB_POOL_SIZE = int(os.environ.get('ESTIMATE_DB_POOL_SIZE', 8))
+
+
+def _add_db_time(started):
+    if has_request_context():
+        g.db_ms = g.get('db_ms', 0.0) + (time.perf_counter() - started) * 1000
+
+
+class TimedCursor(sqlite3.Cursor):
+    """쿼리 실행/조회 시간을 측정하는 커서"""
+
+    def execute(self, *args):
+        started = time.perf_counter()
+        try:
+            return super().execute(*args)
+        finally:
+            _add_db_time(started)
+
+    def executemany(self, *args):
+        started = time.perf_counter()
+        try:
+            return super().executemany(*args)
+        finally:
+            _add_db_time(started)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            _add_db_time(started)
+
+    def fetchall(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            _add_db_time(started)
+
+
+class TimedConnection(sqlite3.Connection):
+    """TimedCursor를 반환하고 커밋 시간도 측정하는 연결"""
+
+    # 풀에서 가져온 연결은 close() 시 실제로 닫지 않고 풀에 반환
+    pool = None
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            super().close()
+
+    def commit(self):
+        started = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            _add_db_time(started)
+
+
+class ConnectionPool:
+    """데이터베이스 파일 하나의 연결 풀 (유휴 연결을 최대 size개까지 재사용)"""
+
+    def __init__(self, path, size=DB_POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            # 요청마다 다른 스레드에서 사용할 수 있도록 스레드 검사 해제 (한 번에 한 요청만 사용)
+            conn = sqlite3.connect(self.path, factory=TimedConnection, check_same_thread=False)
+            conn.pool = self
+        return conn
+
+    def release(self, conn):
+        # 커밋하지 않은 변경은 기존 close()와 같이 버림
+        if conn.in_transaction:
+            conn.rollback()
+        conn.row_factory = None
+        with self._lock:
+            if any(idle is conn for idle in self._idle):
+                return
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        sqlite3.Connection.close(conn)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            sqlite3.Connection.close(conn)
+
+
+_pools = {}
+_pools_pid = None
+_pools_lock = threading.Lock()
+
+
+def current_db_path():
+    """현재 요청의 데이터베이스 파일 (테넌트가 지정되지 않았으면 DB_PATH)"""
+    if has_request_context():
+        return g.get('db_path') or DB_PATH
+    return DB_PATH
+
+
+def get_pool(path):
+    global _pools, _pools_pid
+    with _pools_lock:
+        # fork 된 워커는 부모 프로세스의 연결을 쓰지 않음
+        if _pools_pid != os.getpid():
+            _pools = {}
+            _pools_pid = os.getpid()
+        pool = _pools.get(path)
+        if pool is None:
+            pool = _pools[path] = ConnectionPool(path)
+        return pool
+
+
+def connect(path=None):
+    """풀을 거치지 않는 연결 (스키마 생성, 관리 도구용)"""
+    return sqlite3.connect(path or current_db_path(), factory=TimedConnection)
+
+
+def get_db(path=None):
+    return get_pool(path or current_db_path()).acquire()
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+엑셀 내보내기
+openpyxl 로딩 비용이 워커 시작 시간에 포함되지 않도록 첫 내보내기 요청 때 불러옵니다.
+"""
+
+import io
+
+from openpyxl import Workbook
+from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+
+# 한글 숫자 변환 함수
+def number_to_korean(num):
+    korean_numbers = ['', '일', '이', '삼', '사', '오', '육', '칠', '팔', '구']
+    
+    if num == 0:
+        return '영원 正'
+    
+    result = ''
+    
+    # 조, 억, 만 단위로 분리
+    trillion = num // 1000000000000
+    hundred_million = (num % 1000000000000) // 100000000
+    ten_thousand = (num % 100000000) // 10000
+    remainder = num % 10000
+    
+    def convert_thousands(number):
+        if number == 0:
+            return ''
+        
+        str_result = ''
+        thousands = number // 1000
+        hundreds = (number % 1000) // 100
+        tens = (number % 100) // 10
+        units = number % 10
+        
+        if thousands > 0:
+            str_result += korean_numbers[thousands] + '천'
+        if hundreds > 0:
+            str_result += korean_numbers[hundreds] + '백'
+        if tens > 0:
+            str_result += korean_numbers[tens] + '십'
+        if units > 0:
+            str_result += korean_numbers[units]
+        
+        return str_result
+    
+    # 조 단위 처리
+    if trillion > 0:
+        result += convert_thousands(trillion) + '조'
+    
+    # 억 단위 처리
+    if hundred_million > 0:
+        result += convert_thousands(hundred_million) + '억'
+    
+    # 만 단위 처리
+    if ten_thousand > 0:
+        result += convert_thousands(ten_thousand) + '만'
+    
+    # 나머지 천의 자리 이하 처리
+    if remainder > 0:
+        result += convert_thousands(remainder)
+    
+    return result + '원 正'
+
+# 견적서 엑셀 생성
+def build_estimate_workbook(data):
+    """견적서 데이터로 엑셀 파일을 만들어 BytesIO로 반환"""
+    # 워크북 생성
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "견적서"
+
+    # 스타일 정의
+    header_font = Font(bold=True, size=16)
+    sub_header_font = Font(bold=True, size=12)
+    normal_font = Font(size=10)
+    border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    header_fill = PatternFill(start_color='E6E6FA', end_color='E6E6FA', fill_type='solid')
+
+    # 제목
+    ws.merge_cells('A1:H1')
+    ws['A1'] = '견 적 서'
+    ws['A1'].font = header_font
+    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
+
+    # 견적 정보
+    ws['A3'] = '견적번호:'
+    ws['B3'] = data.get('estimate_number', '')
+    ws['E3'] = '견적일자:'
+    ws['F3'] = data.get('estimate_date', '')
+
+    ws['A4'] = '유효기간:'
+    ws['B4'] = data.get('valid_until', '')
+
+    # 공급업체 정보
+    ws['A6'] = '공급업체'
+    ws['A6'].font = sub_header_font
+    ws.merge_cells('A6:D6')
+
+    company = data.get('company', {})
+    ws['A7'] = f"상호: {company.get('name', '')}"
+    ws['A8'] = f"사업자등록번호: {company.get('business_number', '')}"
+    ws['A9'] = f"주소: {company.get('address', '')}"
+    ws['A10'] = f"대표자: {company.get('ceo', '')}"
+    ws['A11'] = f"전화번호: {company.get('phone', '')}"
+
+    # 수요업체 정보
+    ws['E6'] = '수요업체'
+    ws['E6'].font = sub_header_font
+    ws.merge_cells('E6:H6')
+
+    client = data.get('client', {})
+    ws['E7'] = f"상호: {client.get('name', '')}"
+    ws['E8'] = f"사업자등록번호: {client.get('business_number', '')}"
+    ws['E9'] = f"주소: {client.get('address', '')}"
+    ws['E10'] = f"대표자: {client.get('ceo', '')}"
+    ws['E11'] = f"전화번호: {client.get('phone', '')}"
+
+    # 한글 금액 표시
+    total_amount = data.get('total', 0)
+    korean_amount = number_to_korean(int(total_amount))
+    ws.merge_cells('A13:H13')
+    ws['A13'] = f'금액: {korean_amount}'
+    ws['A13'].font = Font(bold=True, size=12)
+    ws['A13'].alignment = Alignment(horizontal='center')
+
+    # 항목 테이블 헤더
+    headers = ['공종', '품목', '규격', '단위', '수량', '단가', '공급가액', '비고']
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=15, column=col, value=header)
+        cell.font = sub_header_font
+        cell.border = border
+        cell.fill = header_fill
+        cell.alignment = Alignment(horizontal='center')
+
+    # 항목 데이터
+    items = data.get('items', [])
+    start_row = 16
+    for idx, item in enumerate(items):
+        row = start_row + idx
+        ws.cell(row=row, column=1, value=item.get('category', '')).border = border
+        ws.cell(row=row, column=2, value=item.get('name', '')).border = border
+        ws.cell(row=row, column=3, value=item.get('spec', '')).border = border
+        ws.cell(row=row, column=4, value=item.get('unit', 'EA')).border = border
+        ws.cell(row=row, column=5, value=item.get('quantity', 0)).border = border
+        ws.cell(row=row, column=6, value=item.get('price', 0)).border = border
+        ws.cell(row=row, column=7, value=item.get('total', 0)).border = border
+        ws.cell(row=row, column=8, value=item.get('note', '')).border = border
+
+    # 합계 테이블
+    summary_row = start_row + len(items) + 2
+    ws.merge_cells(f'A{summary_row}:F{summary_row}')
+    ws[f'A{summary_row}'] = '합계'
+
+    # 공급가액, 세액, 총액 표시
+    subtotal = data.get('subtotal', 0)
+    tax = data.get('tax', 0)
+
+    ws[f'A{summary_row + 1}'] = '공급가액'
+    ws[f'B{summary_row + 1}'] = subtotal
+    ws[f'C{summary_row + 1}'] = '세액'
+    ws[f'D{summary_row + 1}'] = tax
+    ws[f'E{summary_row + 1}'] = '합계금액'
+    ws[f'F{summary_row + 1}'] = total_amount
+
+    # 컬럼 너비 조정
+    column_widths = [12, 25, 15, 8, 8, 15, 15, 20]
+    for i, width in enumerate(column_widths, 1):
+        ws.column_dimensions[chr(64 + i)].width = width
+
+    # 파일 저장
+    output = io.BytesIO()
+    wb.save(output)
+    output.seek(0)
+
+    return output
+
+# 영수증 기록 엑셀 생성
+def build_daily_workbook(data):
+    """영수증 기록 데이터로 엑셀 파일을 만들어 BytesIO로 반환"""
+    # 워크북 생성
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "영수증기록"
+
+    # 스타일 정의
+    header_font = Font(bold=True, size=14)
+    sub_header_font = Font(bold=True, size=11)
+    border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    header_fill = PatternFill(start_color='F0F0F0', end_color='F0F0F0', fill_type='solid')
+
+    # 제목
+    ws.merge_cells('A1:E1')
+    ws['A1'] = '일일 영수증 기록 내역서'
+    ws['A1'].font = header_font
+    ws['A1'].alignment = Alignment(horizontal='center')
+
+    # 기본 정보
+    ws['A3'] = '현장명:'
+    ws['B3'] = data.get('site_name', '')
+    ws['D3'] = '기록일자:'
+    ws['E3'] = data.get('date', '')
+
+    # 테이블 헤더
+    headers = ['카테고리', '사용내역', '단가(원)', '금액(원)', '비고']
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=5, column=col, value=header)
+        cell.font = sub_header_font
+        cell.border = border
+        cell.fill = header_fill
+        cell.alignment = Alignment(horizontal='center')
+
+    # 데이터 행
+    items = data.get('items', [])
+    total_amount = 0
+
+    for idx, item in enumerate(items):
+        row = 6 + idx
+        ws.cell(row=row, column=1, value=item.get('category', '')).border = border
+        ws.cell(row=row, column=2, value=item.get('content', '')).border = border
+        ws.cell(row=row, column=3, value=item.get('rate', 0)).border = border
+        ws.cell(row=row, column=4, value=item.get('amount', 0)).border = border
+        ws.cell(row=row, column=5, value=item.get('note', '')).border = border
+        total_amount += item.get('amount', 0)
+
+    # 합계 행
+    total_row = 6 + len(items) + 1
+    ws.cell(row=total_row, column=3, value='합계').font = Font(bold=True)
+    ws.cell(row=total_row, column=4, value=total_amount).font = Font(bold=True)
+
+    # 컬럼 너비 조정
+    ws.column_dimensions['A'].width = 15
+    ws.column_dimensions['B'].width = 35
+    ws.column_dimensions['C'].width = 15
+    ws.column_dimensions['D'].width = 15
+    ws.column_dimensions['E'].width = 25
+
+    # 파일 저장
+    output = io.BytesIO()
+    wb.save(output)
+    output.seek(0)
+
+    return output
+
+# 현장 정산 보고서 엑셀 생성
+def build_site_report_workbook(report):
+    """reports.site_report() 결과로 공종별 비교/월별 지출 시트를 만들어 BytesIO로 반환"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "공종별 비교"
+
+    # 스타일 정의
+    header_font = Font(bold=True, size=16)
+    sub_header_font = Font(bold=True, size=11)
+    border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    header_fill = PatternFill(start_color='F0F0F0', end_color='F0F0F0', fill_type='solid')
+    over_fill = PatternFill(start_color='FDE2E2', end_color='FDE2E2', fill_type='solid')
+    money_format = '#,##0'
+
+    # 제목
+    ws.merge_cells('A1:G1')
+    ws['A1'] = '현장 정산 보고서'
+    ws['A1'].font = header_font
+    ws['A1'].alignment = Alignment(horizontal='center')
+
+    # 기본 정보
+    estimate = report.get('estimate') or {}
+    ws['A3'] = '현장명:'
+    ws['B3'] = report.get('site_name', '')
+    ws['D3'] = '기간:'
+    ws['E3'] = f"{report.get('start') or '처음'} ~ {report.get('end') or '현재'}"
+    ws['A4'] = '견적번호:'
+    ws['B4'] = estimate.get('estimate_number', '')
+    ws['D4'] = '고객:'
+    ws['E4'] = estimate.get('client_name', '')
+
+    # 테이블 헤더
+    headers = ['공종/카테고리', '견적 금액(원)', '지출 금액(원)', '차액(원)', '집행률(%)', '견적 항목 수', '영수증 항목 수']
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=6, column=col, value=header)
+        cell.font = sub_header_font
+        cell.border = border
+        cell.fill = header_fill
+        cell.alignment = Alignment(horizontal='center')
+
+    # 데이터 행 (견적을 초과한 카테고리는 강조)
+    rows = report.get('categories', [])
+    for idx, item in enumerate(rows):
+        row = 7 + idx
+        values = [item['category'], item['estimated'], item['actual'], item['difference'],
+                  item['ratio'], item['estimate_items'], item['receipt_items']]
+        for col, value in enumerate(values, 1):
+            cell = ws.cell(row=row, column=col, value=value)
+            cell.border = border
+            if col in (2, 3, 4):
+                cell.number_format = money_format
+            if item['difference'] < 0:
+                cell.fill = over_fill
+
+    # 합계 행
+    totals = report.get('totals', {})
+    total_row = 7 + len(rows)
+    for col, value in enumerate(['합계', totals.get('estimated', 0), totals.get('actual', 0),
+                                 totals.get('difference', 0), totals.get('ratio')], 1):
+        cell = ws.cell(row=total_row, column=col, value=value)
+        cell.font = Font(bold=True)
+        cell.border = border
+        if col in (2, 3, 4):
+            cell.number_format = money_format
+
+    ws.cell(row=total_row + 2, column=1, value='* 견적 금액은 견적 항목 금액 합계(부가세 제외)입니다.').font = Font(size=9)
+
+    # 컬럼 너비 조정
+    ws.column_dimensions['A'].width = 18
+    for column in 'BCD':
+        ws.column_dimensions[column].width = 16
+    for column in 'EFG':
+        ws.column_dimensions[column].width = 13
+
+    # 월별 지출 시트: 월 x 카테고리
+    monthly = wb.create_sheet("월별 지출")
+    months = sorted({item['month'] for item in report.get('months', [])})
+    categories = sorted({item['category'] for item in report.get('months', [])})
+    amounts = {(item['month'], item['category']): item['amount'] for item in report.get('months', [])}
+
+    for col, header in enumerate(['월'] + categories + ['합계'], 1):
+        cell = monthly.cell(row=1, column=col, value=header)
+        cell.font = sub_header_font
+        cell.border = border
+        cell.fill = header_fill
+        cell.alignment = Alignment(horizontal='center')
+        monthly.column_dimensions[cell.column_letter].width = 14
+
+    for idx, month in enumerate(months):
+        row = 2 + idx
+        monthly.cell(row=row, column=1, value=month).border = border
+        values = [amounts.get((month, category), 0) for category in categories]
+        for col, value in enumerate(values + [sum(values)], 2):
+            cell = monthly.cell(row=row, column=col, value=value)
+            cell.border = border
+            cell.number_format = money_format
+
+    # 파일 저장
+    output = io.BytesIO()
+    wb.save(output)
+    output.seek(0)
+
+    return output
@@ -1,5 +1,8 @@
 # Gunicorn 프로덕션 설정 파일
 
+# 애플리케이션 팩토리
+wsgi_app = "app:create_app()"
+
 # 바인딩 설정
 bind = "0.0.0.0:5002"
 
@@ -21,6 +24,11 @@ errorlog = "/var/log/estimate-app/error.log"
 loglevel = "info"
 access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s" %(D)s'
 
+# 워커 종료 시 버퍼에 남은 애플리케이션 로그 기록
+def worker_exit(server, worker):
+    import log_config
+    log_config.shutdown_logging()
+
 # 프로세스 설정
 daemon = False
 pidfile = "/tmp/gunicorn_estimate.pid"
@@ -0,0 +1,619 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+엑셀/CSV 일괄 가져오기
+기존 스프레드시트를 한 행씩 스트리밍으로 읽어 검증/정규화한 뒤
+배치 단위 트랜잭션으로 데이터베이스에 저장합니다.
+"""
+
+import argparse
+import codecs
+import csv
+import json
+import logging
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+import threading
+import uuid
+from datetime import date, datetime
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 커밋할 행 수
+BATCH_SIZE = 500
+# 작업 상태에 보관할 최대 오류 건수 (나머지는 개수만 집계)
+MAX_ERRORS = 200
+SUPPORTED_EXTENSIONS = ('.xlsx', '.xlsm', '.csv')
+
+
+class ImportFormatError(ValueError):
+    """파일 형식이나 헤더가 올바르지 않을 때 발생"""
+
+
+# 값 정규화 함수
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _number(value):
+    if value is None or isinstance(value, bool):
+        return 0
+    if isinstance(value, (int, float)):
+        return value
+    cleaned = str(value).replace(',', '').replace('원', '').strip()
+    if not cleaned:
+        return 0
+    try:
+        number = float(cleaned)
+    except ValueError:
+        raise ValueError(f"숫자 형식이 올바르지 않습니다: {value}")
+    return int(number) if number.is_integer() else number
+
+
+def _date(value):
+    if value is None or value == '':
+        return ''
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, date):
+        return value.isoformat()
+    text = str(value).strip()
+    for fmt in ('%Y-%m-%d', '%Y.%m.%d', '%Y/%m/%d', '%Y%m%d', '%Y-%m-%d %H:%M:%S'):
+        try:
+            return datetime.strptime(text, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    raise ValueError(f"날짜 형식이 올바르지 않습니다: {value}")
+
+
+def _business_number(value):
+    text = _text(value)
+    digits = re.sub(r'\D', '', text)
+    if len(digits) == 10:
+        return f"{digits[:3]}-{digits[3:5]}-{digits[5:]}"
+    return text
+
+
+def _phone(value):
+    text = _text(value)
+    digits = re.sub(r'\D', '', text)
+    # 엑셀이 숫자로 저장하면서 앞자리 0이 빠진 경우 복원
+    if digits and not digits.startswith('0') and len(digits) in (9, 10):
+        digits = '0' + digits
+    if len(digits) == 11:
+        return f"{digits[:3]}-{digits[3:7]}-{digits[7:]}"
+    if len(digits) == 10:
+        if digits.startswith('02'):
+            return f"{digits[:2]}-{digits[2:6]}-{digits[6:]}"
+        return f"{digits[:3]}-{digits[3:6]}-{digits[6:]}"
+    if len(digits) == 9 and digits.startswith('02'):
+        return f"{digits[:2]}-{digits[2:5]}-{digits[5:]}"
+    return text
+
+
+# 가져오기 유형별 필드 정의: 필드명 -> (정규화 함수, 헤더 별칭)
+COMPANY_FIELDS = {
+    'name': (_text, ('상호', '회사명', '업체명')),
+    'business_number': (_business_number, ('사업자등록번호', '사업자번호')),
+    'address': (_text, ('주소',)),
+    'ceo': (_text, ('대표자', '대표')),
+    'type': (_text, ('업태',)),
+    'item': (_text, ('종목',)),
+    'phone': (_phone, ('전화번호', '연락처')),
+    'fax': (_phone, ('팩스', '팩스번호')),
+    'manager': (_text, ('담당자',)),
+}
+
+CLIENT_FIELDS = {
+    'type': (_text, ('구분', '고객유형')),
+    'name': (_text, ('상호', '고객명', '성명', '이름')),
+    'business_number': (_business_number, ('사업자등록번호', '사업자번호')),
+    'address': (_text, ('주소',)),
+    'ceo': (_text, ('대표자', '대표')),
+    'phone': (_phone, ('전화번호', '연락처', 'contact')),
+    'manager': (_text, ('담당자',)),
+}
+
+ESTIMATE_FIELDS = {
+    'estimate_number': (_text, ('견적번호',)),
+    'estimate_date': (_date, ('견적일자', '견적일')),
+    'valid_until': (_date, ('유효기간',)),
+    'company_name': (_text, ('공급업체', '공급자')),
+    'client_name': (_text, ('수요업체', '고객명', '고객')),
+    'category': (_text, ('공종',)),
+    'name': (_text, ('품목', '품명')),
+    'spec': (_text, ('규격',)),
+    'unit': (_text, ('단위',)),
+    'quantity': (_number, ('수량',)),
+    'price': (_number, ('단가',)),
+    'total': (_number, ('공급가액', '금액')),
+    'note': (_text, ('비고',)),
+}
+
+DAILY_RECORD_FIELDS = {
+    'date': (_date, ('기록일자', '날짜', '일자', 'daily_date')),
+    'site_name': (_text, ('현장명', '현장')),
+    'category': (_text, ('카테고리', '분류')),
+    'content': (_text, ('사용내역', '내역')),
+    'rate': (_number, ('단가(원)', '단가')),
+    'amount': (_number, ('금액(원)', '금액')),
+    'note': (_text, ('비고',)),
+}
+
+REQUIRED_FIELDS = {
+    'companies': ('name',),
+    'clients': ('name',),
+    'estimates': ('estimate_number', 'name'),
+    'daily_records': ('date', 'site_name', 'content'),
+}
+
+
+# 파일 읽기 (스트리밍)
+def _iter_xlsx(path):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        for row_number, values in enumerate(ws.iter_rows(values_only=True), 1):
+            yield row_number, values
+    finally:
+        wb.close()
+
+
+def _detect_csv_encoding(path):
+    """파일 앞부분으로 UTF-8/CP949(한글 엑셀 기본) 인코딩 판별"""
+    with open(path, 'rb') as f:
+        head = f.read(65536)
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return 'utf-8-sig'
+    except UnicodeDecodeError:
+        return 'cp949'
+
+
+def _iter_csv(path):
+    with open(path, newline='', encoding=_detect_csv_encoding(path)) as f:
+        reader = csv.reader(f)
+        for values in reader:
+            yield reader.line_num, values
+
+
+def iter_rows(path):
+    """파일 확장자에 따라 (행 번호, 값 목록)을 한 행씩 반환"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.xlsx', '.xlsm'):
+        return _iter_xlsx(path)
+    if ext == '.csv':
+        return _iter_csv(path)
+    raise ImportFormatError(f"지원하지 않는 파일 형식입니다: {ext}")
+
+
+def _is_blank(values):
+    return all(value is None or str(value).strip() == '' for value in values)
+
+
+def _resolve_columns(kind, header):
+    """헤더 행을 필드명 목록으로 변환 (알 수 없는 열은 None)"""
+    aliases = {}
+    for field, (_, names) in IMPORT_KINDS[kind]['fields'].items():
+        aliases[field] = field
+        for name in names:
+            aliases.setdefault(name, field)
+
+    columns = []
+    for value in header:
+        key = _text(value).replace(' ', '')
+        columns.append(aliases.get(key) or aliases.get(key.lower()))
+
+    missing = [field for field in REQUIRED_FIELDS[kind] if field not in columns]
+    if missing:
+        raise ImportFormatError(f"필수 열이 없습니다: {', '.join(missing)}")
+    return columns
+
+
+def _normalize_row(kind, columns, values):
+    """한 행을 검증/정규화하여 레코드 dict로 반환"""
+    fields = IMPORT_KINDS[kind]['fields']
+    record = {}
+    for field, value in zip(columns, values):
+        if field is not None and field not in record:
+            record[field] = fields[field][0](value)
+    for field, (normalize, _) in fields.items():
+        record.setdefault(field, normalize(None))
+
+    missing = [field for field in REQUIRED_FIELDS[kind] if record[field] in ('', None)]
+    if missing:
+        raise ValueError(f"필수 값이 비어 있습니다: {', '.join(missing)}")
+    return record
+
+
+# 유형별 저장 함수: group은 같은 키를 가진 연속 행의 레코드 목록
+def _write_companies(cursor, group, cache):
+    cursor.executemany('''
+        INSERT INTO companies (name, business_number, address, ceo, type, item, phone, fax, manager)
+        VALUES (:name, :business_number, :address, :ceo, :type, :item, :phone, :fax, :manager)
+    ''', group)
+    return len(group)
+
+
+def _write_clients(cursor, group, cache):
+    for record in group:
+        record['type'] = record['type'] or 'business'
+    cursor.executemany('''
+        INSERT INTO clients (type, name, business_number, address, ceo, phone, manager)
+        VALUES (:type, :name, :business_number, :address, :ceo, :phone, :manager)
+    ''', group)
+    return len(group)
+
+
+def _lookup_or_create(cursor, cache, table, name):
+    """이름으로 회사/고객 ID 조회, 없으면 생성 (작업 내 캐시 사용)"""
+    if not name:
+        return None
+    key = (table, name)
+    if key not in cache:
+        cursor.execute(f'SELECT id FROM {table} WHERE name = ? ORDER BY id DESC LIMIT 1', (name,))
+        row = cursor.fetchone()
+        if row:
+            cache[key] = row[0]
+        elif table == 'clients':
+            cursor.execute("INSERT INTO clients (type, name) VALUES ('business', ?)", (name,))
+            cache[key] = cursor.lastrowid
+        else:
+            cursor.execute('INSERT INTO companies (name) VALUES (?)', (name,))
+            cache[key] = cursor.lastrowid
+    return cache[key]
+
+
+def _write_estimate(cursor, group, cache):
+    head = group[0]
+    items = []
+    for record in group:
+        items.append({
+            'category': record['category'],
+            'name': record['name'],
+            'spec': record['spec'],
+            'unit': record['unit'] or 'EA',
+            'quantity': record['quantity'],
+            'price': record['price'],
+            'total': record['total'] or record['quantity'] * record['price'],
+            'note': record['note'],
+        })
+    subtotal = sum(item['total'] for item in items)
+    tax = round(subtotal * 0.1)
+
+    company_id = _lookup_or_create(cursor, cache, 'companies', head['company_name'])
+    client_id = _lookup_or_create(cursor, cache, 'clients', head['client_name'])
+    cursor.execute('''
+        INSERT INTO estimates (estimate_number, estimate_date, valid_until, company_id, client_id, subtotal, tax, total, items)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (
+        head['estimate_number'],
+        head['estimate_date'],
+        head['valid_until'],
+        company_id,
+        client_id,
+        subtotal,
+        tax,
+        subtotal + tax,
+        json.dumps(items, ensure_ascii=False)
+    ))
+    estimate_id = cursor.lastrowid
+    cursor.executemany('''
+        INSERT INTO estimate_items (estimate_id, category, name, spec, quantity, price, total, note)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [
+        (estimate_id, item['category'], item['name'], item['spec'],
+         item['quantity'], item['price'], item['total'], item['note'])
+        for item in items
+    ])
+    return 1
+
+
+def _write_daily_record(cursor, group, cache):
+    head = group[0]
+    items = []
+    for record in group:
+        items.append({
+            'category': record['category'],
+            'content': record['content'],
+            'rate': record['rate'],
+            'amount': record['amount'] or record['rate'],
+            'note': record['note'],
+        })
+    cursor.execute('''
+        INSERT INTO daily_records (date, site_name, total, items)
+        VALUES (?, ?, ?, ?)
+    ''', (
+        head['date'],
+        head['site_name'],
+        sum(item['amount'] for item in items),
+        json.dumps(items, ensure_ascii=False)
+    ))
+    return 1
+
+
+# 유형별 설정: 연속된 행 중 group_key가 같은 행은 하나의 견적서/기록으로 묶음
+IMPORT_KINDS = {
+    'companies': {
+        'fields': COMPANY_FIELDS,
+        'group_key': None,
+        'write': _write_companies,
+    },
+    'clients': {
+        'fields': CLIENT_FIELDS,
+        'group_key': None,
+        'write': _write_clients,
+    },
+    'estimates': {
+        'fields': ESTIMATE_FIELDS,
+        'group_key': lambda record: record['estimate_number'],
+        'write': _write_estimate,
+    },
+    'daily_records': {
+        'fields': DAILY_RECORD_FIELDS,
+        'group_key': lambda record: (record['date'], record['site_name']),
+        'write': _write_daily_record,
+    },
+}
+
+
+def run_import(conn, kind, path, batch_size=BATCH_SIZE, on_batch=None):
+    """
+    파일을 스트리밍으로 읽어 저장하고 처리 결과 dict를 반환합니다.
+    on_batch(cursor, stats)는 각 배치 커밋 직전에 같은 트랜잭션 안에서 호출됩니다.
+    """
+    if kind not in IMPORT_KINDS:
+        raise ImportFormatError(f"지원하지 않는 가져오기 유형입니다: {kind}")
+    config = IMPORT_KINDS[kind]
+    group_key = config['group_key']
+    write = config['write']
+
+    stats = {'processed_rows': 0, 'imported': 0, 'error_count': 0, 'errors': []}
+    cache = {}
+    cursor = conn.cursor()
+
+    def add_error(row_number, message):
+        stats['error_count'] += 1
+        if len(stats['errors']) < MAX_ERRORS:
+            stats['errors'].append({'row': row_number, 'message': message})
+
+    def commit():
+        if on_batch:
+            on_batch(cursor, stats)
+        conn.commit()
+
+    def flush():
+        if group:
+            stats['imported'] += write(cursor, group, cache)
+            del group[:]
+
+    rows = iter_rows(path)
+    columns = None
+    group, current_key, pending = [], None, 0
+
+    try:
+        for row_number, values in rows:
+            if _is_blank(values):
+                continue
+            if columns is None:
+                columns = _resolve_columns(kind, values)
+                continue
+
+            stats['processed_rows'] += 1
+            pending += 1
+            try:
+                record = _normalize_row(kind, columns, values)
+            except ValueError as e:
+                add_error(row_number, str(e))
+                record = None
+
+            if record is not None:
+                key = group_key(record) if group_key else None
+                if group and key != current_key:
+                    flush()
+                    # 견적서/기록 하나가 두 배치로 나뉘지 않도록 그룹 경계에서만 커밋
+                    if pending >= batch_size:
+                        commit()
+                        pending = 0
+                current_key = key
+                group.append(record)
+
+            if group_key is None and pending >= batch_size:
+                flush()
+                commit()
+                pending = 0
+
+        if columns is None:
+            raise ImportFormatError("헤더 행을 찾을 수 없습니다")
+        flush()
+        commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        rows.close()
+
+    return stats
+
+
+# 백그라운드 가져오기 작업
+def _update_job(cursor, job_id, stats, status=None, message=None):
+    cursor.execute('''
+        UPDATE import_jobs
+        SET processed_rows = ?, imported = ?, error_count = ?, errors = ?,
+            status = COALESCE(?, status), message = COALESCE(?, message),
+            finished_at = CASE WHEN ? IN ('done', 'failed') THEN CURRENT_TIMESTAMP ELSE finished_at END
+        WHERE id = ?
+    ''', (
+        stats['processed_rows'],
+        stats['imported'],
+        stats['error_count'],
+        json.dumps(stats['errors'], ensure_ascii=False),
+        status,
+        message,
+        status,
+        job_id
+    ))
+
+
+def _run_job(db_path, job_id, kind, path):
+    conn = sqlite3.connect(db_path, timeout=30)
+    stats = {'processed_rows': 0, 'imported': 0, 'error_count': 0, 'errors': []}
+    try:
+        cursor = conn.execute("UPDATE import_jobs SET status = 'running', pid = ? WHERE id = ? AND status = 'pending'",
+                              (os.getpid(), job_id))
+        conn.commit()
+        if cursor.rowcount == 0:
+            logger.warning(f"대기 중이 아닌 가져오기 작업은 실행하지 않음: {job_id}")
+            return
+        stats = run_import(conn, kind, path,
+                           on_batch=lambda cursor, current: _update_job(cursor, job_id, current))
+        _update_job(conn.cursor(), job_id, stats, 'done', '가져오기가 완료되었습니다')
+        logger.info(f"일괄 가져오기 완료: {job_id} ({kind}, {stats['imported']}건, 오류 {stats['error_count']}건)")
+    except Exception as e:
+        logger.exception(f"일괄 가져오기 실패: {job_id}")
+        _update_job(conn.cursor(), job_id, stats, 'failed', str(e))
+    finally:
+        conn.commit()
+        conn.close()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def start_import_job(db_path, kind, path, filename):
+    """
+    가져오기 작업을 등록하고 별도 프로세스에서 실행 (작업 ID 반환)
+    워커 재시작(max_requests)이나 요청 처리와 관계없이 끝까지 실행되도록 새 세션의 프로세스로 분리합니다.
+    """
+    job_id = uuid.uuid4().hex
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute('''
+            INSERT INTO import_jobs (id, kind, filename, status)
+            VALUES (?, ?, ?, 'pending')
+        ''', (job_id, kind, filename))
+        conn.commit()
+
+        process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), kind, path, '--db', db_path, '--job', job_id],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, start_new_session=True
+        )
+        conn.execute('UPDATE import_jobs SET pid = ? WHERE id = ? AND pid IS NULL', (process.pid, job_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+    # 끝난 프로세스가 좀비로 남아 실행 중으로 보이지 않도록 회수
+    threading.Thread(target=process.wait, daemon=True).start()
+    return job_id
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+STALE_JOB_MESSAGE = '서버가 다시 시작되어 가져오기가 중단되었습니다. 파일을 다시 가져오세요.'
+
+
+def fail_stale_jobs(cursor, job_id=None, include_unstarted=False):
+    """
+    실행 프로세스가 없어진 대기/실행 중 작업을 실패로 표시하고 건수 반환
+    include_unstarted=True(서버 시작 시)이면 프로세스 ID가 기록되지 않은 작업도 실패로 표시합니다.
+    """
+    sql = "SELECT id, pid FROM import_jobs WHERE status IN ('pending', 'running')"
+    params = ()
+    if job_id is not None:
+        sql += ' AND id = ?'
+        params = (job_id,)
+    cursor.execute(sql, params)
+
+    stale = [stale_id for stale_id, pid in cursor.fetchall()
+             if (pid is None and include_unstarted) or (pid is not None and not _process_alive(pid))]
+    for stale_id in stale:
+        # 그 사이에 끝난 작업은 그대로 둠
+        cursor.execute('''
+            UPDATE import_jobs SET status = 'failed', message = ?, finished_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND status IN ('pending', 'running')
+        ''', (STALE_JOB_MESSAGE, stale_id))
+        logger.warning(f"중단된 일괄 가져오기 작업을 실패로 표시: {stale_id}")
+    return len(stale)
+
+
+def get_import_job(db_path, job_id):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    if fail_stale_jobs(cursor, job_id):
+        conn.commit()
+    cursor.execute('''
+        SELECT id, kind, filename, status, processed_rows, imported, error_count, errors,
+               message, created_at, finished_at
+        FROM import_jobs WHERE id = ?
+    ''', (job_id,))
+    job = cursor.fetchone()
+    conn.close()
+
+    if not job:
+        return None
+    columns = ['id', 'kind', 'filename', 'status', 'processed_rows', 'imported', 'error_count', 'errors',
+               'message', 'created_at', 'finished_at']
+    result = dict(zip(columns, job))
+    result['errors'] = json.loads(result['errors']) if result['errors'] else []
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='엑셀/CSV 파일에서 데이터를 일괄 가져옵니다.')
+    parser.add_argument('kind', choices=sorted(IMPORT_KINDS), help='가져오기 유형')
+    parser.add_argument('path', help='가져올 .xlsx 또는 .csv 파일')
+    parser.add_argument('--db', default='estimate.db', help='데이터베이스 파일 (기본값: estimate.db)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='배치당 커밋할 행 수')
+    parser.add_argument('--job', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # 웹 API 에서 시작한 백그라운드 작업 (start_import_job)
+    if args.job:
+        import log_config
+        log_config.configure_logging()
+        _run_job(args.db, args.job, args.kind, args.path)
+        return 0
+
+    def report(cursor, stats):
+        print(f"\r처리 {stats['processed_rows']}행 / 저장 {stats['imported']}건 / 오류 {stats['error_count']}건",
+              end='', flush=True)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        stats = run_import(conn, args.kind, args.path, args.batch_size, report)
+    except ImportFormatError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+
+    print()
+    for error in stats['errors']:
+        print(f"  {error['row']}행: {error['message']}")
+    if stats['error_count'] > len(stats['errors']):
+        print(f"  ... 외 {stats['error_count'] - len(stats['errors'])}건")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -59,6 +59,10 @@ echo -e "${YELLOW}[5/7] Python 의존성 설치 중...${NC}"
 pip install --upgrade pip
 pip install -r requirements.txt
 
+# 정적 파일 빌드 (외부 라이브러리 내려받기, 압축, 해시, .gz/.br 생성)
+python assets.py vendor || echo -e "${YELLOW}외부 라이브러리를 내려받지 못했습니다. CDN 주소를 사용합니다${NC}"
+python assets.py build
+
 # Update systemd service file with current directory
 echo -e "${YELLOW}[6/7] Systemd 서비스 설정 중...${NC}"
 # Update service file with current directory paths
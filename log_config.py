@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+로깅 설정
+요청 스레드는 로그 레코드를 큐에 넣기만 하고, 워커별 리스너 스레드가
+JSON 한 줄 형식으로 모아서 파일에 기록합니다.
+
+환경 변수
+- LOG_FILE: 로그 파일 경로 (기본값: app.log)
+- LOG_MAX_BYTES / LOG_BACKUP_COUNT: 크기 기준 회전 (기본값: 10MB, 5개)
+- LOG_BUFFER_SIZE / LOG_FLUSH_INTERVAL: 워커별 버퍼 크기와 최대 보관 시간(초)
+- LOG_INFO_SAMPLE_RATE: INFO 이하 애플리케이션 로그 기록 비율 (기본값: 1.0)
+- LOG_ACCESS_SAMPLE_RATE: 정상 요청 로그 기록 비율 (기본값: 0.1)
+- LOG_SLOW_REQUEST_MS: 이 시간 이상 걸린 요청은 항상 기록 (기본값: 500)
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from flask import g, has_request_context, request
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경에서는 파일 잠금 없이 기록
+    fcntl = None
+
+ACCESS_LOGGER = 'estimate.access'
+CONSOLE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+CONTEXT_FIELDS = ('request_id', 'tenant', 'method', 'route', 'path', 'status', 'duration_ms', 'db_ms')
+
+access_logger = logging.getLogger(ACCESS_LOGGER)
+
+
+def _env_float(name, default):
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class JsonFormatter(logging.Formatter):
+    """레코드를 JSON 한 줄로 변환"""
+
+    def format(self, record):
+        payload = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'pid': record.process,
+        }
+        for key in CONTEXT_FIELDS:
+            value = getattr(record, key, None)
+            if value is not None:
+                payload[key] = value
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload['exc_info'] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class RequestContextFilter(logging.Filter):
+    """요청 ID/라우트 정보를 레코드에 추가 (요청 스레드에서 실행)"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get('request_id')
+            record.tenant = g.get('tenant')
+            record.method = request.method
+            record.route = request.url_rule.rule if request.url_rule else None
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """대량으로 발생하는 INFO 로그를 비율에 따라 기록 (WARNING 이상은 항상 기록)"""
+
+    def __init__(self, info_rate, access_rate, slow_request_ms):
+        super().__init__()
+        self.info_rate = info_rate
+        self.access_rate = access_rate
+        self.slow_request_ms = slow_request_ms
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        if record.name == ACCESS_LOGGER:
+            if getattr(record, 'status', 0) >= 400:
+                return True
+            if getattr(record, 'duration_ms', 0) >= self.slow_request_ms:
+                return True
+            return self.access_rate >= 1 or random.random() < self.access_rate
+        return self.info_rate >= 1 or random.random() < self.info_rate
+
+
+class LockedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """여러 워커가 같은 파일에 기록할 수 있도록 배치 쓰기와 회전을 flock으로 보호"""
+
+    def __init__(self, filename, max_bytes, backup_count):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding='utf-8', delay=True)
+        self.lock_path = self.baseFilename + '.lock'
+
+    def _reopen_if_rotated(self):
+        # 다른 워커가 파일을 회전시켰다면 새 파일을 다시 연다
+        if self.stream is not None:
+            try:
+                current = os.stat(self.baseFilename).st_ino
+            except FileNotFoundError:
+                current = None
+            if current != os.fstat(self.stream.fileno()).st_ino:
+                self.stream.close()
+                self.stream = None
+        if self.stream is None:
+            self.stream = self._open()
+
+    def _write(self, text):
+        self._reopen_if_rotated()
+        size = os.fstat(self.stream.fileno()).st_size
+        if self.maxBytes > 0 and size > 0 and size + len(text.encode('utf-8')) >= self.maxBytes:
+            self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+        self.stream.write(text)
+        self.stream.flush()
+
+    def emit_batch(self, records):
+        try:
+            text = ''.join(self.format(record) + self.terminator for record in records)
+            if fcntl is None:
+                self._write(text)
+                return
+            with open(self.lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    self._write(text)
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        except Exception:
+            self.handleError(records[0])
+
+    def emit(self, record):
+        self.emit_batch([record])
+
+
+class BufferedBatchHandler(logging.handlers.MemoryHandler):
+    """레코드를 모아 두었다가 개수/레벨/시간 기준으로 한 번에 기록"""
+
+    def __init__(self, capacity, flush_interval, target):
+        super().__init__(capacity, flushLevel=logging.ERROR, target=target, flushOnClose=True)
+        self.flush_interval = flush_interval
+        # logging.Handler.close() 가 _closed 속성을 쓰므로 다른 이름 사용
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._flusher.start()
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.target and self.buffer:
+                self.target.emit_batch(self.buffer)
+                self.buffer = []
+        finally:
+            self.release()
+
+    def close(self):
+        self._stopped.set()
+        target = self.target
+        super().close()
+        if target:
+            target.close()
+
+
+class ProcessQueueHandler(logging.handlers.QueueHandler):
+    """
+    프로세스마다 자체 큐와 리스너 스레드를 사용하는 QueueHandler
+    gunicorn preload_app 으로 fork 된 워커에서는 첫 로그 기록 시 리스너를 새로 시작합니다.
+    """
+
+    def __init__(self, handler_factory):
+        super().__init__(None)
+        self._handler_factory = handler_factory
+        self._start_lock = threading.Lock()
+        self._pid = None
+        self._listener = None
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self.queue = queue.SimpleQueue()
+            self._listener = logging.handlers.QueueListener(
+                self.queue, *self._handler_factory(), respect_handler_level=True)
+            self._listener.start()
+            self._pid = os.getpid()
+            atexit.register(self.stop)
+
+    def prepare(self, record):
+        # 메시지와 예외 정보를 문자열로 고정해 다른 스레드에서 안전하게 포맷할 수 있도록 함
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        self.queue.put_nowait(record)
+
+    def stop(self):
+        """큐에 남은 로그를 기록하고 리스너를 종료"""
+        listener = self._listener
+        if listener is None or self._pid != os.getpid():
+            return
+        self._listener = None
+        self._pid = None
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+def _build_handlers():
+    file_handler = LockedRotatingFileHandler(
+        os.environ.get('LOG_FILE', 'app.log'),
+        int(_env_float('LOG_MAX_BYTES', 10 * 1024 * 1024)),
+        int(_env_float('LOG_BACKUP_COUNT', 5))
+    )
+    file_handler.setFormatter(JsonFormatter())
+    buffered = BufferedBatchHandler(
+        int(_env_float('LOG_BUFFER_SIZE', 100)),
+        _env_float('LOG_FLUSH_INTERVAL', 2.0),
+        file_handler
+    )
+
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+    return buffered, console
+
+
+def configure_logging():
+    """루트 로거에 큐 핸들러 설정 (여러 번 호출해도 한 번만 적용)"""
+    root = logging.getLogger()
+    if any(isinstance(handler, ProcessQueueHandler) for handler in root.handlers):
+        return
+    handler = ProcessQueueHandler(_build_handlers)
+    handler.addFilter(SamplingFilter(
+        _env_float('LOG_INFO_SAMPLE_RATE', 1.0),
+        _env_float('LOG_ACCESS_SAMPLE_RATE', 0.1),
+        _env_float('LOG_SLOW_REQUEST_MS', 500)
+    ))
+    handler.addFilter(RequestContextFilter())
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
+
+def shutdown_logging():
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, ProcessQueueHandler):
+            handler.stop()
+
+
+def init_app(app):
+    """요청 ID 부여와 요청별 처리 시간/DB 시간 로그 기록"""
+
+    @app.before_request
+    def start_request_timer():
+        g.request_id = request.headers.get('X-Request-ID', '')[:64] or uuid.uuid4().hex[:16]
+        g.request_started = time.perf_counter()
+        g.db_ms = 0.0
+
+    @app.after_request
+    def log_request(response):
+        started = g.get('request_started')
+        if started is None:
+            return response
+        response.headers['X-Request-ID'] = g.request_id
+        access_logger.info(
+            '%s %s %s', request.method, request.path, response.status_code,
+            extra={
+                'path': request.path,
+                'status': response.status_code,
+                'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+                'db_ms': round(g.get('db_ms', 0.0), 2),
+            }
+        )
+        return response
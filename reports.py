@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+현장 정산 보고서
+영수증 기록(daily_records)의 사용 내역을 현장/날짜/카테고리별 합계(daily_rollups)로 미리 집계하고,
+기간별 지출을 견적서 항목(estimate_items)의 공종별 금액과 비교합니다.
+daily_rollups 는 daily_records 의 추가/삭제/수정 트리거가 갱신하므로 보고서 조회는
+기록 수가 아니라 기간의 일수 x 카테고리 수에 비례합니다.
+"""
+
+import sqlite3
+
+UNCATEGORIZED = '기타'
+
+# 영수증 항목 JSON 에서 (카테고리, 금액)을 꺼내는 SELECT (트리거와 전체 재집계에서 공통 사용)
+_ITEM_ROWS = '''
+    SELECT COALESCE({record}.site_name, '') AS site_name,
+           COALESCE({record}.date, '') AS date,
+           COALESCE(NULLIF(TRIM(json_extract(item.value, '$.category')), ''), '{uncategorized}') AS category,
+           COALESCE(CAST(json_extract(item.value, '$.amount') AS REAL),
+                    CAST(json_extract(item.value, '$.rate') AS REAL), 0) AS amount
+    FROM {source}json_each(CASE WHEN json_valid({record}.items) AND json_type({record}.items) = 'array'
+                        THEN {record}.items ELSE '[]' END) AS item
+'''
+
+# 기록의 (현장, 날짜) 에 해당하는 카테고리 행을 만든 뒤 금액/건수를 더하거나 뺌
+# (INSERT ... ON CONFLICT 는 SQLite 3.24 이상에서만 동작하므로 INSERT OR IGNORE + UPDATE 사용)
+_ENSURE_ROWS = '''
+    INSERT OR IGNORE INTO daily_rollups (site_name, date, category, amount, item_count)
+    SELECT DISTINCT site_name, date, category, 0, 0 FROM ({rows});
+'''
+
+_APPLY = '''
+    UPDATE daily_rollups SET (amount, item_count) = (
+        SELECT daily_rollups.amount {sign} SUM(entry.amount), daily_rollups.item_count {sign} COUNT(*)
+        FROM ({rows}) AS entry WHERE entry.category = daily_rollups.category
+    )
+    WHERE site_name = COALESCE({record}.site_name, '') AND date = COALESCE({record}.date, '')
+      AND category IN (SELECT category FROM ({rows}));
+'''
+
+_PRUNE = '''
+    DELETE FROM daily_rollups
+    WHERE site_name = COALESCE(OLD.site_name, '') AND date = COALESCE(OLD.date, '') AND item_count <= 0;
+'''
+
+
+def _item_rows(record, source=''):
+    return _ITEM_ROWS.format(record=record, source=source, uncategorized=UNCATEGORIZED)
+
+
+def create_rollup_triggers(cursor):
+    """daily_records 변경 시 daily_rollups 를 갱신하는 트리거 생성, 처음 생성할 때는 기존 기록으로 채움"""
+    try:
+        cursor.execute("SELECT json_valid('[]')")
+    except sqlite3.OperationalError:
+        raise RuntimeError(
+            f"SQLite {sqlite3.sqlite_version} 에 JSON1 확장이 없어 현장 정산 보고서를 사용할 수 없습니다. "
+            "JSON1 이 포함된 SQLite(3.9 이상)로 빌드된 Python 을 사용하세요."
+        ) from None
+
+    cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name = 'daily_rollups_insert'")
+    exists = cursor.fetchone()[0] > 0
+
+    add = (_ENSURE_ROWS.format(rows=_item_rows('NEW')) +
+           _APPLY.format(sign='+', record='NEW', rows=_item_rows('NEW')))
+    remove = _APPLY.format(sign='-', record='OLD', rows=_item_rows('OLD'))
+    # 트리거 정의가 바뀌어도 기존 데이터베이스에 반영되도록 매번 다시 생성
+    triggers = {
+        'daily_rollups_insert': f'AFTER INSERT ON daily_records BEGIN {add} END',
+        'daily_rollups_delete': f'AFTER DELETE ON daily_records BEGIN {remove} {_PRUNE} END',
+        'daily_rollups_update': f'AFTER UPDATE OF date, site_name, items ON daily_records BEGIN {remove} {_PRUNE} {add} END',
+    }
+    for name, body in triggers.items():
+        cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        cursor.execute(f'CREATE TRIGGER {name} {body}')
+
+    if not exists:
+        rebuild_rollups(cursor)
+
+
+def rebuild_rollups(cursor):
+    """daily_rollups 를 daily_records 전체로 다시 집계"""
+    cursor.execute('DELETE FROM daily_rollups')
+    cursor.execute(f'''
+        INSERT INTO daily_rollups (site_name, date, category, amount, item_count)
+        SELECT site_name, date, category, SUM(amount), COUNT(*)
+        FROM ({_item_rows('record', 'daily_records AS record, ')})
+        GROUP BY site_name, date, category
+    ''')
+
+
+def list_sites(cursor):
+    """현장별 기록 기간과 총 지출"""
+    cursor.execute('''
+        SELECT site_name, MIN(date), MAX(date), SUM(amount)
+        FROM daily_rollups
+        WHERE site_name != ''
+        GROUP BY site_name
+        ORDER BY MAX(date) DESC
+    ''')
+    return [{'site_name': site_name, 'first_date': first, 'last_date': last, 'total': total}
+            for site_name, first, last, total in cursor.fetchall()]
+
+
+def _ratio(actual, estimated):
+    return round(actual / estimated * 100, 1) if estimated else None
+
+
+def site_report(cursor, site_name, start=None, end=None, estimate_id=None):
+    """
+    현장의 기간별 카테고리 지출과 견적서 공종별 금액 비교
+    견적 금액은 항목 금액 합계(부가세 제외)이며, 견적서를 지정하지 않으면 지출만 집계합니다.
+    견적서가 없으면 None 을 반환합니다.
+    """
+    # 기간을 지정하지 않으면 날짜가 비어 있는 기록까지 포함
+    date_from = start or ''
+    date_to = end or '9999-12-31'
+
+    # 월 x 카테고리 합계를 한 번에 읽고 카테고리 합계는 그 결과로 계산
+    cursor.execute('''
+        SELECT substr(date, 1, 7) AS month, category, SUM(amount), SUM(item_count)
+        FROM daily_rollups
+        WHERE site_name = ? AND date BETWEEN ? AND ?
+        GROUP BY month, category
+        ORDER BY month
+    ''', (site_name, date_from, date_to))
+    months = []
+    actual = {}
+    for month, category, amount, count in cursor.fetchall():
+        months.append({'month': month, 'category': category, 'amount': amount})
+        total_amount, total_count = actual.get(category, (0, 0))
+        actual[category] = (total_amount + amount, total_count + count)
+
+    estimate = None
+    estimated = {}
+    if estimate_id is not None:
+        cursor.execute('''
+            SELECT e.id, e.estimate_number, e.estimate_date, e.total, COALESCE(cl.name, '')
+            FROM estimates e
+            LEFT JOIN clients cl ON e.client_id = cl.id
+            WHERE e.id = ?
+        ''', (estimate_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        estimate = dict(zip(('id', 'estimate_number', 'estimate_date', 'total', 'client_name'), row))
+        cursor.execute(f'''
+            SELECT COALESCE(NULLIF(TRIM(category), ''), '{UNCATEGORIZED}'), SUM(total), COUNT(*)
+            FROM estimate_items
+            WHERE estimate_id = ?
+            GROUP BY 1
+        ''', (estimate_id,))
+        estimated = {category: (amount or 0, count) for category, amount, count in cursor.fetchall()}
+
+    # 견적서 공종 순서(금액 큰 순) 다음에 견적에 없는 지출 카테고리
+    categories = sorted(estimated, key=lambda category: -estimated[category][0])
+    categories += sorted(category for category in actual if category not in estimated)
+    rows = []
+    for category in categories:
+        estimated_amount, estimate_items = estimated.get(category, (0, 0))
+        actual_amount, receipt_items = actual.get(category, (0, 0))
+        rows.append({
+            'category': category,
+            'estimated': estimated_amount,
+            'actual': actual_amount,
+            'difference': estimated_amount - actual_amount,
+            'ratio': _ratio(actual_amount, estimated_amount),
+            'estimate_items': estimate_items,
+            'receipt_items': receipt_items,
+        })
+
+    total_estimated = sum(row['estimated'] for row in rows)
+    total_actual = sum(row['actual'] for row in rows)
+    return {
+        'site_name': site_name,
+        'start': start or None,
+        'end': end or None,
+        'estimate': estimate,
+        'categories': rows,
+        'months': months,
+        'totals': {
+            'estimated': total_estimated,
+            'actual': total_actual,
+            'difference': total_estimated - total_actual,
+            'ratio': _ratio(total_actual, total_estimated),
+        },
+    }
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+견적서 수정 이력
+estimates / estimate_items 테이블에는 항상 최신본을 유지하고, 수정할 때마다
+바뀐 헤더 필드와 바뀐 항목 행만 estimate_revisions 에 저장합니다.
+최신본 조회는 기존과 같이 항목 수에 비례하고, 이전 버전은 최신본에서
+변경분을 역순으로 되돌려 복원합니다.
+
+revision 1은 최초 저장본이며, 수정할 때마다 2, 3, ... 으로 증가합니다.
+"""
+
+import json
+
+from schemas import parse_number
+
+ITEM_COLUMNS = ['id', 'estimate_id', 'category', 'name', 'spec', 'quantity', 'price', 'total', 'note', 'created_at']
+ITEM_FIELDS = ('category', 'name', 'spec', 'quantity', 'price', 'total', 'note')
+HEADER_FIELDS = ('estimate_number', 'estimate_date', 'valid_until', 'company_id', 'client_id', 'bank_id',
+                 'subtotal', 'tax', 'total')
+NUMERIC_FIELDS = ('quantity', 'price', 'total', 'subtotal', 'tax')
+COMPANY_FIELDS = ('name', 'business_number', 'address', 'ceo', 'type', 'item', 'phone', 'fax', 'manager')
+CLIENT_FIELDS = ('type', 'name', 'business_number', 'address', 'ceo', 'phone', 'manager')
+
+
+class RevisionError(ValueError):
+    """수정 요청 내용이 올바르지 않을 때 발생"""
+
+
+def _amount(value):
+    """합계 계산용 숫자 (이전에 문자열로 저장된 "1,000" 포함, 숫자가 아니면 0)"""
+    try:
+        return parse_number(value) or 0
+    except ValueError:
+        return 0
+
+
+def _same(field, old, new):
+    if field in NUMERIC_FIELDS:
+        try:
+            return float(parse_number(old) or 0) == float(parse_number(new) or 0)
+        except (TypeError, ValueError):
+            return False
+    return (old if old is not None else '') == (new if new is not None else '')
+
+
+def latest_revision(cursor, estimate_id):
+    cursor.execute('SELECT MAX(revision) FROM estimate_revisions WHERE estimate_id = ?', (estimate_id,))
+    row = cursor.fetchone()
+    return row[0] if row and row[0] else 1
+
+
+def load_header(cursor, estimate_id):
+    cursor.execute(f'SELECT {", ".join(HEADER_FIELDS)} FROM estimates WHERE id = ?', (estimate_id,))
+    row = cursor.fetchone()
+    return dict(zip(HEADER_FIELDS, row)) if row else None
+
+
+def load_items(cursor, estimate_id):
+    cursor.execute('SELECT * FROM estimate_items WHERE estimate_id = ? ORDER BY id', (estimate_id,))
+    return [dict(zip(ITEM_COLUMNS, item)) for item in cursor.fetchall()]
+
+
+def rebuild(cursor, estimate_id, revision):
+    """
+    지정한 버전의 (헤더, 항목 목록) 반환
+    최신본에서 revision 이후의 변경분만 되돌리므로 비용은 O(항목 수 + 되돌린 변경 수)
+    """
+    header = load_header(cursor, estimate_id)
+    if header is None:
+        return None, None
+    items = {item['id']: item for item in load_items(cursor, estimate_id)}
+
+    cursor.execute('''
+        SELECT header_changes, item_changes FROM estimate_revisions
+        WHERE estimate_id = ? AND revision > ?
+        ORDER BY revision DESC
+    ''', (estimate_id, revision))
+    for header_changes, item_changes in cursor.fetchall():
+        for field, (old, _) in json.loads(header_changes or '{}').items():
+            header[field] = old
+        for change in json.loads(item_changes or '[]'):
+            if change['op'] == 'add':
+                items.pop(change['id'], None)
+            else:
+                items[change['id']] = change['old']
+
+    return header, [items[item_id] for item_id in sorted(items)]
+
+
+def list_revisions(cursor, estimate_id):
+    cursor.execute('''
+        SELECT revision, header_changes, item_changes, created_at FROM estimate_revisions
+        WHERE estimate_id = ? ORDER BY revision
+    ''', (estimate_id,))
+    result = []
+    for revision, header_changes, item_changes, created_at in cursor.fetchall():
+        changes = json.loads(item_changes or '[]')
+        result.append({
+            'revision': revision,
+            'changed_fields': sorted(json.loads(header_changes or '{}')),
+            'added_items': sum(1 for change in changes if change['op'] == 'add'),
+            'updated_items': sum(1 for change in changes if change['op'] == 'update'),
+            'deleted_items': sum(1 for change in changes if change['op'] == 'delete'),
+            'created_at': created_at,
+        })
+    return result
+
+
+def _item_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise RevisionError(f"항목 ID가 올바르지 않습니다: {value}")
+
+
+def _field_value(field, value):
+    # 스키마가 허용하는 숫자 문자열("2,000")은 숫자로 저장
+    return parse_number(value) if field in NUMERIC_FIELDS else value
+
+
+def _item_values(item):
+    return {field: _field_value(field, item.get(field, 0 if field in NUMERIC_FIELDS else ''))
+            for field in ITEM_FIELDS}
+
+
+def diff_items(current_items, new_items):
+    """
+    새 항목 목록과 현재 항목을 비교하여 변경 목록 반환
+    항목에 id가 있으면 id로 비교하고(id 없는 항목은 추가, 빠진 id는 삭제),
+    id가 하나도 없으면 순서대로 비교합니다.
+    """
+    current = {item['id']: item for item in current_items}
+    changes = []
+
+    if any(item.get('id') is not None for item in new_items):
+        pairs = []
+        seen = set()
+        for item in new_items:
+            if item.get('id') is None:
+                pairs.append((None, item))
+                continue
+            item_id = _item_id(item['id'])
+            if item_id not in current or item_id in seen:
+                raise RevisionError(f"이 견적서의 항목이 아닙니다: {item_id}")
+            seen.add(item_id)
+            pairs.append((current[item_id], item))
+        removed = [item for item_id, item in current.items() if item_id not in seen]
+    else:
+        ordered = [current[item_id] for item_id in sorted(current)]
+        pairs = list(zip(ordered, new_items))
+        pairs += [(None, item) for item in new_items[len(ordered):]]
+        removed = ordered[len(new_items):]
+
+    for old, new in pairs:
+        values = _item_values(new)
+        if old is None:
+            changes.append({'op': 'add', 'new': values})
+        elif not all(_same(field, old[field], values[field]) for field in ITEM_FIELDS):
+            changes.append({'op': 'update', 'id': old['id'], 'old': old, 'new': values})
+    for old in removed:
+        changes.append({'op': 'delete', 'id': old['id'], 'old': old})
+    return changes
+
+
+def client_phone(client):
+    """견적서 요청의 고객 연락처 (화면은 phone, 고객 관리 API 는 contact 로 보냄)"""
+    return client.get('phone') or client.get('contact') or ''
+
+
+def _resolve_party(cursor, table, fields, current_id, data):
+    """회사/고객 정보가 바뀐 경우에만 새 행을 추가하고 ID 반환 (이전 버전이 참조하는 행은 유지)"""
+    values = {field: data.get(field, '') for field in fields}
+    if table == 'clients':
+        values['type'] = data.get('type', 'business')
+        values['phone'] = client_phone(data)
+
+    if current_id is not None:
+        cursor.execute(f'SELECT {", ".join(fields)} FROM {table} WHERE id = ?', (current_id,))
+        row = cursor.fetchone()
+        if row and all(_same(field, old, values[field]) for field, old in zip(fields, row)):
+            return current_id
+
+    cursor.execute(f'''
+        INSERT INTO {table} ({", ".join(fields)})
+        VALUES ({", ".join('?' for _ in fields)})
+    ''', [values[field] for field in fields])
+    return cursor.lastrowid
+
+
+def save_revision(conn, estimate_id, data, partial=False):
+    """
+    견적서를 수정하고 (새 버전 번호, 변경 여부)를 반환, 견적서가 없으면 (None, False)
+    헤더 필드는 요청에 포함된 것만 변경하며, partial=True(PATCH)이면 항목 목록도 생략할 수 있습니다.
+    항목은 items(전체 목록 비교) 또는 item_changes({"add": [...], "update": [...], "delete": [id, ...]})로 지정합니다.
+    """
+    cursor = conn.cursor()
+    # 동시에 같은 견적서를 수정해도 버전 번호가 겹치지 않도록 처음부터 쓰기 잠금
+    cursor.execute('BEGIN IMMEDIATE')
+    try:
+        return _save_revision(conn, cursor, estimate_id, data, partial)
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def _save_revision(conn, cursor, estimate_id, data, partial):
+    header = load_header(cursor, estimate_id)
+    if header is None:
+        conn.rollback()
+        return None, False
+    current_items = load_items(cursor, estimate_id)
+
+    # 항목 변경분 계산
+    if 'items' in data:
+        item_changes = diff_items(current_items, data.get('items') or [])
+    elif 'item_changes' in data:
+        current = {item['id']: item for item in current_items}
+        requested = data['item_changes'] or {}
+        item_changes = [{'op': 'add', 'new': _item_values(item)} for item in requested.get('add', [])]
+        for item in requested.get('update', []):
+            old = current.get(_item_id(item.get('id')))
+            if old is None:
+                raise RevisionError(f"이 견적서의 항목이 아닙니다: {item.get('id')}")
+            values = dict({field: old[field] for field in ITEM_FIELDS},
+                          **{field: _field_value(field, item[field]) for field in ITEM_FIELDS if field in item})
+            if not all(_same(field, old[field], values[field]) for field in ITEM_FIELDS):
+                item_changes.append({'op': 'update', 'id': old['id'], 'old': old, 'new': values})
+        for item_id in map(_item_id, requested.get('delete', [])):
+            if item_id not in current:
+                raise RevisionError(f"이 견적서의 항목이 아닙니다: {item_id}")
+            item_changes.append({'op': 'delete', 'id': item_id, 'old': current[item_id]})
+    elif partial:
+        item_changes = []
+    else:
+        raise RevisionError("견적 항목(items)이 필요합니다")
+
+    # 헤더 변경분 계산
+    new_header = dict(header)
+    # PUT 도 요청에 없는 헤더 필드는 현재 값을 유지 (빠진 필드를 빈 값으로 덮어쓰지 않음)
+    for field in ('estimate_number', 'estimate_date', 'valid_until', 'bank_id', 'company_id', 'client_id'):
+        if field in data:
+            new_header[field] = data[field]
+    if data.get('company'):
+        new_header['company_id'] = _resolve_party(cursor, 'companies', COMPANY_FIELDS,
+                                                  new_header['company_id'], data['company'])
+    if data.get('client'):
+        new_header['client_id'] = _resolve_party(cursor, 'clients', CLIENT_FIELDS,
+                                                 new_header['client_id'], data['client'])
+
+    if any(field in data for field in ('subtotal', 'tax', 'total')):
+        for field in ('subtotal', 'tax', 'total'):
+            new_header[field] = parse_number(data[field]) if field in data else header[field]
+    elif item_changes:
+        # 합계가 전달되지 않으면 항목 변경을 반영해 다시 계산
+        subtotal = _amount(header['subtotal'])
+        for change in item_changes:
+            subtotal += _amount((change.get('new') or {}).get('total'))
+            subtotal -= _amount((change.get('old') or {}).get('total'))
+        tax = round(subtotal * 0.1) if header['tax'] else 0
+        new_header.update(subtotal=subtotal, tax=tax, total=subtotal + tax)
+
+    header_changes = {field: [header[field], new_header[field]] for field in HEADER_FIELDS
+                      if not _same(field, header[field], new_header[field])}
+    if not header_changes and not item_changes:
+        revision = latest_revision(cursor, estimate_id)
+        conn.rollback()
+        return revision, False
+
+    # 최신본 갱신: 바뀐 필드/항목 행만 기록
+    if header_changes:
+        assignments = ', '.join(f'{field} = ?' for field in header_changes)
+        cursor.execute(f'UPDATE estimates SET {assignments}, items = NULL WHERE id = ?',
+                       [new for _, new in header_changes.values()] + [estimate_id])
+    elif item_changes:
+        # 항목 JSON 사본은 더 이상 최신이 아니므로 estimate_items 를 기준으로 사용
+        cursor.execute('UPDATE estimates SET items = NULL WHERE id = ?', (estimate_id,))
+
+    for change in item_changes:
+        new = change.get('new')
+        if change['op'] == 'add':
+            cursor.execute('''
+                INSERT INTO estimate_items (estimate_id, category, name, spec, quantity, price, total, note)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [estimate_id] + [new[field] for field in ITEM_FIELDS])
+            change['id'] = cursor.lastrowid
+        elif change['op'] == 'update':
+            cursor.execute(f'''
+                UPDATE estimate_items SET {", ".join(f"{field} = ?" for field in ITEM_FIELDS)}
+                WHERE id = ?
+            ''', [new[field] for field in ITEM_FIELDS] + [change['id']])
+        else:
+            cursor.execute('DELETE FROM estimate_items WHERE id = ?', (change['id'],))
+
+    # 되돌리기에 필요한 정보만 남김 (추가: id, 수정/삭제: 이전 행)
+    stored_changes = [{key: change[key] for key in ('op', 'id', 'old') if key in change} for change in item_changes]
+    revision = latest_revision(cursor, estimate_id) + 1
+    cursor.execute('''
+        INSERT INTO estimate_revisions (estimate_id, revision, header_changes, item_changes)
+        VALUES (?, ?, ?, ?)
+    ''', (
+        estimate_id,
+        revision,
+        json.dumps(header_changes, ensure_ascii=False),
+        json.dumps(stored_changes, ensure_ascii=False)
+    ))
+    conn.commit()
+    return revision, True
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+요청 데이터 스키마
+견적서/영수증 기록/회사/고객/은행 계좌 요청 본문의 형식을 DB 저장이나 엑셀 생성 전에 검사합니다.
+스키마는 모듈을 불러올 때 한 번 검사 함수(클로저)로 변환되므로 요청마다 해석하지 않습니다.
+"""
+
+import re
+
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+# 금액/수량 범위 (엑셀과 SQLite REAL 에서 정밀도가 유지되는 범위)
+MAX_NUMBER = 1e15
+
+ESTIMATE_MAX_ITEMS = 1000
+DAILY_MAX_ITEMS = 500
+
+
+class ValidationError(ValueError):
+    """요청 데이터가 스키마와 맞지 않을 때 발생 (path: 문제가 된 필드 위치)"""
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+        self.path = []
+
+    def __str__(self):
+        if not self.path:
+            return self.message
+        location = ''.join(f'[{key}]' if isinstance(key, int) else f'.{key}' for key in self.path).lstrip('.')
+        return f"{location}: {self.message}"
+
+
+# ---------------------------------------------------------------------------
+# 필드 정의
+# ---------------------------------------------------------------------------
+
+class Text:
+    def __init__(self, max_length=200):
+        self.max_length = max_length
+
+    def compile(self):
+        max_length = self.max_length
+
+        def check(value):
+            if value is None:
+                return
+            if type(value) is not str:
+                raise ValidationError("문자열이어야 합니다")
+            if len(value) > max_length:
+                raise ValidationError(f"{max_length}자 이하여야 합니다")
+        return check
+
+
+def parse_number(value):
+    """숫자 또는 숫자 문자열("1,000")을 숫자로 변환 (None 은 그대로), 숫자가 아니면 ValidationError"""
+    kind = type(value)
+    if value is None or kind is int or kind is float:
+        return value
+    if kind is str:
+        # 숫자 문자열은 기존 API와 같이 허용
+        try:
+            number = float(value.replace(',', ''))
+        except ValueError:
+            raise ValidationError("숫자여야 합니다") from None
+        return int(number) if number.is_integer() else number
+    raise ValidationError("숫자여야 합니다")
+
+
+class Number:
+    def compile(self):
+        def check(value):
+            if value is None:
+                return
+            value = parse_number(value)
+            if not -MAX_NUMBER <= value <= MAX_NUMBER:
+                raise ValidationError("허용 범위를 벗어난 숫자입니다")
+        return check
+
+
+class Integer:
+    def compile(self):
+        def check(value):
+            if value is not None and type(value) is not int:
+                raise ValidationError("정수여야 합니다")
+        return check
+
+
+class Boolean:
+    def compile(self):
+        def check(value):
+            if value is not None and type(value) is not bool:
+                raise ValidationError("true 또는 false 여야 합니다")
+        return check
+
+
+class Date:
+    def compile(self):
+        match = DATE_PATTERN.match
+
+        def check(value):
+            if value is None or value == '':
+                return
+            if type(value) is not str or not match(value):
+                raise ValidationError("날짜는 YYYY-MM-DD 형식이어야 합니다")
+        return check
+
+
+class List:
+    def __init__(self, item, max_items):
+        self.item = item
+        self.max_items = max_items
+
+    def compile(self):
+        check_item = self.item.compile()
+        max_items = self.max_items
+
+        def check(value):
+            if value is None:
+                return
+            if type(value) is not list:
+                raise ValidationError("목록이어야 합니다")
+            if len(value) > max_items:
+                raise ValidationError(f"최대 {max_items}개까지 입력할 수 있습니다")
+            for index, item in enumerate(value):
+                try:
+                    check_item(item)
+                except ValidationError as e:
+                    e.path.insert(0, index)
+                    raise
+        return check
+
+
+class Object:
+    """dict 검사: 정의된 필드만 검사하고 정의되지 않은 필드는 무시 (화면에서 보내는 부가 값 허용)"""
+
+    def __init__(self, fields, required=(), nullable=True):
+        self.fields = fields
+        self.required = tuple(required)
+        self.nullable = nullable
+
+    def compile(self):
+        checks = tuple((key, field.compile()) for key, field in self.fields.items())
+        required = self.required
+        nullable = self.nullable
+
+        def check(value):
+            if value is None and nullable:
+                return
+            if type(value) is not dict:
+                raise ValidationError("객체여야 합니다")
+            for key in required:
+                if value.get(key) in (None, ''):
+                    error = ValidationError("필수 항목입니다")
+                    error.path.append(key)
+                    raise error
+            for key, check_field in checks:
+                if key in value:
+                    try:
+                        check_field(value[key])
+                    except ValidationError as e:
+                        e.path.insert(0, key)
+                        raise
+        return check
+
+
+# ---------------------------------------------------------------------------
+# 요청 스키마
+# ---------------------------------------------------------------------------
+
+COMPANY_FIELDS = {
+    'name': Text(200),
+    'business_number': Text(20),
+    'address': Text(500),
+    'ceo': Text(100),
+    'type': Text(100),
+    'item': Text(100),
+    'phone': Text(50),
+    'fax': Text(50),
+    'manager': Text(100),
+}
+
+CLIENT_FIELDS = {
+    'type': Text(20),
+    'name': Text(200),
+    'business_number': Text(20),
+    'address': Text(500),
+    'ceo': Text(100),
+    'contact': Text(50),
+    'phone': Text(50),
+    'manager': Text(100),
+}
+
+BANK_ACCOUNT_FIELDS = {
+    'bank_name': Text(100),
+    'account_number': Text(50),
+    'account_holder': Text(100),
+}
+
+ESTIMATE_ITEM = Object({
+    'id': Integer(),
+    'category': Text(100),
+    'name': Text(200),
+    'spec': Text(200),
+    'unit': Text(20),
+    'quantity': Number(),
+    'price': Number(),
+    'total': Number(),
+    'note': Text(1000),
+}, nullable=False)
+
+ESTIMATE_FIELDS = {
+    'estimate_number': Text(50),
+    'estimate_date': Date(),
+    'valid_until': Date(),
+    'company_id': Integer(),
+    'client_id': Integer(),
+    'bank_id': Integer(),
+    'company': Object(COMPANY_FIELDS),
+    'client': Object(CLIENT_FIELDS),
+    'items': List(ESTIMATE_ITEM, ESTIMATE_MAX_ITEMS),
+    'item_changes': Object({
+        'add': List(ESTIMATE_ITEM, ESTIMATE_MAX_ITEMS),
+        'update': List(Object(ESTIMATE_ITEM.fields, required=('id',), nullable=False), ESTIMATE_MAX_ITEMS),
+        'delete': List(Integer(), ESTIMATE_MAX_ITEMS),
+    }),
+    'subtotal': Number(),
+    'tax': Number(),
+    'total': Number(),
+    'includeTax': Boolean(),
+}
+
+DAILY_ITEM = Object({
+    'category': Text(100),
+    'content': Text(500),
+    'rate': Number(),
+    'amount': Number(),
+    'note': Text(1000),
+}, nullable=False)
+
+DAILY_RECORD_FIELDS = {
+    'daily_date': Date(),
+    'date': Date(),
+    'site_name': Text(200),
+    'total_amount': Number(),
+    'total': Number(),
+    'items': List(DAILY_ITEM, DAILY_MAX_ITEMS),
+}
+
+SCHEMA_DEFINITIONS = {
+    'company': Object(COMPANY_FIELDS, required=('name',), nullable=False),
+    'client': Object(CLIENT_FIELDS, required=('name',), nullable=False),
+    'bank_account': Object(BANK_ACCOUNT_FIELDS, required=('bank_name', 'account_number'), nullable=False),
+    'estimate': Object(ESTIMATE_FIELDS, required=('estimate_number',), nullable=False),
+    # 수정(PUT/PATCH)과 엑셀 내보내기는 일부 필드만 보낼 수 있음
+    'estimate_revision': Object(ESTIMATE_FIELDS, nullable=False),
+    'estimate_export': Object(ESTIMATE_FIELDS, nullable=False),
+    'daily_record': Object(DAILY_RECORD_FIELDS, required=('site_name',), nullable=False),
+    'daily_export': Object(DAILY_RECORD_FIELDS, nullable=False),
+}
+
+# 시작 시 한 번 검사 함수로 변환
+SCHEMAS = {name: schema.compile() for name, schema in SCHEMA_DEFINITIONS.items()}
+
+
+def validate(name, data):
+    """data 가 스키마와 맞지 않으면 ValidationError 발생"""
+    SCHEMAS[name](data)
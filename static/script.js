@@ -530,6 +530,10 @@ async function deleteSelectedRecord() {
     }
 }
 
+// 불러온 견적서 (같은 견적번호로 다시 저장하면 새 버전으로 수정)
+let loadedEstimateId = null;
+let loadedEstimateNumber = null;
+
 // 견적서 불러오기 (백엔드 API 사용)
 async function loadEstimateFromDB(estimateId) {
     try {
@@ -539,6 +543,8 @@ async function loadEstimateFromDB(estimateId) {
         }
         
         const estimate = await response.json();
+        loadedEstimateId = estimate.id;
+        loadedEstimateNumber = estimate.estimate_number;
         document.getElementById('estimate-number').value = estimate.estimate_number || '';
         document.getElementById('estimate-date').value = estimate.estimate_date || '';
         document.getElementById('valid-until').value = estimate.valid_until || '';
@@ -578,6 +584,11 @@ async function loadEstimateFromDB(estimateId) {
                 
                 tbody.appendChild(newRow);
                 
+                // 수정 저장 시 변경된 항목만 보내도록 항목 ID 보관
+                if (item.id) {
+                    newRow.dataset.itemId = item.id;
+                }
+                
                 // 데이터 설정
                 newRow.querySelector('.item-category').value = item.category || '';
                 newRow.querySelector('.item-name').value = item.name || '';
@@ -963,6 +974,8 @@ document.addEventListener('DOMContentLoaded', async function() {
             await loadCompanyDropdown();
             await loadClientDropdown();
             await loadBankDropdown();
+            // 현장 정산 보고서 조회 조건 초기화
+            await loadSiteReportOptions();
         } catch (error) {
             console.error('데이터베이스 초기화 실패:', error);
         }
@@ -1068,6 +1081,7 @@ function addEventListeners() {
 function addEstimateRow() {
     const tbody = document.querySelector('#estimate-items tbody');
     const newRow = tbody.rows[0].cloneNode(true);
+    delete newRow.dataset.itemId;
     
     // 입력값 초기화
     newRow.querySelectorAll('input').forEach(input => {
@@ -2399,6 +2413,7 @@ function collectEstimateData() {
         if (name && quantity > 0 && price > 0) {
             const specParts = spec ? spec.split('/') : ['', 'EA'];
             items.push({
+                id: row.dataset.itemId ? Number(row.dataset.itemId) : undefined,
                 category: category,
                 name: name,
                 spec: specParts[0] || '',
@@ -2452,9 +2467,13 @@ async function saveEstimateToDB() {
         return;
     }
     
+    // 불러온 견적서를 같은 견적번호로 저장하면 새 견적서 대신 수정 버전으로 저장
+    const isRevision = loadedEstimateId !== null && estimateData.estimate_number === loadedEstimateNumber;
+    const items = isRevision ? estimateData.items : estimateData.items.map(({ id, ...item }) => item);
+    
     try {
-        const response = await fetch('/api/estimates', {
-            method: 'POST',
+        const response = await fetch(isRevision ? `/api/estimates/${loadedEstimateId}` : '/api/estimates', {
+            method: isRevision ? 'PUT' : 'POST',
             headers: {
                 'Content-Type': 'application/json',
             },
@@ -2465,7 +2484,7 @@ async function saveEstimateToDB() {
                 subtotal: estimateData.subtotal,
                 tax: estimateData.tax,
                 total: estimateData.total,
-                items: estimateData.items,
+                items: items,
                 company: estimateData.company,
                 client: estimateData.client
             })
@@ -2481,9 +2500,16 @@ async function saveEstimateToDB() {
         // 드롭다운 새로고침
         await loadEstimateDropdown();
         
-        // 견적번호 새로 생성
-        const newEstimateNumber = await generateEstimateNumber();
-        document.getElementById('estimate-number').value = newEstimateNumber;
+        if (isRevision) {
+            // 새로 추가된 항목의 ID를 반영하기 위해 최신본을 다시 불러옴
+            await loadEstimateFromDB(loadedEstimateId);
+        } else {
+            // 견적번호 새로 생성
+            loadedEstimateId = null;
+            loadedEstimateNumber = null;
+            const newEstimateNumber = await generateEstimateNumber();
+            document.getElementById('estimate-number').value = newEstimateNumber;
+        }
         
     } catch (error) {
         console.error('Save estimate error:', error);
@@ -2651,6 +2677,148 @@ function exportDailyToExcel() {
     });
 }
 
+// 현장 정산 보고서 조회 조건 (현장 목록, 비교 견적서 목록)
+async function loadSiteReportOptions() {
+    try {
+        const [sitesResponse, estimatesResponse] = await Promise.all([
+            fetch('/api/reports/sites'),
+            fetch('/api/estimates')
+        ]);
+        if (!sitesResponse.ok || !estimatesResponse.ok) {
+            throw new Error('보고서 조회 조건을 불러오지 못했습니다.');
+        }
+        
+        const sites = (await sitesResponse.json()).data || [];
+        const siteList = document.getElementById('report-site-list');
+        siteList.innerHTML = '';
+        sites.forEach(site => {
+            const option = document.createElement('option');
+            option.value = site.site_name;
+            option.textContent = `${site.first_date} ~ ${site.last_date}`;
+            siteList.appendChild(option);
+        });
+        
+        const estimates = await estimatesResponse.json();
+        const select = document.getElementById('report-estimate');
+        select.innerHTML = '<option value="">견적서 선택 안 함</option>';
+        estimates.forEach(estimate => {
+            const option = document.createElement('option');
+            option.value = estimate.id;
+            option.textContent = `${estimate.estimate_number} (${estimate.estimate_date}) - ${estimate.client_name || ''}`;
+            select.appendChild(option);
+        });
+    } catch (error) {
+        console.error('Load report options error:', error);
+    }
+}
+
+// 현장 정산 보고서 조회 쿼리 문자열
+function getSiteReportQuery() {
+    const siteName = document.getElementById('report-site-name').value.trim();
+    if (!siteName) {
+        alert('현장명을 입력해주세요.');
+        return null;
+    }
+    
+    const params = new URLSearchParams({ site_name: siteName });
+    const start = document.getElementById('report-start').value;
+    const end = document.getElementById('report-end').value;
+    const estimateId = document.getElementById('report-estimate').value;
+    if (start) params.append('start', start);
+    if (end) params.append('end', end);
+    if (estimateId) params.append('estimate_id', estimateId);
+    return params.toString();
+}
+
+// 현장 정산 보고서 조회
+async function loadSiteReport() {
+    const query = getSiteReportQuery();
+    if (!query) return;
+    
+    try {
+        const response = await fetch(`/api/reports/site?${query}`);
+        const result = await response.json();
+        if (!response.ok) {
+            throw new Error(result.message || '보고서 조회에 실패했습니다.');
+        }
+        renderSiteReport(result.data);
+    } catch (error) {
+        console.error('Site report error:', error);
+        alert(error.message);
+    }
+}
+
+// 현장 정산 보고서 표 출력
+function renderSiteReport(report) {
+    const tbody = document.querySelector('#site-report-table tbody');
+    tbody.innerHTML = '';
+    
+    const addRow = (cells, className) => {
+        const tr = document.createElement('tr');
+        if (className) tr.className = className;
+        cells.forEach(value => {
+            const td = document.createElement('td');
+            td.textContent = value;
+            tr.appendChild(td);
+        });
+        tbody.appendChild(tr);
+    };
+    const ratio = value => value === null ? '-' : `${value}%`;
+    
+    if (report.categories.length === 0) {
+        addRow(['해당 기간의 기록이 없습니다.']);
+        tbody.rows[0].cells[0].colSpan = 5;
+        return;
+    }
+    
+    report.categories.forEach(item => {
+        addRow([
+            item.category,
+            formatNumber(item.estimated) + '원',
+            formatNumber(item.actual) + '원',
+            formatNumber(item.difference) + '원',
+            ratio(item.ratio)
+        ], item.difference < 0 ? 'over-budget' : '');
+    });
+    
+    const totals = report.totals;
+    addRow([
+        '합계',
+        formatNumber(totals.estimated) + '원',
+        formatNumber(totals.actual) + '원',
+        formatNumber(totals.difference) + '원',
+        ratio(totals.ratio)
+    ], 'report-total-row');
+}
+
+// 현장 정산 보고서 엑셀 내보내기
+async function exportSiteReportToExcel() {
+    const query = getSiteReportQuery();
+    if (!query) return;
+    
+    try {
+        const response = await fetch(`/api/reports/site/excel?${query}`);
+        if (!response.ok) {
+            const result = await response.json().catch(() => ({}));
+            throw new Error(result.message || '엑셀 생성 중 오류가 발생했습니다.');
+        }
+        
+        const blob = await response.blob();
+        const url = window.URL.createObjectURL(blob);
+        const a = document.createElement('a');
+        const siteName = document.getElementById('report-site-name').value.trim();
+        a.href = url;
+        a.download = `${siteName}_정산보고서.xlsx`;
+        document.body.appendChild(a);
+        a.click();
+        document.body.removeChild(a);
+        window.URL.revokeObjectURL(url);
+    } catch (error) {
+        console.error('Error:', error);
+        alert(error.message);
+    }
+}
+
 // 영수증 기록 데이터 수집 함수
 function collectDailyData() {
     const dailyDate = document.getElementById('daily-date').value;
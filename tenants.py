@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+다중 지점(테넌트) 데이터베이스
+ESTIMATE_TENANT_DIR 을 지정하면 지점마다 별도의 SQLite 파일(<지점>.db)을 사용하여
+한 지점의 대량 저장이 다른 지점의 쓰기 잠금을 막지 않도록 합니다.
+요청의 지점은 헤더(기본 X-Tenant) 또는 서브도메인(<지점>.ESTIMATE_TENANT_DOMAIN)으로 정합니다.
+
+명령줄:
+  python tenants.py split estimate.db tenants/   # 기존 데이터베이스를 회사별로 분리
+  python tenants.py create <지점>                 # 빈 지점 데이터베이스 생성
+  python tenants.py list                          # 지점 목록
+  python tenants.py query "SELECT ..."            # 모든 지점에 읽기 전용 조회
+"""
+
+import argparse
+import json
+import os
+import re
+import secrets
+import sqlite3
+import sys
+import threading
+
+from flask import g, jsonify, request
+
+TENANT_DIR = os.environ.get('ESTIMATE_TENANT_DIR', '')
+TENANT_HEADER = os.environ.get('ESTIMATE_TENANT_HEADER', 'X-Tenant')
+TENANT_DOMAIN = os.environ.get('ESTIMATE_TENANT_DOMAIN', '').lower().strip('.')
+DEFAULT_TENANT = os.environ.get('ESTIMATE_DEFAULT_TENANT', '')
+ADMIN_TOKEN = os.environ.get('ESTIMATE_ADMIN_TOKEN', '')
+ADMIN_HEADER = 'X-Admin-Token'
+
+# 파일 이름으로 쓰이므로 경로 문자가 들어갈 수 없는 이름만 허용
+TENANT_NAME = re.compile(r'^[a-z0-9][a-z0-9_-]{0,62}$')
+# 단일 데이터베이스 모드에서 관리자 조회 시 사용하는 이름
+SINGLE_TENANT = 'default'
+
+_initialized = set()
+_initialized_lock = threading.Lock()
+
+
+def enabled():
+    return bool(TENANT_DIR)
+
+
+def tenant_path(name, tenant_dir=None):
+    """지점 이름을 데이터베이스 경로로 변환, 이름이 올바르지 않으면 None"""
+    if not name or not TENANT_NAME.match(name):
+        return None
+    return os.path.join(tenant_dir or TENANT_DIR, f'{name}.db')
+
+
+def list_tenants(tenant_dir=None):
+    """{지점 이름: 데이터베이스 경로}, 단일 데이터베이스 모드이면 기본 데이터베이스 하나"""
+    tenant_dir = tenant_dir or TENANT_DIR
+    if not tenant_dir:
+        import db
+        return {SINGLE_TENANT: db.DB_PATH}
+    if not os.path.isdir(tenant_dir):
+        return {}
+    tenants = {}
+    for filename in sorted(os.listdir(tenant_dir)):
+        name, ext = os.path.splitext(filename)
+        if ext == '.db' and TENANT_NAME.match(name):
+            tenants[name] = os.path.join(tenant_dir, filename)
+    return tenants
+
+
+def resolve_tenant():
+    """요청 헤더 > 서브도메인 > 기본 지점 순으로 지점 이름 결정"""
+    name = request.headers.get(TENANT_HEADER, '').strip().lower()
+    if not name and TENANT_DOMAIN:
+        host = request.host.split(':')[0].lower()
+        if host.endswith('.' + TENANT_DOMAIN):
+            name = host[:-len(TENANT_DOMAIN) - 1]
+    return name or DEFAULT_TENANT
+
+
+def check_admin_token(token):
+    """관리자 토큰 확인 (ESTIMATE_ADMIN_TOKEN 이 없으면 관리자 조회 비활성화)"""
+    return bool(ADMIN_TOKEN) and secrets.compare_digest(token or '', ADMIN_TOKEN)
+
+
+def _error(message, status_code, error_code):
+    return jsonify({'success': False, 'message': message, 'error_code': error_code}), status_code
+
+
+def init_app(app, init_schema):
+    """
+    /api 요청마다 지점 데이터베이스를 g.db_path 에 지정
+    init_schema(path)는 워커마다 지점별로 처음 한 번 실행하여 새 테이블을 반영합니다.
+    """
+    if not enabled():
+        return
+
+    @app.before_request
+    def route_tenant():
+        # 화면/정적 파일과 지점 전체를 조회하는 관리자 API는 지점이 필요 없음
+        if not request.path.startswith('/api/') or request.path.startswith('/api/admin/'):
+            return None
+        name = resolve_tenant()
+        path = tenant_path(name)
+        if path is None:
+            return _error("지점이 지정되지 않았거나 이름이 올바르지 않습니다", 400, "TENANT_REQUIRED")
+        if not os.path.exists(path):
+            return _error(f"등록되지 않은 지점입니다: {name}", 404, "TENANT_NOT_FOUND")
+
+        if path not in _initialized:
+            with _initialized_lock:
+                if path not in _initialized:
+                    init_schema(path)
+                    _initialized.add(path)
+        g.tenant = name
+        g.db_path = path
+        return None
+
+
+def query_tenants(sql, params=(), names=None, tenant_dir=None):
+    """
+    모든 지점(또는 names)에 같은 조회를 실행하여 tenant 키를 붙인 행 목록 반환
+    관리자 조회는 읽기 전용으로 연결하므로 지점 데이터를 변경할 수 없습니다.
+    """
+    tenants = list_tenants(tenant_dir)
+    rows = []
+    for name, path in tenants.items():
+        if names and name not in names:
+            continue
+        conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        try:
+            cursor = conn.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            rows.extend(dict(zip(columns, row), tenant=name) for row in cursor.fetchall())
+        finally:
+            conn.close()
+    return rows
+
+
+def _columns(conn, schema, table):
+    return [row[1] for row in conn.execute(f'PRAGMA {schema}.table_info({table})')]
+
+
+def _copy(conn, table, where, params=()):
+    """원본(src)의 행을 같은 ID로 지점 데이터베이스에 복사"""
+    columns = [column for column in _columns(conn, 'src', table) if column in _columns(conn, 'main', table)]
+    column_list = ', '.join(columns)
+    cursor = conn.execute(f'''
+        INSERT OR IGNORE INTO main.{table} ({column_list})
+        SELECT {column_list} FROM src.{table} WHERE {where}
+    ''', params)
+    return cursor.rowcount
+
+
+def _group_key(business_number, name):
+    # 견적서를 저장할 때마다 회사 행이 새로 생기므로 사업자등록번호(없으면 상호)가 같은 행을 한 지점으로 묶음
+    digits = re.sub(r'\D', '', business_number or '')
+    return digits or (name or '').strip()
+
+
+def _referenced_ids(conn):
+    """지점에 복사된 견적서의 이전 버전이 참조하는 회사/고객 ID (버전 복원에 필요)"""
+    referenced = {'company_id': set(), 'client_id': set()}
+    for (header_changes,) in conn.execute('SELECT header_changes FROM main.estimate_revisions'):
+        changes = json.loads(header_changes or '{}')
+        for field, ids in referenced.items():
+            if field in changes:
+                ids.update(value for value in changes[field] if value is not None)
+    return referenced
+
+
+def plan_split(source_path, default_tenant='main'):
+    """{지점 이름: {'company_ids', 'label'}} 분리 계획 (회사 묶음마다 company-<가장 작은 ID>)"""
+    source = sqlite3.connect(f'file:{source_path}?mode=ro', uri=True)
+    groups = {}
+    for company_id, name, business_number in source.execute(
+            'SELECT id, name, business_number FROM companies ORDER BY id'):
+        key = _group_key(business_number, name)
+        groups.setdefault(key, {'company_ids': [], 'label': name})['company_ids'].append(company_id)
+    source.close()
+
+    plan = {f"company-{group['company_ids'][0]}": group for group in groups.values()}
+    if default_tenant in plan:
+        # 덮어쓰면 그 회사 묶음의 견적서가 기본 지점 데이터와 섞이므로 분리하지 않음
+        raise ValueError(f"기본 지점 이름이 회사 지점 이름과 겹칩니다: {default_tenant} (--default-tenant 로 다른 이름을 지정하세요)")
+    plan[default_tenant] = {'company_ids': [], 'label': '회사 미지정 견적서, 영수증 기록'}
+    return plan
+
+
+def split_database(source_path, tenant_dir, init_schema, default_tenant='main'):
+    """
+    기존 데이터베이스를 회사별 지점 데이터베이스로 분리하고 지점별 건수를 반환
+    - 견적서(항목/수정 이력 포함)는 회사 묶음별 지점으로, 회사가 없는 견적서는 기본 지점으로
+    - 영수증 기록과 어떤 견적서에도 쓰이지 않은 고객은 기본 지점으로
+    - 은행 계좌는 모든 지점에 복사
+    ID는 그대로 유지하므로 견적서/항목/버전 간 참조가 바뀌지 않습니다.
+    """
+    if tenant_path(default_tenant, tenant_dir) is None:
+        raise ValueError(f"기본 지점 이름이 올바르지 않습니다: {default_tenant}")
+    os.makedirs(tenant_dir, exist_ok=True)
+    plan = plan_split(source_path, default_tenant)
+    for name in plan:
+        if os.path.exists(tenant_path(name, tenant_dir)):
+            raise FileExistsError(f"이미 지점 데이터베이스가 있습니다: {tenant_path(name, tenant_dir)}")
+
+    source = sqlite3.connect(f'file:{source_path}?mode=ro', uri=True)
+    source_tables = {row[0] for row in source.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    source.close()
+    counts = {}
+    for name, group in plan.items():
+        path = tenant_path(name, tenant_dir)
+        init_schema(path)
+        conn = sqlite3.connect(path)
+        conn.execute('ATTACH DATABASE ? AS src', (source_path,))
+        conn.execute('CREATE TEMP TABLE picked_companies (id INTEGER PRIMARY KEY)')
+        conn.executemany('INSERT INTO picked_companies (id) VALUES (?)', [(i,) for i in group['company_ids']])
+
+        if name == default_tenant:
+            # 모든 회사는 어느 한 지점에 속하므로 회사가 없거나 삭제된 견적서만 기본 지점으로
+            estimates = _copy(conn, 'estimates', 'company_id IS NULL OR company_id NOT IN (SELECT id FROM src.companies)')
+        else:
+            estimates = _copy(conn, 'estimates', 'company_id IN (SELECT id FROM picked_companies)')
+        _copy(conn, 'estimate_items', 'estimate_id IN (SELECT id FROM main.estimates)')
+        if 'estimate_revisions' in source_tables:
+            _copy(conn, 'estimate_revisions', 'estimate_id IN (SELECT id FROM main.estimates)')
+
+        referenced = _referenced_ids(conn)
+        conn.executemany('INSERT OR IGNORE INTO picked_companies (id) VALUES (?)',
+                         [(i,) for i in referenced['company_id']])
+        conn.execute('CREATE TEMP TABLE picked_clients (id INTEGER PRIMARY KEY)')
+        conn.executemany('INSERT OR IGNORE INTO picked_clients (id) VALUES (?)',
+                         [(i,) for i in referenced['client_id']])
+        conn.execute('''
+            INSERT OR IGNORE INTO picked_clients (id)
+            SELECT client_id FROM main.estimates WHERE client_id IS NOT NULL
+        ''')
+
+        companies = _copy(conn, 'companies', 'id IN (SELECT id FROM picked_companies)')
+        if name == default_tenant:
+            conn.execute('''
+                INSERT OR IGNORE INTO picked_clients (id)
+                SELECT id FROM src.clients WHERE id NOT IN (SELECT client_id FROM src.estimates WHERE client_id IS NOT NULL)
+            ''')
+            daily_records = _copy(conn, 'daily_records', '1')
+        else:
+            daily_records = 0
+        clients = _copy(conn, 'clients', 'id IN (SELECT id FROM picked_clients)')
+        _copy(conn, 'bank_accounts', '1')
+
+        conn.commit()
+        conn.execute('DETACH DATABASE src')
+        conn.close()
+        counts[name] = {
+            'label': group['label'],
+            'companies': companies,
+            'clients': clients,
+            'estimates': estimates,
+            'daily_records': daily_records,
+        }
+    return counts
+
+
+def _init_schema(path):
+    """app.init_db()로 지점 데이터베이스 스키마 생성"""
+    import app
+    app.init_db(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='다중 지점(테넌트) 데이터베이스 관리')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    split = subparsers.add_parser('split', help='기존 데이터베이스를 회사별 지점 데이터베이스로 분리')
+    split.add_argument('source', help='기존 데이터베이스 (예: estimate.db)')
+    split.add_argument('tenant_dir', help='지점 데이터베이스를 만들 디렉터리')
+    split.add_argument('--default-tenant', default='main', help='회사가 없는 데이터와 영수증 기록을 담을 지점')
+
+    create = subparsers.add_parser('create', help='빈 지점 데이터베이스 생성')
+    create.add_argument('name', help='지점 이름 (영문 소문자/숫자/-/_)')
+    create.add_argument('--dir', default=TENANT_DIR, help='지점 디렉터리 (기본값: ESTIMATE_TENANT_DIR)')
+
+    listing = subparsers.add_parser('list', help='지점 목록')
+    listing.add_argument('--dir', default=TENANT_DIR, help='지점 디렉터리 (기본값: ESTIMATE_TENANT_DIR)')
+
+    query = subparsers.add_parser('query', help='모든 지점에 읽기 전용 SQL 조회 (결과는 JSON 한 줄씩)')
+    query.add_argument('sql', help='조회할 SELECT 문')
+    query.add_argument('--tenant', action='append', help='조회할 지점 (여러 번 지정 가능, 기본값: 전체)')
+    query.add_argument('--dir', default=TENANT_DIR, help='지점 디렉터리 (기본값: ESTIMATE_TENANT_DIR)')
+    args = parser.parse_args()
+
+    if args.command == 'split':
+        try:
+            counts = split_database(args.source, args.tenant_dir, _init_schema, args.default_tenant)
+        except (ValueError, FileExistsError) as e:
+            print(f"오류: {e}", file=sys.stderr)
+            return 1
+        for name, count in counts.items():
+            print(f"{name:<24} 회사 {count['companies']:>5}  고객 {count['clients']:>6}  "
+                  f"견적서 {count['estimates']:>6}  영수증 기록 {count['daily_records']:>6}  ({count['label']})")
+        print(f"\n{len(counts)}개 지점 생성 완료. 지점 이름은 파일 이름을 바꿔 변경할 수 있습니다.")
+        return 0
+
+    if not args.dir:
+        print("오류: --dir 또는 ESTIMATE_TENANT_DIR 이 필요합니다", file=sys.stderr)
+        return 1
+    if args.command == 'create':
+        path = tenant_path(args.name, args.dir)
+        if path is None:
+            print(f"오류: 지점 이름이 올바르지 않습니다: {args.name}", file=sys.stderr)
+            return 1
+        os.makedirs(args.dir, exist_ok=True)
+        _init_schema(path)
+        print(f"{path} 생성 완료")
+        return 0
+
+    if args.command == 'query':
+        try:
+            rows = query_tenants(args.sql, names=args.tenant, tenant_dir=args.dir)
+        except sqlite3.Error as e:
+            print(f"오류: {e}", file=sys.stderr)
+            return 1
+        for row in rows:
+            print(json.dumps(row, ensure_ascii=False))
+        return 0
+
+    for name, path in list_tenants(args.dir).items():
+        print(f"{name:<24} {os.path.getsize(path) / 1024:>10.0f} KB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
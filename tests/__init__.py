@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+API 테스트 공통 설정
+테스트마다 임시 estimate.db 로 앱을 만들어 Flask 테스트 클라이언트로 요청합니다.
+
+실행: venv/bin/python -m unittest discover tests
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+# 테스트 로그는 저장소의 app.log 대신 임시 디렉터리에 기록
+os.environ.setdefault('LOG_FILE', os.path.join(tempfile.mkdtemp(prefix='estimate-test-'), 'app.log'))
+
+
+class AppTestCase(unittest.TestCase):
+    """임시 데이터베이스를 쓰는 앱과 테스트 클라이언트"""
+
+    def setUp(self):
+        import app
+        import db
+
+        self.tmp_dir = tempfile.mkdtemp(prefix='estimate-test-')
+        self.db_path = os.path.join(self.tmp_dir, 'estimate.db')
+        patcher = mock.patch.object(db, 'DB_PATH', self.db_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        self.addCleanup(lambda: db.get_pool(self.db_path).close())
+
+        self.app = app.create_app()
+        self.app.testing = True
+        self.client = self.app.test_client()
+
+    def query(self, sql, params=()):
+        """앱과 별도의 연결로 데이터베이스 조회"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""참조 데이터 캐시(cache_versions 트리거, ETag) 테스트"""
+
+import os
+import sqlite3
+import unittest
+from unittest import mock
+
+from tests import AppTestCase
+
+
+class ReferenceCacheTest(AppTestCase):
+
+    def execute(self, sql, params=(), path=None):
+        """다른 워커처럼 앱과 별도의 연결로 변경"""
+        conn = sqlite3.connect(path or self.db_path)
+        try:
+            conn.execute(sql, params)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def version(self, table):
+        return self.query('SELECT version FROM cache_versions WHERE name = ?', (table,))[0][0]
+
+    def company_names(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [company['name'] for company in response.get_json()['data']]
+
+    def test_triggers_bump_version(self):
+        for table in ('companies', 'clients', 'bank_accounts'):
+            self.assertEqual(self.version(table), 0)
+
+        self.execute("INSERT INTO companies (id, name) VALUES (1, '한빛인테리어')")
+        self.assertEqual(self.version('companies'), 1)
+        self.execute("UPDATE companies SET phone = '02-555-0000' WHERE id = 1")
+        self.assertEqual(self.version('companies'), 2)
+        self.execute('DELETE FROM companies WHERE id = 1')
+        self.assertEqual(self.version('companies'), 3)
+
+        self.execute("INSERT INTO bank_accounts (bank_name, account_number, account_holder) VALUES ('국민은행', '123-456', '김대표')")
+        self.assertEqual((self.version('clients'), self.version('bank_accounts')), (0, 1))
+
+    def test_etag_and_not_modified(self):
+        response = self.client.get('/api/companies')
+        etag = response.headers['ETag']
+        self.assertTrue(etag)
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+
+        response = self.client.get('/api/companies', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+
+        self.execute("INSERT INTO companies (name) VALUES ('한빛인테리어')")
+        response = self.client.get('/api/companies', headers={'If-None-Match': etag})
+        self.assertEqual(self.company_names(response), ['한빛인테리어'])
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_write_invalidates_cache(self):
+        import app
+
+        self.assertEqual(self.company_names(self.client.get('/api/companies')), [])
+        with mock.patch.object(app, 'load_companies', wraps=app.load_companies) as loader:
+            # 변경이 없으면 DB 조회 없이 저장된 응답 사용
+            self.assertEqual(self.company_names(self.client.get('/api/companies')), [])
+            self.assertEqual(loader.call_count, 0)
+
+            response = self.client.post('/api/companies', json={'name': '한빛인테리어'})
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(self.company_names(self.client.get('/api/companies')), ['한빛인테리어'])
+            self.assertEqual(loader.call_count, 1)
+
+            # 다른 연결(다른 워커)에서 바꾼 내용도 반영
+            self.execute("UPDATE companies SET name = '푸른건설'")
+            self.assertEqual(self.company_names(self.client.get('/api/companies')), ['푸른건설'])
+            self.assertEqual(loader.call_count, 2)
+
+    def test_entries_are_separated_per_database(self):
+        import app
+        import db
+
+        other_path = os.path.join(self.tmp_dir, 'other.db')
+        app.init_db(other_path)
+        self.addCleanup(lambda: db.get_pool(other_path).close())
+        self.execute("INSERT INTO companies (name) VALUES ('한빛인테리어')")
+        self.execute("INSERT INTO companies (name) VALUES ('푸른건설')", path=other_path)
+
+        # 두 데이터베이스 모두 버전이 1이지만 캐시와 ETag 는 따로 유지
+        first = self.client.get('/api/companies')
+        with mock.patch.object(db, 'DB_PATH', other_path):
+            other = self.client.get('/api/companies')
+        self.assertEqual(self.company_names(first), ['한빛인테리어'])
+        self.assertEqual(self.company_names(other), ['푸른건설'])
+        self.assertNotEqual(first.headers['ETag'], other.headers['ETag'])
+
+        response = self.client.get('/api/companies', headers={'If-None-Match': other.headers['ETag']})
+        self.assertEqual(self.company_names(response), ['한빛인테리어'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""엑셀 내보내기 API 테스트"""
+
+import io
+import unittest
+
+from openpyxl import load_workbook
+
+from tests import AppTestCase
+
+
+class ExcelExportTest(AppTestCase):
+
+    def workbook(self, response):
+        self.assertEqual(response.status_code, 200, response.is_json and response.get_json())
+        return load_workbook(io.BytesIO(response.data)).active
+
+    def test_daily_export_sums_numeric_strings(self):
+        sheet = self.workbook(self.client.post('/api/export_daily_excel', json={
+            'date': '2026-10-19',
+            'site_name': '잠실 현장',
+            'items': [
+                {'category': '전기공사', 'content': '자재', 'rate': '1,000', 'amount': '1,000'},
+                {'category': '기타', 'content': '식대', 'amount': None},
+                {'category': '용역비', 'content': '인건비', 'amount': 250000},
+            ],
+        }))
+        self.assertEqual([sheet.cell(row=row, column=4).value for row in (6, 7, 8)], [1000, 0, 250000])
+        self.assertEqual(sheet.cell(row=10, column=4).value, 251000)
+
+    def test_estimate_export_accepts_numeric_strings(self):
+        sheet = self.workbook(self.client.post('/api/export_estimate_excel', json={
+            'estimate_date': '2026-10-19',
+            'client': {'name': '이고객'},
+            'items': [{'category': '전기공사', 'name': '배선', 'quantity': '2', 'price': '500,000', 'total': '1,000,000'}],
+            'subtotal': '1,000,000',
+            'tax': None,
+            'total': '1,000,000',
+        }))
+        self.assertEqual([sheet.cell(row=16, column=col).value for col in (5, 6, 7)], [2, 500000, 1000000])
+        self.assertIn('백만', sheet['A13'].value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""일괄 가져오기 작업 API 테스트"""
+
+import csv
+import io
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+import unittest
+
+from tests import AppTestCase
+
+ESTIMATE_HEADER = ['견적번호', '견적일자', '공급업체', '고객명', '공종', '품목', '수량', '단가', '공급가액']
+
+
+class ImportJobTest(AppTestCase):
+
+    def insert_job(self, job_id, status, pid):
+        self.query('''
+            INSERT INTO import_jobs (id, kind, filename, status, pid)
+            VALUES (?, 'clients', 'clients.csv', ?, ?)
+        ''', (job_id, status, pid))
+
+    def query(self, sql, params=()):
+        # INSERT 도 바로 커밋되도록 자동 커밋 연결 사용
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def get_job(self, job_id):
+        response = self.client.get(f'/api/import/jobs/{job_id}')
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()['data']
+
+    def write_csv(self, filename, rows):
+        path = os.path.join(self.tmp_dir, filename)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows(rows)
+        return path
+
+    def upload(self, kind, filename, rows):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        response = self.client.post(f'/api/import/{kind}', data={
+            'file': (io.BytesIO(buffer.getvalue().encode('utf-8')), filename),
+        }, content_type='multipart/form-data')
+        self.assertEqual(response.status_code, 202)
+        return response.get_json()['data']['job_id']
+
+    def wait_for(self, job_id):
+        deadline = time.time() + 30
+        job = self.get_job(job_id)
+        while job['status'] in ('pending', 'running') and time.time() < deadline:
+            time.sleep(0.1)
+            job = self.get_job(job_id)
+        self.assertEqual(job['status'], 'done', job)
+        return job
+
+    def run_import(self, kind, path, **kwargs):
+        import importer
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return importer.run_import(conn, kind, path, **kwargs)
+        finally:
+            conn.close()
+
+    def test_import_runs_in_separate_process(self):
+        job = self.wait_for(self.upload('clients', 'clients.csv', [
+            ['상호', '전화번호'],
+            ['한빛인테리어', '0212345678'],
+            ['푸른건설', '01012345678'],
+        ]))
+        self.assertEqual(job['imported'], 2)
+        self.assertEqual(self.query('SELECT name FROM clients ORDER BY id'), [('한빛인테리어',), ('푸른건설',)])
+
+    def test_estimates_are_grouped_by_number(self):
+        path = self.write_csv('estimates.csv', [
+            ESTIMATE_HEADER,
+            ['E-001', '2026.10.19', '한빛인테리어', '이고객', '목공사', '석고보드', '10', '5,000', ''],
+            ['E-001', '', '', '', '도배공사', '실크 벽지', '3', '40000', '120,000'],
+            [],
+            ['E-002', '2026-10-20', '한빛인테리어', '박고객', '전기공사', '조명', '2', '30000', '60000'],
+        ])
+
+        stats = self.run_import('estimates', path)
+        self.assertEqual((stats['processed_rows'], stats['imported'], stats['error_count']), (3, 2, 0))
+
+        self.assertEqual(self.query('''
+            SELECT e.estimate_number, e.estimate_date, c.name, cl.name, e.subtotal, e.tax, e.total
+            FROM estimates e JOIN companies c ON c.id = e.company_id JOIN clients cl ON cl.id = e.client_id
+            ORDER BY e.id
+        '''), [
+            ('E-001', '2026-10-19', '한빛인테리어', '이고객', 170000, 17000, 187000),
+            ('E-002', '2026-10-20', '한빛인테리어', '박고객', 60000, 6000, 66000),
+        ])
+        self.assertEqual(self.query('''
+            SELECT e.estimate_number, i.name, i.quantity, i.price, i.total
+            FROM estimate_items i JOIN estimates e ON e.id = i.estimate_id ORDER BY i.id
+        '''), [
+            ('E-001', '석고보드', 10, 5000, 50000),
+            ('E-001', '실크 벽지', 3, 40000, 120000),
+            ('E-002', '조명', 2, 30000, 60000),
+        ])
+        # 같은 이름의 공급업체는 한 번만 생성
+        self.assertEqual(self.query('SELECT COUNT(*) FROM companies'), [(1,)])
+
+    def test_row_errors_do_not_stop_job(self):
+        job = self.wait_for(self.upload('estimates', 'estimates.csv', [
+            ESTIMATE_HEADER,
+            ['E-001', '2026-10-19', '', '', '목공사', '석고보드', '10', '5000', '50000'],
+            ['E-001', '2026-10-19', '', '', '목공사', '합판', '열개', '5000', ''],
+            ['E-002', '19/10/2026', '', '', '목공사', '각재', '1', '5000', '5000'],
+            ['E-003', '2026-10-19', '', '', '목공사', '', '1', '5000', '5000'],
+            ['E-004', '2026-10-19', '', '', '도장공사', '페인트', '2', '30000', '60000'],
+        ]))
+
+        self.assertEqual((job['processed_rows'], job['imported'], job['error_count']), (5, 2, 3))
+        self.assertEqual([error['row'] for error in job['errors']], [3, 4, 5])
+        self.assertIn('숫자', job['errors'][0]['message'])
+        self.assertIn('날짜', job['errors'][1]['message'])
+        self.assertIn('필수', job['errors'][2]['message'])
+        self.assertEqual(self.query('SELECT estimate_number, total FROM estimates ORDER BY id'),
+                         [('E-001', 55000), ('E-004', 66000)])
+
+    def test_batches_are_committed_with_progress(self):
+        import importer
+
+        path = self.write_csv('clients.csv', [['상호']] + [[f'고객{number:02d}'] for number in range(35)])
+        self.insert_job('batch', 'running', os.getpid())
+        progress = []
+
+        def on_batch(cursor, stats):
+            # 이전 배치는 이미 커밋되어 다른 연결(작업 조회 API)에서 보임
+            progress.append((self.query('SELECT COUNT(*) FROM clients')[0][0],
+                             self.get_job('batch')['processed_rows'], stats['processed_rows']))
+            importer._update_job(cursor, 'batch', stats)
+
+        stats = self.run_import('clients', path, batch_size=10, on_batch=on_batch)
+
+        self.assertEqual(stats['imported'], 35)
+        self.assertEqual(progress, [(0, 0, 10), (10, 10, 20), (20, 20, 30), (30, 30, 35)])
+        self.assertEqual(self.get_job('batch')['processed_rows'], 35)
+
+    def test_estimate_is_not_split_across_batches(self):
+        rows = [ESTIMATE_HEADER]
+        for number in range(4):
+            rows += [[f'E-{number}', '2026-10-19', '', '', '목공사', f'품목{line}', '1', '1000', '1000'] for line in range(3)]
+        committed = []
+
+        def on_batch(cursor, stats):
+            committed.append(self.query('SELECT COUNT(*) FROM estimate_items')[0][0])
+
+        stats = self.run_import('estimates', self.write_csv('estimates.csv', rows), batch_size=2, on_batch=on_batch)
+
+        self.assertEqual(stats['imported'], 4)
+        # 배치 크기보다 견적서가 길어도 견적서 경계에서만 커밋
+        self.assertEqual(committed, [0, 3, 6, 9])
+
+    def test_job_with_dead_process_is_failed(self):
+        process = subprocess.Popen([sys.executable, '-c', 'pass'])
+        process.wait()
+        self.insert_job('dead', 'running', process.pid)
+
+        job = self.get_job('dead')
+        self.assertEqual(job['status'], 'failed')
+        self.assertIn('중단', job['message'])
+
+    def test_unfinished_jobs_are_failed_on_startup(self):
+        import app
+
+        self.insert_job('interrupted', 'running', None)
+        app.init_db()
+
+        self.assertEqual(self.query("SELECT status FROM import_jobs WHERE id = 'interrupted'"), [('failed',)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""현장 정산 보고서 API 테스트"""
+
+import unittest
+
+from tests import AppTestCase
+
+
+class DailyRollupTest(AppTestCase):
+
+    def test_comma_amount_is_stored_as_number(self):
+        response = self.client.post('/api/daily_records', json={
+            'daily_date': '2026-10-19',
+            'site_name': '잠실 현장',
+            'total_amount': '1,000',
+            'items': [{'category': '전기공사', 'content': '자재', 'rate': '1,000', 'amount': '1,000'}],
+        })
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.query('SELECT category, amount FROM daily_rollups'), [('전기공사', 1000)])
+        self.assertEqual(self.query('SELECT total FROM daily_records'), [(1000,)])
+
+        report = self.client.get('/api/reports/site', query_string={'site_name': '잠실 현장'}).get_json()['data']
+        self.assertEqual(report['totals']['actual'], 1000)
+
+    def test_invalid_amount_is_rejected(self):
+        response = self.client.post('/api/daily_records', json={
+            'site_name': '잠실 현장',
+            'items': [{'category': '전기공사', 'amount': '천원'}],
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.query('SELECT COUNT(*) FROM daily_rollups'), [(0,)])
+
+
+class EstimateAmountTest(AppTestCase):
+
+    def test_comma_item_totals_are_summed_in_report(self):
+        response = self.client.post('/api/estimates', json={
+            'estimate_number': '261019-001',
+            'estimate_date': '2026-10-19',
+            'items': [
+                {'category': '전기공사', 'name': '배선', 'quantity': '2', 'price': '500,000', 'total': '1,000,000'},
+                {'category': '전기공사', 'name': '조명', 'quantity': 1, 'price': 250000.5, 'total': '250,000.5'},
+            ],
+            'subtotal': '1,250,000.5',
+            'tax': '125,000',
+            'total': '1,375,000.5',
+        })
+        self.assertEqual(response.status_code, 200)
+        estimate_id = response.get_json()['id']
+
+        self.assertEqual(self.query('SELECT quantity, price, total FROM estimate_items ORDER BY id'),
+                         [(2, 500000, 1000000), (1, 250000.5, 250000.5)])
+        self.assertEqual(self.query('SELECT subtotal, tax, total FROM estimates'), [(1250000.5, 125000, 1375000.5)])
+
+        report = self.client.get('/api/reports/site', query_string={
+            'site_name': '잠실 현장', 'estimate_id': estimate_id,
+        }).get_json()['data']
+        self.assertEqual(report['totals']['estimated'], 1250000.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""견적서 수정 이력 API 테스트"""
+
+import copy
+import unittest
+
+from tests import AppTestCase
+
+# 화면의 collectEstimateData()와 같은 형태
+ESTIMATE = {
+    'estimate_number': '261019-001',
+    'estimate_date': '2026-10-19',
+    'valid_until': '2026-11-18',
+    'company': {'name': '한빛인테리어', 'business_number': '123-45-67890', 'address': '서울시 강남구',
+                'ceo': '김대표', 'phone': '02-555-0000', 'type': '건설업', 'item': '실내건축'},
+    'client': {'name': '이고객', 'business_number': '', 'address': '경기도 성남시', 'ceo': '',
+               'phone': '010-1234-5678', 'type': 'business'},
+    'items': [
+        {'category': '목공사', 'name': '석고보드', 'spec': '9.5T', 'quantity': 10, 'price': 5000, 'total': 50000, 'note': ''},
+        {'category': '도배공사', 'name': '실크 벽지', 'spec': '', 'quantity': 3, 'price': 40000, 'total': 120000, 'note': ''},
+    ],
+    'subtotal': 170000,
+    'tax': 17000,
+    'total': 187000,
+    'includeTax': True,
+}
+
+
+class EstimateRevisionTest(AppTestCase):
+
+    def create_estimate(self):
+        response = self.client.post('/api/estimates', json=ESTIMATE)
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()['id']
+
+    def test_client_phone_is_saved(self):
+        self.create_estimate()
+        self.assertEqual(self.query('SELECT name, phone FROM clients'), [('이고객', '010-1234-5678')])
+
+    def test_unchanged_put_creates_nothing(self):
+        estimate_id = self.create_estimate()
+
+        response = self.client.put(f'/api/estimates/{estimate_id}', json=copy.deepcopy(ESTIMATE))
+        self.assertEqual(response.status_code, 200)
+        result = response.get_json()
+        self.assertFalse(result['changed'])
+        self.assertEqual(result['revision'], 1)
+
+        self.assertEqual(self.query('SELECT COUNT(*) FROM estimate_revisions'), [(0,)])
+        self.assertEqual(self.query('SELECT COUNT(*) FROM clients'), [(1,)])
+        self.assertEqual(self.query('SELECT COUNT(*) FROM companies'), [(1,)])
+
+    def test_put_keeps_omitted_header_fields(self):
+        estimate_id = self.create_estimate()
+
+        response = self.client.put(f'/api/estimates/{estimate_id}', json={'items': ESTIMATE['items']})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.get_json()['changed'])
+        self.assertEqual(self.query('SELECT estimate_number, estimate_date, valid_until FROM estimates'),
+                         [('261019-001', '2026-10-19', '2026-11-18')])
+
+    def test_changed_phone_adds_client_row(self):
+        estimate_id = self.create_estimate()
+
+        data = copy.deepcopy(ESTIMATE)
+        data['client']['phone'] = '010-9999-0000'
+        result = self.client.put(f'/api/estimates/{estimate_id}', json=data).get_json()
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['revision'], 2)
+        self.assertEqual(self.query('SELECT phone FROM clients ORDER BY id'), [('010-1234-5678',), ('010-9999-0000',)])
+
+    def test_string_totals_are_stored_as_numbers(self):
+        estimate_id = self.create_estimate()
+        first_id = self.query('SELECT MIN(id) FROM estimate_items')[0][0]
+
+        response = self.client.patch(f'/api/estimates/{estimate_id}', json={'item_changes': {
+            'update': [{'id': first_id, 'quantity': '4', 'total': '2,000'}],
+            'add': [{'category': '도장공사', 'name': '페인트', 'quantity': '1', 'price': '500', 'total': '500'}],
+        }})
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.query('SELECT quantity, price, total FROM estimate_items ORDER BY id'),
+                         [(4, 5000, 2000), (3, 40000, 120000), (1, 500, 500)])
+        self.assertEqual(self.query('SELECT subtotal, tax, total FROM estimates'), [(122500, 12250, 134750)])
+
+    def get_revision(self, estimate_id, revision):
+        response = self.client.get(f'/api/estimates/{estimate_id}?revision={revision}')
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def items_of(self, estimate):
+        return [(item['name'], item['quantity'], item['total']) for item in estimate['items']]
+
+    def test_old_revisions_are_rebuilt(self):
+        estimate_id = self.create_estimate()
+        first_id, second_id = [row[0] for row in self.query('SELECT id FROM estimate_items ORDER BY id')]
+
+        # 2: 항목 수정
+        self.client.patch(f'/api/estimates/{estimate_id}', json={'item_changes': {
+            'update': [{'id': first_id, 'quantity': 20, 'total': 100000}],
+        }})
+        # 3: 항목 추가 + 삭제
+        self.client.patch(f'/api/estimates/{estimate_id}', json={'item_changes': {
+            'add': [{'category': '도장공사', 'name': '페인트', 'quantity': 2, 'price': 30000, 'total': 60000}],
+            'delete': [second_id],
+        }})
+        third_id = self.query('SELECT MAX(id) FROM estimate_items')[0][0]
+        # 4: 전체 수정 (견적번호 변경, 첫 항목 수정, 추가한 항목 유지, 새 항목 추가)
+        result = self.client.put(f'/api/estimates/{estimate_id}', json={
+            'estimate_number': '261019-002',
+            'items': [
+                {'id': first_id, 'category': '목공사', 'name': '석고보드', 'spec': '9.5T',
+                 'quantity': 5, 'price': 5000, 'total': 25000, 'note': ''},
+                {'id': third_id, 'category': '도장공사', 'name': '페인트', 'spec': '',
+                 'quantity': 2, 'price': 30000, 'total': 60000, 'note': ''},
+                {'category': '전기공사', 'name': '조명', 'quantity': 4, 'price': 10000, 'total': 40000},
+            ],
+        }).get_json()
+        self.assertEqual(result['revision'], 4)
+
+        expected = {
+            1: ('261019-001', 170000, [('석고보드', 10, 50000), ('실크 벽지', 3, 120000)]),
+            2: ('261019-001', 220000, [('석고보드', 20, 100000), ('실크 벽지', 3, 120000)]),
+            3: ('261019-001', 160000, [('석고보드', 20, 100000), ('페인트', 2, 60000)]),
+            4: ('261019-002', 125000, [('석고보드', 5, 25000), ('페인트', 2, 60000), ('조명', 4, 40000)]),
+        }
+        for revision, (number, subtotal, items) in expected.items():
+            estimate = self.get_revision(estimate_id, revision)
+            self.assertEqual(estimate['revision'], revision)
+            self.assertEqual(estimate['latest_revision'], 4)
+            self.assertEqual((estimate['estimate_number'], estimate['subtotal']), (number, subtotal), revision)
+            self.assertEqual(self.items_of(estimate), items, revision)
+
+        revisions = self.client.get(f'/api/estimates/{estimate_id}/revisions').get_json()
+        self.assertEqual([(r['revision'], r['added_items'], r['updated_items'], r['deleted_items']) for r in revisions],
+                         [(1, 0, 0, 0), (2, 0, 1, 0), (3, 1, 0, 1), (4, 1, 1, 0)])
+
+    def test_rebuilt_revision_keeps_previous_parties(self):
+        estimate_id = self.create_estimate()
+        data = copy.deepcopy(ESTIMATE)
+        data['client']['name'] = '박고객'
+        data['company']['name'] = '한빛건설'
+        self.client.put(f'/api/estimates/{estimate_id}', json=data)
+
+        self.assertEqual(self.get_revision(estimate_id, 1)['client_name'], '이고객')
+        self.assertEqual(self.get_revision(estimate_id, 1)['company_name'], '한빛인테리어')
+        latest = self.client.get(f'/api/estimates/{estimate_id}').get_json()
+        self.assertEqual((latest['client_name'], latest['company_name']), ('박고객', '한빛건설'))
+
+    def test_previous_revision_is_returned(self):
+        estimate_id = self.create_estimate()
+        data = copy.deepcopy(ESTIMATE)
+        data['client']['phone'] = '010-9999-0000'
+        self.client.put(f'/api/estimates/{estimate_id}', json=data)
+
+        result = self.client.get(f'/api/estimates/{estimate_id}?revision=1').get_json()
+        self.assertEqual(result['revision'], 1)
+        self.assertEqual(result['latest_revision'], 2)
+
+    def test_invalid_revision_is_rejected(self):
+        estimate_id = self.create_estimate()
+
+        for value in ('0', '-1', 'abc', ''):
+            response = self.client.get(f'/api/estimates/{estimate_id}?revision={value}')
+            self.assertEqual(response.status_code, 400, value)
+            self.assertEqual(response.get_json()['error_code'], 'INVALID_REVISION_NUMBER')
+
+        response = self.client.get(f'/api/estimates/{estimate_id}?revision=2')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.get_json()['error_code'], 'REVISION_NOT_FOUND')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""지점 데이터베이스 분리 도구 테스트"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from tests import REPO_DIR  # noqa: F401 (저장소 경로를 sys.path 에 추가)
+
+import tenants
+
+
+class SplitDatabaseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='estimate-test-')
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        self.source = os.path.join(self.tmp_dir, 'estimate.db')
+        self.tenant_dir = os.path.join(self.tmp_dir, 'tenants')
+        tenants._init_schema(self.source)
+
+        conn = sqlite3.connect(self.source)
+        conn.executemany('INSERT INTO companies (id, name, business_number) VALUES (?, ?, ?)', [
+            (1, '한빛인테리어', '123-45-67890'),
+            (2, '푸른건설', '222-33-44444'),
+        ])
+        conn.commit()
+        conn.close()
+
+    def test_split_by_company(self):
+        counts = tenants.split_database(self.source, self.tenant_dir, tenants._init_schema)
+        self.assertEqual(sorted(counts), ['company-1', 'company-2', 'main'])
+        self.assertEqual(counts['company-1']['companies'], 1)
+
+    def test_default_tenant_colliding_with_company_is_refused(self):
+        with self.assertRaises(ValueError):
+            tenants.split_database(self.source, self.tenant_dir, tenants._init_schema, default_tenant='company-2')
+        self.assertEqual(os.listdir(self.tenant_dir) if os.path.isdir(self.tenant_dir) else [], [])
+
+
+class TenantRoutingTest(unittest.TestCase):
+    """ESTIMATE_TENANT_DIR 모드의 지점 선택, 데이터 분리, 관리자 조회"""
+
+    ADMIN_TOKEN = 'test-admin-token'
+
+    def setUp(self):
+        import app
+        import db
+
+        self.tmp_dir = tempfile.mkdtemp(prefix='estimate-test-')
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        self.tenant_dir = os.path.join(self.tmp_dir, 'tenants')
+        os.makedirs(self.tenant_dir)
+        for name in ('gangnam', 'busan'):
+            path = tenants.tenant_path(name, self.tenant_dir)
+            tenants._init_schema(path)
+            self.addCleanup(lambda path=path: db.get_pool(path).close())
+
+        for target, attribute, value in (
+                (tenants, 'TENANT_DIR', self.tenant_dir),
+                (tenants, 'TENANT_DOMAIN', 'estimate.example.com'),
+                (tenants, 'DEFAULT_TENANT', ''),
+                (tenants, 'ADMIN_TOKEN', self.ADMIN_TOKEN),
+                (db, 'DB_PATH', os.path.join(self.tmp_dir, 'estimate.db'))):
+            patcher = mock.patch.object(target, attribute, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.app = app.create_app()
+        self.app.testing = True
+        self.client = self.app.test_client()
+
+    def query(self, tenant, sql):
+        conn = sqlite3.connect(tenants.tenant_path(tenant, self.tenant_dir))
+        try:
+            return conn.execute(sql).fetchall()
+        finally:
+            conn.close()
+
+    def add_company(self, name, **kwargs):
+        response = self.client.post('/api/companies', json={'name': name}, **kwargs)
+        self.assertEqual(response.status_code, 201)
+
+    def company_names(self, **kwargs):
+        response = self.client.get('/api/companies', **kwargs)
+        self.assertEqual(response.status_code, 200)
+        return [company['name'] for company in response.get_json()['data']]
+
+    def admin_get(self, url, token=ADMIN_TOKEN):
+        return self.client.get(url, headers={tenants.ADMIN_HEADER: token} if token is not None else {})
+
+    def test_header_selects_tenant(self):
+        self.add_company('한빛인테리어', headers={'X-Tenant': 'gangnam'})
+
+        self.assertEqual(self.query('gangnam', 'SELECT name FROM companies'), [('한빛인테리어',)])
+        self.assertEqual(self.query('busan', 'SELECT name FROM companies'), [])
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir, 'estimate.db')))
+
+    def test_subdomain_selects_tenant(self):
+        self.add_company('푸른건설', base_url='http://busan.estimate.example.com')
+
+        self.assertEqual(self.query('busan', 'SELECT name FROM companies'), [('푸른건설',)])
+        self.assertEqual(self.company_names(base_url='http://busan.estimate.example.com:5002'), ['푸른건설'])
+        # 헤더가 서브도메인보다 우선
+        self.assertEqual(self.company_names(base_url='http://busan.estimate.example.com',
+                                            headers={'X-Tenant': 'gangnam'}), [])
+
+    def test_missing_or_unknown_tenant_is_rejected(self):
+        for kwargs in ({}, {'base_url': 'http://estimate.example.com'}, {'headers': {'X-Tenant': '../busan'}}):
+            response = self.client.get('/api/companies', **kwargs)
+            self.assertEqual(response.status_code, 400, kwargs)
+            self.assertEqual(response.get_json()['error_code'], 'TENANT_REQUIRED')
+
+        response = self.client.get('/api/companies', headers={'X-Tenant': 'seoul'})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.get_json()['error_code'], 'TENANT_NOT_FOUND')
+        self.assertFalse(os.path.exists(tenants.tenant_path('seoul', self.tenant_dir)))
+
+        # 화면은 지점 없이도 열림
+        self.assertEqual(self.client.get('/').status_code, 200)
+
+    def test_default_tenant_is_used_without_header(self):
+        with mock.patch.object(tenants, 'DEFAULT_TENANT', 'busan'):
+            self.add_company('푸른건설')
+        self.assertEqual(self.query('busan', 'SELECT name FROM companies'), [('푸른건설',)])
+
+    def test_tenant_data_is_isolated(self):
+        gangnam = {'headers': {'X-Tenant': 'gangnam'}}
+        busan = {'headers': {'X-Tenant': 'busan'}}
+        self.add_company('한빛인테리어', **gangnam)
+        response = self.client.post('/api/estimates', json={
+            'estimate_number': '261019-001',
+            'items': [{'category': '목공사', 'name': '석고보드', 'quantity': 1, 'price': 5000, 'total': 5000}],
+            'total': 5500,
+        }, **gangnam)
+        estimate_id = response.get_json()['id']
+
+        self.assertEqual(self.company_names(**gangnam), ['한빛인테리어'])
+        self.assertEqual(self.company_names(**busan), [])
+        self.assertEqual(len(self.client.get('/api/estimates', **gangnam).get_json()), 1)
+        self.assertEqual(self.client.get('/api/estimates', **busan).get_json(), [])
+        self.assertEqual(self.client.get(f'/api/estimates/{estimate_id}', **busan).status_code, 404)
+
+    def test_admin_queries_require_token(self):
+        for url in ('/api/admin/tenants', '/api/admin/summary'):
+            for token in (None, '', 'wrong-token'):
+                response = self.admin_get(url, token)
+                self.assertEqual(response.status_code, 403, (url, token))
+                self.assertEqual(response.get_json()['error_code'], 'ADMIN_REQUIRED')
+
+        # 토큰을 설정하지 않으면 관리자 조회 비활성화
+        with mock.patch.object(tenants, 'ADMIN_TOKEN', ''):
+            self.assertEqual(self.admin_get('/api/admin/summary', '').status_code, 403)
+
+    def test_admin_queries_read_all_tenants(self):
+        self.add_company('한빛인테리어', headers={'X-Tenant': 'gangnam'})
+        self.client.post('/api/daily_records', json={'site_name': '해운대 현장', 'total_amount': 1000},
+                         headers={'X-Tenant': 'busan'})
+
+        response = self.admin_get('/api/admin/tenants')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(row['tenant'] for row in response.get_json()['data']), ['busan', 'gangnam'])
+
+        summary = {row['tenant']: row for row in self.admin_get('/api/admin/summary').get_json()['data']}
+        self.assertEqual((summary['busan']['daily_records'], summary['busan']['daily_total']), (1, 1000))
+        self.assertEqual(summary['gangnam']['daily_records'], 0)
+
+        rows = self.admin_get('/api/admin/daily_records?tenant=gangnam').get_json()['data']
+        self.assertEqual(rows, [])
+        self.assertEqual(self.admin_get('/api/admin/companies').status_code, 404)
+
+    def test_admin_connections_are_read_only(self):
+        with self.assertRaises(sqlite3.OperationalError):
+            tenants.query_tenants('DELETE FROM companies', tenant_dir=self.tenant_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
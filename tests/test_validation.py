@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""요청 본문 크기/형식 검사 테스트"""
+
+import io
+import json
+import unittest
+from unittest import mock
+
+from tests import AppTestCase
+
+
+class RequestLimitTest(AppTestCase):
+
+    def setUp(self):
+        super().setUp()
+        import app
+
+        patcher = mock.patch.object(app, 'MAX_JSON_BYTES', 1024)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post_chunked(self, url, body):
+        """Content-Length 없이 Transfer-Encoding: chunked 로 보낸 요청"""
+        return self.client.post(url, input_stream=io.BytesIO(body), headers={
+            'Content-Type': 'application/json',
+            'Transfer-Encoding': 'chunked',
+        }, environ_overrides={
+            # gunicorn/개발 서버는 chunked 본문의 끝을 처리하고 이 값을 설정함
+            'wsgi.input_terminated': True,
+        })
+
+    def company(self, size):
+        return json.dumps({'name': '한빛인테리어', 'address': 'x' * size}).encode('utf-8')
+
+    def test_large_chunked_body_is_rejected(self):
+        response = self.post_chunked('/api/companies', self.company(5000))
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.get_json()['error_code'], 'PAYLOAD_TOO_LARGE')
+        self.assertEqual(self.query('SELECT COUNT(*) FROM companies'), [(0,)])
+
+    def test_small_chunked_body_is_accepted(self):
+        response = self.post_chunked('/api/companies', self.company(100))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.query('SELECT COUNT(*) FROM companies'), [(1,)])
+
+    def test_large_content_length_is_rejected(self):
+        response = self.client.post('/api/companies', data=self.company(5000), content_type='application/json')
+        self.assertEqual(response.status_code, 413)
+
+    def test_invalid_payload_is_rejected(self):
+        response = self.client.post('/api/companies', json={'name': '한빛인테리어', 'phone': 123})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['error_code'], 'INVALID_PAYLOAD')
+
+
+if __name__ == '__main__':
+    unittest.main()